@@ -0,0 +1,4 @@
+"""Micro-benchmarks for cmd2.
+
+Run them from the root of the repository with ``python -m benchmarks``. See ``benchmarks/README.md``.
+"""
@@ -0,0 +1,115 @@
+"""Command line interface for the cmd2 benchmarks.
+
+Examples:
+    python -m benchmarks
+    python -m benchmarks --json results.json
+    python -m benchmarks --compare benchmarks/baseline.json
+    python -m benchmarks parse tokenize
+
+"""
+
+import argparse
+import json
+import sys
+
+# Importing the benchmark modules registers their benchmarks
+from . import (  # noqa: F401
+    commands,
+    completion,
+    parsing,
+    startup,
+)
+from .runner import (
+    BENCHMARKS,
+    baseline_times,
+    compare,
+    format_time,
+    results_to_json,
+    run_benchmark,
+)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the benchmark runner."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Run the cmd2 micro-benchmarks.")
+    parser.add_argument("names", nargs="*", help="benchmarks to run (default: all)")
+    parser.add_argument("-l", "--list", action="store_true", help="list the benchmarks and exit")
+    parser.add_argument("--json", metavar="FILE", help="write the results to FILE as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="compare the results to a baseline JSON file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="fraction by which a benchmark may be slower than its baseline before it counts as a regression "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="number of times to repeat each measurement (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="minimum number of seconds for each measurement (default: %(default)s)",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmarks.
+
+    :param argv: command line arguments (default: sys.argv[1:])
+    :return: exit code, which is 1 if a benchmark regressed compared to the baseline
+    """
+    args = build_parser().parse_args(argv)
+    benchmarks = {benchmark.name: benchmark for benchmark in BENCHMARKS}
+
+    if args.list:
+        for benchmark in BENCHMARKS:
+            print(f"{benchmark.name:<26} {benchmark.description}")
+        return 0
+
+    unknown = [name for name in args.names if name not in benchmarks]
+    if unknown:
+        print(f"Unknown benchmarks: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = baseline_times(json.load(file))
+
+    results = []
+    for name in args.names or benchmarks:
+        result = run_benchmark(benchmarks[name], repeat=args.repeat, min_time=args.min_time)
+        results.append(result)
+        print(f"{name:<26} {format_time(result.seconds_per_op):>10}/op {1 / result.seconds_per_op:>12,.0f} ops/s")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results_to_json(results), file, indent=2)
+            file.write("\n")
+
+    if baseline is None:
+        return 0
+
+    regressions = 0
+    print()
+    print(f"{'benchmark':<26} {'baseline':>10} {'current':>10} {'change':>8}")
+    for comparison in compare(results, baseline):
+        regressed = comparison.ratio > 1 + args.threshold
+        regressions += regressed
+        flag = "  REGRESSION" if regressed else ""
+        print(
+            f"{comparison.name:<26} {format_time(comparison.baseline):>10} {format_time(comparison.current):>10} "
+            f"{comparison.ratio - 1:>+8.1%}{flag}"
+        )
+
+    if regressions:
+        print(f"\n{regressions} benchmark(s) are more than {args.threshold:.0%} slower than the baseline", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
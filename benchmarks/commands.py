@@ -0,0 +1,64 @@
+"""Benchmarks for running commands."""
+
+import io
+from collections.abc import Callable
+
+import cmd2
+from cmd2 import plugin
+
+from .runner import benchmark
+
+# Number of commands run by each timed call
+_COUNT = 1000
+
+
+class _App(cmd2.Cmd):
+    def __init__(self) -> None:
+        super().__init__(stdin=io.StringIO(), stdout=io.StringIO(), allow_cli_args=False)
+
+    def do_noop(self, _: cmd2.Statement) -> None:
+        """Do nothing, so only the overhead of running a command is measured."""
+
+
+def _postparsing_hook(data: plugin.PostparsingData) -> plugin.PostparsingData:
+    return data
+
+
+def _precmd_hook(data: plugin.PrecommandData) -> plugin.PrecommandData:
+    return data
+
+
+def _postcmd_hook(data: plugin.PostcommandData) -> plugin.PostcommandData:
+    return data
+
+
+def _cmdfinalization_hook(data: plugin.CommandFinalizationData) -> plugin.CommandFinalizationData:
+    return data
+
+
+@benchmark
+def onecmd_plus_hooks() -> tuple[Callable[[], object], int]:
+    """Cmd.onecmd_plus_hooks() per command with no hooks registered."""
+    app = _App()
+
+    def run() -> None:
+        for _ in range(_COUNT):
+            app.onecmd_plus_hooks("noop arg")
+
+    return run, _COUNT
+
+
+@benchmark
+def onecmd_plus_hooks_hooked() -> tuple[Callable[[], object], int]:
+    """Cmd.onecmd_plus_hooks() per command with one hook registered at each stage."""
+    app = _App()
+    app.register_postparsing_hook(_postparsing_hook)
+    app.register_precmd_hook(_precmd_hook)
+    app.register_postcmd_hook(_postcmd_hook)
+    app.register_cmdfinalization_hook(_cmdfinalization_hook)
+
+    def run() -> None:
+        for _ in range(_COUNT):
+            app.onecmd_plus_hooks("noop arg")
+
+    return run, _COUNT
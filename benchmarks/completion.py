@@ -0,0 +1,101 @@
+"""Benchmarks for completion."""
+
+import io
+from collections.abc import Callable
+
+import cmd2
+
+from .runner import benchmark
+
+# Number of aliases an app defines, on top of its built-in commands
+_ALIASES = 5000
+
+
+def _app_with_aliases() -> cmd2.Cmd:
+    app = cmd2.Cmd(stdin=io.StringIO(), stdout=io.StringIO(), allow_cli_args=False)
+    for num in range(_ALIASES):
+        app.aliases[f"alias{num:05}"] = "help"
+    return app
+
+
+@benchmark
+def complete_command_name() -> tuple[Callable[[], object], int]:
+    """Cmd.complete() per keystroke while typing a command name, with thousands of aliases defined."""
+    app = _app_with_aliases()
+    words = ["h", "he", "hel", "help", "a", "al", "alias", "alias0", "alias01", "alias012"]
+
+    def run() -> None:
+        for word in words:
+            app.complete(word, word, 0, len(word))
+
+    return run, len(words)
+
+
+def _flags_parser() -> cmd2.Cmd2ArgumentParser:
+    parser = cmd2.Cmd2ArgumentParser()
+    subparsers = parser.add_subparsers(dest="subcommand")
+    sub_parser = subparsers.add_parser("sub")
+    for num in range(50):
+        sub_parser.add_argument(f"--flag{num:02}", choices=["one", "two", "three"])
+    return parser
+
+
+class _FlagsApp(cmd2.Cmd):
+    """App with a command whose subcommand has many flags."""
+
+    def __init__(self) -> None:
+        super().__init__(stdin=io.StringIO(), stdout=io.StringIO(), allow_cli_args=False)
+
+    @cmd2.with_argparser(_flags_parser)
+    def do_flags(self, _: object) -> None:
+        """Command with a subcommand which has many flags."""
+
+
+@benchmark
+def complete_argument() -> tuple[Callable[[], object], int]:
+    """Cmd.complete() per keystroke while typing a subcommand's flags and their values."""
+    app = _FlagsApp()
+    lines = ["flags sub --flag0", "flags sub --flag01 ", "flags sub --flag01 t", "flags sub --flag01 two --flag4"]
+
+    def run() -> None:
+        for line in lines:
+            text = line.rpartition(" ")[2]
+            app.complete(text, line, len(line) - len(text), len(line))
+
+    return run, len(lines)
+
+
+def _hostnames(count: int) -> tuple[cmd2.CompletionItem, ...]:
+    """Hostnames in a tuple, like the items of the Choices a choices_provider returns."""
+    roles = ["web", "db", "cache", "queue", "auth", "search", "mail", "proxy"]
+    return tuple(cmd2.CompletionItem(f"{roles[num % len(roles)]}-{num:07}.dc{num % 5}.example.com") for num in range(count))
+
+
+def _fuzzy_match(count: int) -> tuple[Callable[[], object], int]:
+    candidates = _hostnames(count)
+    matcher = cmd2.FuzzyMatcher(limit=100)
+    words = ["w", "web", "web-00012", "wb12", "dc3prx"]
+
+    def run() -> None:
+        for word in words:
+            matcher.match(word, candidates)
+
+    return run, len(words)
+
+
+@benchmark
+def fuzzy_match_10k() -> tuple[Callable[[], object], int]:
+    """FuzzyMatcher.match() per keystroke for the best 100 of 10,000 hostnames."""
+    return _fuzzy_match(10_000)
+
+
+@benchmark
+def fuzzy_match_100k() -> tuple[Callable[[], object], int]:
+    """FuzzyMatcher.match() per keystroke for the best 100 of 100,000 hostnames."""
+    return _fuzzy_match(100_000)
+
+
+@benchmark
+def fuzzy_match_1m() -> tuple[Callable[[], object], int]:
+    """FuzzyMatcher.match() per keystroke for the best 100 of 1,000,000 hostnames."""
+    return _fuzzy_match(1_000_000)
@@ -0,0 +1,133 @@
+"""Realistic command lines used as benchmark input.
+
+The corpus is generated from a fixed seed so every run measures exactly the same lines.
+"""
+
+import random
+
+# Settings for the StatementParser used by the benchmarks
+TERMINATORS = (";",)
+MULTILINE_COMMANDS = ("sql", "note")
+SHORTCUTS = {"?": "help", "!": "shell", "@": "run_script", "@@": "_relative_run_script"}
+
+_COMMANDS = ("help", "history", "set", "edit", "speak", "deploy", "query", "copy", "find")
+_WORDS = ("alpha", "beta", "gamma", "delta", "--verbose", "-n", "42", "path/to/file.txt", "0x1f", "key=value")
+_UNICODE_WORDS = ("héllo", "wörld", "日本語", "данные", "naïve", "café", "✓", "🚀", "Ελληνικά")
+_TARGETS = ("out.txt", "'/tmp/my log.txt'", "results.csv", "/dev/null")
+_PIPES = ("grep error", "sort -u", "wc -l", "head -n 20", "tee copy.txt")
+
+
+def _word(rng: random.Random) -> str:
+    return rng.choice(_UNICODE_WORDS) if rng.random() < 0.2 else rng.choice(_WORDS)
+
+
+def _quoted(rng: random.Random, length: int) -> str:
+    quote = rng.choice(('"', "'"))
+    text = " ".join(_word(rng) for _ in range(length))
+    return f"{quote}{text}{quote}"
+
+
+def _plain_line(rng: random.Random) -> str:
+    return " ".join([rng.choice(_COMMANDS), *(_word(rng) for _ in range(rng.randint(0, 6)))])
+
+
+def _quoted_line(rng: random.Random) -> str:
+    args = [_quoted(rng, rng.randint(5, 40)) if rng.random() < 0.5 else _word(rng) for _ in range(rng.randint(1, 5))]
+    return " ".join([rng.choice(_COMMANDS), *args])
+
+
+def _redirected_line(rng: random.Random) -> str:
+    parts = [_plain_line(rng)]
+    parts.extend(f"| {rng.choice(_PIPES)}" for _ in range(rng.randint(1, 4)))
+    parts.append(f"{rng.choice(('>', '>>'))} {rng.choice(_TARGETS)}")
+    return " ".join(parts)
+
+
+def _multiline_line(rng: random.Random) -> str:
+    lines = [f"{rng.choice(MULTILINE_COMMANDS)} {_word(rng)}"]
+    lines.extend(" ".join(_word(rng) for _ in range(rng.randint(2, 10))) for _ in range(rng.randint(1, 6)))
+    lines[-1] += ";"
+    if rng.random() < 0.5:
+        lines[-1] += f" > {rng.choice(_TARGETS)}"
+    return "\n".join(lines)
+
+
+def _shortcut_line(rng: random.Random) -> str:
+    return rng.choice(("!", "?", "@", "@@")) + _plain_line(rng)
+
+
+def _comment_line(rng: random.Random) -> str:
+    return f"# {_plain_line(rng)}"
+
+
+def command_lines(count: int = 1000, seed: int = 2024) -> list[str]:
+    """Build a mix of complete command lines like those found in scripts and history.
+
+    :param count: number of lines
+    :param seed: random seed
+    :return: the lines
+    """
+    rng = random.Random(seed)  # noqa: S311
+    builders = (
+        (_plain_line, 30),
+        (_quoted_line, 20),
+        (_redirected_line, 20),
+        (_multiline_line, 15),
+        (_shortcut_line, 10),
+        (_comment_line, 5),
+    )
+    funcs = [func for func, _weight in builders]
+    weights = [weight for _func, weight in builders]
+    return [rng.choices(funcs, weights)[0](rng) for _ in range(count)]
+
+
+def aliases(count: int = 500, seed: int = 2024) -> dict[str, str]:
+    """Build a large set of aliases, including some which refer to other aliases.
+
+    :param count: number of aliases
+    :param seed: random seed
+    :return: dictionary mapping alias names to their values
+    """
+    rng = random.Random(seed)  # noqa: S311
+    result: dict[str, str] = {}
+    for index in range(count):
+        name = f"al{index}"
+        if result and rng.random() < 0.3:
+            # An alias of an earlier alias, with some arguments added
+            result[name] = f"{rng.choice(list(result))} {_word(rng)}"
+        else:
+            result[name] = _plain_line(rng)
+    return result
+
+
+def aliased_lines(alias_names: list[str], count: int = 1000, seed: int = 2024) -> list[str]:
+    """Build command lines where most commands are aliases.
+
+    :param alias_names: names of the available aliases
+    :param count: number of lines
+    :param seed: random seed
+    :return: the lines
+    """
+    rng = random.Random(seed)  # noqa: S311
+    lines = []
+    for _ in range(count):
+        command = rng.choice(alias_names) if rng.random() < 0.8 else rng.choice(_COMMANDS)
+        lines.append(" ".join([command, *(_word(rng) for _ in range(rng.randint(0, 4)))]))
+    return lines
+
+
+def macro_values(count: int = 50, seed: int = 2024) -> list[tuple[str, int]]:
+    """Build macro values which use many arguments.
+
+    :param count: number of macros
+    :param seed: random seed
+    :return: list of macro values and the number of arguments each one requires
+    """
+    rng = random.Random(seed)  # noqa: S311
+    values = []
+    for _ in range(count):
+        arg_count = rng.randint(1, 40)
+        parts = [rng.choice(_COMMANDS)]
+        parts.extend(f"{_word(rng)} {{{number}}}" for number in range(1, arg_count + 1))
+        values.append((" ".join(parts), arg_count))
+    return values
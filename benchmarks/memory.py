@@ -0,0 +1,72 @@
+"""Measure the memory used by many Cmd instances, like a server which creates one per client.
+
+Examples:
+    python -m benchmarks.memory
+    python -m benchmarks.memory --instances 500
+
+"""
+
+import argparse
+import gc
+import io
+import sys
+import tracemalloc
+
+import cmd2
+
+
+def _new_app() -> cmd2.Cmd:
+    """Create an app whose commands have all been used, so every command's parser has been built."""
+    app = cmd2.Cmd(stdin=io.StringIO(), stdout=io.StringIO(), allow_cli_args=False)
+    for command in app.get_all_commands():
+        command_func = app.get_command_func(command)
+        if command_func is not None:
+            app.command_parsers.get(command_func)
+    return app
+
+
+def measure(count: int) -> int:
+    """Measure the memory used by a number of apps.
+
+    One app is created before measuring, so one-time costs like imports and shared caches aren't counted.
+
+    :param count: number of apps to create
+    :return: number of bytes allocated while creating the apps which are still in use
+    """
+    _new_app()
+    gc.collect()
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        apps = [_new_app() for _ in range(count)]
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    del apps
+    return used
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Print the memory used by a number of apps.
+
+    :param argv: command line arguments (default: sys.argv[1:])
+    :return: exit code
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.memory", description="Measure the memory used by Cmd instances."
+    )
+    parser.add_argument(
+        "-n", "--instances", type=int, default=100, help="number of instances to create (default: %(default)s)"
+    )
+    args = parser.parse_args(argv)
+
+    used = measure(args.instances)
+    print(f"{args.instances} instances: {used / 2**20:.1f} MiB, {used / args.instances / 2**10:.1f} KiB per instance")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""Benchmarks for command line parsing."""
+
+import io
+from collections.abc import Callable
+
+import cmd2
+from cmd2.parsing import (
+    Statement,
+    StatementParser,
+    shlex_split,
+)
+
+from . import corpus
+from .runner import benchmark
+
+
+def _parser(aliases: dict[str, str] | None = None) -> StatementParser:
+    # The parse cache is left disabled so every call does the full amount of work
+    return StatementParser(
+        terminators=corpus.TERMINATORS,
+        multiline_commands=corpus.MULTILINE_COMMANDS,
+        aliases=aliases,
+        shortcuts=corpus.SHORTCUTS,
+    )
+
+
+@benchmark
+def parse() -> tuple[Callable[[], object], int]:
+    """StatementParser.parse() per line."""
+    parser = _parser()
+    lines = corpus.command_lines()
+
+    def run() -> None:
+        for line in lines:
+            parser.parse(line)
+
+    return run, len(lines)
+
+
+@benchmark
+def parse_command_only() -> tuple[Callable[[], object], int]:
+    """StatementParser.parse_command_only() per line."""
+    parser = _parser()
+    lines = corpus.command_lines()
+
+    def run() -> None:
+        for line in lines:
+            parser.parse_command_only(line)
+
+    return run, len(lines)
+
+
+@benchmark
+def tokenize() -> tuple[Callable[[], object], int]:
+    """StatementParser.tokenize() per line."""
+    parser = _parser()
+    lines = [line for line in corpus.command_lines() if not line.startswith("#")]
+
+    def run() -> None:
+        for line in lines:
+            parser.tokenize(line)
+
+    return run, len(lines)
+
+
+@benchmark
+def expand_aliases() -> tuple[Callable[[], object], int]:
+    """Alias and shortcut expansion with 500 aliases per line."""
+    aliases = corpus.aliases()
+    parser = _parser(aliases)
+    lines = corpus.aliased_lines(list(aliases))
+
+    def run() -> None:
+        for line in lines:
+            parser._expand(line)
+
+    return run, len(lines)
+
+
+@benchmark
+def split_on_punctuation() -> tuple[Callable[[], object], int]:
+    """StatementParser.split_on_punctuation() per line."""
+    parser = _parser()
+    token_lists = [shlex_split(line) for line in corpus.command_lines() if not line.startswith("#")]
+
+    def run() -> None:
+        for tokens in token_lists:
+            parser.split_on_punctuation(tokens)
+
+    return run, len(token_lists)
+
+
+@benchmark
+def statement_argv() -> tuple[Callable[[], object], int]:
+    """Statement.argv and arg_list of a new Statement."""
+    parser = _parser()
+
+    # argv is computed once per Statement, so new Statements are created from these on each call
+    fields = [parser.parse(line).to_tuple() for line in corpus.command_lines()]
+
+    def run() -> None:
+        for values in fields:
+            statement = Statement.from_tuple(values)
+            _ = statement.argv, statement.arg_list, statement.argv
+
+    return run, len(fields)
+
+
+@benchmark
+def parse_many() -> tuple[Callable[[], object], int]:
+    """StatementParser.parse_many() per line of a script."""
+    parser = _parser()
+    lines = [line for line in corpus.command_lines() if "\n" not in line]
+
+    def run() -> None:
+        for _ in parser.parse_many(lines):
+            pass
+
+    return run, len(lines)
+
+
+@benchmark
+def multiline_scanner() -> tuple[Callable[[], object], int]:
+    """MultilineScanner per line added to a 200 line statement."""
+    parser = _parser()
+    lines = [line.replace("\n", " ").rstrip(";") for line in corpus.command_lines(200)]
+
+    def run() -> None:
+        scanner = parser.multiline_scanner(f"{corpus.MULTILINE_COMMANDS[0]} start")
+        for line in lines:
+            scanner.add_line(line)
+
+    return run, len(lines)
+
+
+@benchmark
+def resolve_macro() -> tuple[Callable[[], object], int]:
+    """Macro resolution per statement."""
+    app = cmd2.Cmd(stdin=io.StringIO(), stdout=io.StringIO())
+    statements = []
+    for index, (value, arg_count) in enumerate(corpus.macro_values()):
+        name = f"mac{index}"
+        app.onecmd_plus_hooks(f"macro create {name} {value}")
+        args = " ".join(f"arg{number}" for number in range(arg_count + 2))
+        statements.append(app.statement_parser.parse(f"{name} {args} > out.txt"))
+
+    def run() -> None:
+        for statement in statements:
+            app._resolve_macro(statement)
+
+    return run, len(statements)
@@ -0,0 +1,155 @@
+"""Run benchmarks and compare their results to a baseline."""
+
+import platform
+import timeit
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+# Version of the JSON results format
+RESULTS_VERSION = 1
+
+
+@dataclass(frozen=True, slots=True)
+class Benchmark:
+    """A named benchmark."""
+
+    name: str
+
+    # Builds the benchmark's input and returns a function which processes all of it once,
+    # along with the number of operations (e.g. lines parsed) that function performs.
+    setup: Callable[[], tuple[Callable[[], object], int]]
+
+    # Short description shown in reports
+    description: str = ""
+
+
+# Builds a benchmark's input and returns a function which processes all of it, along with
+# the number of operations that function performs
+Setup = Callable[[], tuple[Callable[[], object], int]]
+
+# All registered benchmarks in the order they were defined
+BENCHMARKS: list[Benchmark] = []
+
+
+def benchmark(setup: Setup) -> Setup:
+    """Register a benchmark setup function using its name and docstring."""
+    description = (setup.__doc__ or "").strip().rstrip(".")
+    BENCHMARKS.append(Benchmark(setup.__name__, setup, description))
+    return setup
+
+
+@dataclass(frozen=True, slots=True)
+class Result:
+    """Timing result of one benchmark."""
+
+    name: str
+
+    # Best time per operation in seconds
+    seconds_per_op: float
+
+    # Number of operations in each timed call
+    ops: int
+
+    # Number of timed calls in each repeat
+    number: int
+
+
+@dataclass(frozen=True, slots=True)
+class Comparison:
+    """Comparison of a result with its baseline."""
+
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        """Current time divided by baseline time, so values above 1 are slower."""
+        return self.current / self.baseline
+
+
+def run_benchmark(benchmark: Benchmark, *, repeat: int = 5, min_time: float = 0.2) -> Result:
+    """Time a benchmark.
+
+    The function returned by the benchmark's setup is called enough times to run for at
+    least min_time seconds. That is repeated, and the fastest repeat is kept since slower
+    ones only measure interference from other processes.
+
+    :param benchmark: the benchmark to run
+    :param repeat: number of times to repeat the measurement
+    :param min_time: minimum number of seconds for each repeat
+    :return: the timing result
+    """
+    func, ops = benchmark.setup()
+    timer = timeit.Timer(func)
+
+    # Warm up caches and find how many calls are needed to run for min_time
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / elapsed) if elapsed else number * 10)
+
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return Result(benchmark.name, best / number / ops, ops, number)
+
+
+def results_to_json(results: list[Result]) -> dict[str, Any]:
+    """Build the JSON document for a set of results.
+
+    :param results: benchmark results
+    :return: JSON compatible dictionary
+    """
+    return {
+        "version": RESULTS_VERSION,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "results": {
+            result.name: {
+                "seconds_per_op": result.seconds_per_op,
+                "ops": result.ops,
+                "number": result.number,
+            }
+            for result in results
+        },
+    }
+
+
+def baseline_times(baseline: dict[str, Any]) -> dict[str, float]:
+    """Get the time per operation of each benchmark in a baseline JSON document.
+
+    :param baseline: JSON document created by results_to_json()
+    :return: dictionary mapping benchmark names to seconds per operation
+    :raises ValueError: if the baseline uses an unsupported format
+    """
+    version = baseline.get("version")
+    if version != RESULTS_VERSION:
+        raise ValueError(f"Unsupported baseline version: {version}. Expected version {RESULTS_VERSION}.")
+    return {name: result["seconds_per_op"] for name, result in baseline["results"].items()}
+
+
+def compare(results: list[Result], baseline: dict[str, float]) -> list[Comparison]:
+    """Compare results to a baseline. Benchmarks missing from the baseline are skipped.
+
+    :param results: benchmark results
+    :param baseline: dictionary mapping benchmark names to seconds per operation
+    :return: a comparison for each result which has a baseline
+    """
+    return [
+        Comparison(result.name, baseline[result.name], result.seconds_per_op) for result in results if result.name in baseline
+    ]
+
+
+def format_time(seconds: float) -> str:
+    """Format a duration using a convenient unit.
+
+    :param seconds: the duration
+    :return: the formatted duration
+    """
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
@@ -0,0 +1,48 @@
+"""Benchmarks for creating a Cmd instance."""
+
+import io
+from collections.abc import Callable
+
+import cmd2
+
+from .runner import benchmark
+
+# Number of instances created by each timed call
+_COUNT = 20
+
+
+def _new_app(*, headless: bool = False) -> cmd2.Cmd:
+    return cmd2.Cmd(stdin=io.StringIO(), stdout=io.StringIO(), allow_cli_args=False, headless=headless)
+
+
+@benchmark
+def instantiate() -> tuple[Callable[[], object], int]:
+    """Cmd() per instance, as when an app only runs commands from scripts or onecmd_plus_hooks()."""
+
+    def run() -> None:
+        for _ in range(_COUNT):
+            _new_app()
+
+    return run, _COUNT
+
+
+@benchmark
+def instantiate_headless() -> tuple[Callable[[], object], int]:
+    """Cmd(headless=True) per instance."""
+
+    def run() -> None:
+        for _ in range(_COUNT):
+            _new_app(headless=True)
+
+    return run, _COUNT
+
+
+@benchmark
+def instantiate_with_session() -> tuple[Callable[[], object], int]:
+    """Cmd() per instance including creating its main PromptSession, as when reading from a prompt."""
+
+    def run() -> None:
+        for _ in range(_COUNT):
+            _ = _new_app().main_session
+
+    return run, _COUNT
@@ -1,11 +1,5 @@
 """Import certain things for backwards compatibility."""
 
-import contextlib
-import importlib.metadata as importlib_metadata
-
-with contextlib.suppress(importlib_metadata.PackageNotFoundError):
-    __version__ = importlib_metadata.version(__name__)
-
 from . import (
     plugin,
     rich_utils,
@@ -24,7 +18,10 @@ from .argparse_utils import (
 )
 from .cmd2 import Cmd
 from .colors import Color
-from .command_set import CommandSet
+from .command_set import (
+    CommandSet,
+    LazyCommandSet,
+)
 from .completion import (
     Choices,
     CompletionItem,
@@ -47,6 +44,12 @@ from .exceptions import (
     PassThroughException,
     SkipPostcommandHooks,
 )
+from .matching import (
+    CaseInsensitiveMatcher,
+    FuzzyMatcher,
+    Matcher,
+    PrefixMatcher,
+)
 from .parsing import Statement
 from .py_bridge import CommandResult
 from .rich_utils import (
@@ -84,6 +87,7 @@ __all__: list[str] = [  # noqa: RUF022
     "Cmd",
     "CommandResult",
     "CommandSet",
+    "LazyCommandSet",
     "Statement",
     # Colors
     "Color",
@@ -91,6 +95,10 @@ __all__: list[str] = [  # noqa: RUF022
     "Choices",
     "CompletionItem",
     "Completions",
+    "Matcher",
+    "PrefixMatcher",
+    "CaseInsensitiveMatcher",
+    "FuzzyMatcher",
     # Annotated commands
     "ArgumentBlock",
     # Decorators
@@ -130,3 +138,19 @@ __all__: list[str] = [  # noqa: RUF022
     "Settable",
     "set_default_str_sort_key",
 ]
+
+
+def __getattr__(name: str) -> str:
+    """Look up __version__ the first time it's accessed, since importlib.metadata is slow to import."""
+    if name == "__version__":
+        import importlib.metadata as importlib_metadata
+
+        try:
+            version = importlib_metadata.version(__name__)
+        except importlib_metadata.PackageNotFoundError:
+            pass
+        else:
+            globals()["__version__"] = version
+            return version
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
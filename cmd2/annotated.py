@@ -308,8 +308,13 @@ from .completion import CompletionItem
 from .decorators import _parse_positionals
 from .exceptions import Cmd2ArgparseError
 from .rich_utils import Cmd2HelpFormatter, HelpContent
+from .timing import (
+    PHASE_ARGPARSE,
+    PHASE_COMMAND,
+)
 from .types import (
     CmdOrSetT,
+    CommandFuncResult,
     UnboundChoicesProvider,
     UnboundCompleter,
 )
@@ -3087,7 +3092,7 @@ def with_annotated(
         parser_builder = _make_parser_builder(fn, skip_params=skip_params, base_command=base_command, options=options)
 
         @functools.wraps(fn)
-        def cmd_wrapper(*args: Any, **kwargs: Any) -> bool | None:
+        def cmd_wrapper(*args: Any, **kwargs: Any) -> CommandFuncResult:
             cmd2_app, statement_arg = _parse_positionals(args)
             owner = args[0]  # Cmd or CommandSet instance
             statement, parsed_arglist = cmd2_app.statement_parser.get_command_arg_list(
@@ -3104,6 +3109,10 @@ def with_annotated(
                 provider_self = cmd2_app._resolve_func_self(ns_provider, args[0])
                 namespace = ns_provider(provider_self if provider_self is not None else cmd2_app)
 
+            timing = cmd2_app.command_timing
+            if timing is not None:
+                timing.mark(PHASE_COMMAND)
+
             try:
                 if with_unknown_args:
                     ns, unknown = arg_parser.parse_known_args(parsed_arglist, namespace)
@@ -3112,6 +3121,9 @@ def with_annotated(
                     unknown = None
             except SystemExit as exc:
                 raise Cmd2ArgparseError from exc
+            finally:
+                if timing is not None:
+                    timing.mark(PHASE_ARGPARSE)
 
             setattr(ns, constants.NS_ATTR_STATEMENT, statement)
             handler = getattr(ns, constants.NS_ATTR_SUBCOMMAND_FUNC, None)
@@ -3127,7 +3139,7 @@ def with_annotated(
 
             func_kwargs.update(kwargs)
             _reconstruct_dataclass_blocks(func_kwargs, blocks, ns)
-            result: bool | None = _invoke_command_func(
+            result: CommandFuncResult = _invoke_command_func(
                 fn, owner, func_kwargs, leading_names=leading_names, var_positional_name=var_positional_name
             )
             return result
@@ -29,6 +29,7 @@ from .argparse_utils import (
 from .command_set import CommandSet
 from .completion import (
     CompletionItem,
+    CompletionResultsBase,
     Completions,
 )
 from .constants import INFINITY
@@ -127,6 +128,82 @@ class _ArgumentState:
             self.max = cast(int, self.action.nargs)
 
 
+class _ParserIndex:
+    """The arguments of a parser, organized the way ArgparseCompleter looks them up.
+
+    Building this walks all of the parser's actions, so it's stored on the parser and shared by every
+    ArgparseCompleter created for it. It's rebuilt if arguments have been added to the parser since.
+    """
+
+    def __init__(self, parser: Cmd2ArgumentParser) -> None:
+        """Index a parser's arguments.
+
+        :param parser: the parser to index
+        """
+        self.version = self._parser_version(parser)
+
+        # All flags in this command
+        self.flags: list[str] = []
+
+        # Maps flags to the argparse action object
+        self.flag_to_action: dict[str, argparse.Action] = {}
+
+        # Actions for positional arguments (by position index)
+        self.positional_actions: list[argparse.Action] = []
+
+        # This will be set if the parser has subcommands
+        self.subcommand_action: argparse._SubParsersAction[Cmd2ArgumentParser] | None = None
+
+        # _actions is the top level container of parameter definitions
+        for action in parser._actions:
+            # if the parameter is flag based, it will have option_strings
+            if action.option_strings:
+                # record each option flag
+                for option in action.option_strings:
+                    self.flags.append(option)
+                    self.flag_to_action[option] = action
+
+            # Otherwise this is a positional parameter
+            else:
+                self.positional_actions.append(action)
+                # Check if this action defines subcommands
+                if isinstance(action, argparse._SubParsersAction):
+                    self.subcommand_action = action
+
+        # Actions which are flags
+        self.flag_actions = set(self.flag_to_action.values())
+
+        # The mutually exclusive group each action belongs to. An action can only be in one.
+        self.mutex_groups: dict[argparse.Action, argparse._MutuallyExclusiveGroup] = {}
+        for group in parser._mutually_exclusive_groups:
+            for action in group._group_actions:
+                self.mutex_groups.setdefault(action, group)
+
+    @staticmethod
+    def _parser_version(parser: Cmd2ArgumentParser) -> tuple[int, argparse.Action | None, int]:
+        """Describe a parser's arguments so changes to them can be detected.
+
+        Adding an argument, either to the parser or to one of its groups, appends it to the parser's
+        actions. When conflict_handler is "resolve", an argument may also be removed, but only while
+        adding one which replaces it.
+        """
+        actions = parser._actions
+        return len(actions), actions[-1] if actions else None, len(parser._mutually_exclusive_groups)
+
+    @classmethod
+    def get(cls, parser: Cmd2ArgumentParser) -> "_ParserIndex":
+        """Get the index stored on a parser, building it if the parser's arguments have changed.
+
+        :param parser: the parser whose index to get
+        :return: the parser's index
+        """
+        index: _ParserIndex | None = getattr(parser, "_completer_index", None)
+        if index is None or index.version != cls._parser_version(parser):
+            index = cls(parser)
+            parser._completer_index = index
+        return index
+
+
 class _UnfinishedFlagError(CompletionError):
     def __init__(self, flag_arg_state: _ArgumentState) -> None:
         """CompletionError which occurs when the user has not finished the current flag.
@@ -177,34 +254,13 @@ class ArgparseCompleter:
             parent_tokens = {}
         self._parent_tokens = parent_tokens
 
-        # All flags in this command
-        self._flags: list[str] = []
-
-        # Maps flags to the argparse action object
-        self._flag_to_action: dict[str, argparse.Action] = {}
-
-        # Actions for positional arguments (by position index)
-        self._positional_actions: list[argparse.Action] = []
-
-        # This will be set if self._parser has subcommands
-        self._subcommand_action: argparse._SubParsersAction[Cmd2ArgumentParser] | None = None
-
-        # Start digging through the argparse structures.
-        # _actions is the top level container of parameter definitions
-        for action in self._parser._actions:
-            # if the parameter is flag based, it will have option_strings
-            if action.option_strings:
-                # record each option flag
-                for option in action.option_strings:
-                    self._flags.append(option)
-                    self._flag_to_action[option] = action
-
-            # Otherwise this is a positional parameter
-            else:
-                self._positional_actions.append(action)
-                # Check if this action defines subcommands
-                if isinstance(action, argparse._SubParsersAction):
-                    self._subcommand_action = action
+        # The parser's arguments, indexed once and shared by every completer for this parser.
+        # These must not be modified.
+        self._index = _ParserIndex.get(parser)
+        self._flags = self._index.flags
+        self._flag_to_action = self._index.flag_to_action
+        self._positional_actions = self._index.positional_actions
+        self._subcommand_action = self._index.subcommand_action
 
     def complete(
         self,
@@ -426,35 +482,34 @@ class ArgparseCompleter:
                                  has already been used.
         """
         # Check if this action is in a mutually exclusive group
-        for group in self._parser._mutually_exclusive_groups:
-            if arg_action in group._group_actions:
-                # Check if the group this action belongs to has already been completed
-                if group in completed_mutex_groups:
-                    # If this is the action that completed the group, then there is no error
-                    # since it's allowed to appear on the command line more than once.
-                    completer_action = completed_mutex_groups[group]
-                    if arg_action == completer_action:
-                        return
-
-                    arg_str = f"{argparse._get_action_name(arg_action)}"
-                    completer_str = f"{argparse._get_action_name(completer_action)}"
-                    error = f"Error: argument {arg_str}: not allowed with argument {completer_str}"
-                    raise CompletionError(error)
-
-                # Mark that this action completed the group
-                completed_mutex_groups[group] = arg_action
-
-                # Don't complete any of the other args in the group
-                for group_action in group._group_actions:
-                    if group_action == arg_action:
-                        continue
-                    if group_action in self._flag_to_action.values():
-                        used_flags.update(group_action.option_strings)
-                    elif group_action in remaining_positionals:
-                        remaining_positionals.remove(group_action)
-
-                # Arg can only be in one group, so we are done
-                break
+        group = self._index.mutex_groups.get(arg_action)
+        if group is None:
+            return
+
+        # Check if the group this action belongs to has already been completed
+        if group in completed_mutex_groups:
+            # If this is the action that completed the group, then there is no error
+            # since it's allowed to appear on the command line more than once.
+            completer_action = completed_mutex_groups[group]
+            if arg_action == completer_action:
+                return
+
+            arg_str = f"{argparse._get_action_name(arg_action)}"
+            completer_str = f"{argparse._get_action_name(completer_action)}"
+            error = f"Error: argument {arg_str}: not allowed with argument {completer_str}"
+            raise CompletionError(error)
+
+        # Mark that this action completed the group
+        completed_mutex_groups[group] = arg_action
+
+        # Don't complete any of the other args in the group
+        for group_action in group._group_actions:
+            if group_action == arg_action:
+                continue
+            if group_action in self._index.flag_actions:
+                used_flags.update(group_action.option_strings)
+            elif group_action in remaining_positionals:
+                remaining_positionals.remove(group_action)
 
     def _handle_last_token(
         self,
@@ -771,27 +826,50 @@ class ArgparseCompleter:
                 cmd_set,
             )
             args.extend([text, line, begidx, endidx])
-            completions: Completions = completer(*args, **kwargs)
+            completions: Completions = self._cmd_app._await_completion(
+                completer(*args, **kwargs),
+                arg_state.action.get_completion_timeout(),  # type: ignore[attr-defined]
+            )
 
         # Otherwise it uses a choices provider or choices list
         else:
-            choices_provider = arg_state.action.get_choices_provider()  # type: ignore[attr-defined]
-            if choices_provider is not None:
-                args, kwargs = self._prepare_callable_params(
-                    choices_provider,
-                    arg_state,
-                    text,
-                    consumed_arg_values,
-                    cmd_set,
-                )
-                all_choices = list(choices_provider(*args, **kwargs))
+            # Everything before the token determines the choices, so reuse the matches of an earlier
+            # completion of this token if the user has only typed more of it since then.
+            matcher = arg_state.action.get_completion_matcher() or self._cmd_app.completion_matcher  # type: ignore[attr-defined]
+            cache = self._cmd_app._thread_state.choices_cache if matcher.narrowable else None
+            cache_key = (line[:begidx], arg_state.action, matcher)
+
+            if cache is not None and (cached := cache.get(cache_key, text, self._cmd_app.completion_cache_ttl)) is not None:
+                completions = self._cmd_app.basic_complete(text, line, begidx, endidx, cached, matcher=matcher)
+                cache.narrow(cache_key, text, completions.items)
             else:
-                all_choices = self._choices_to_items(arg_state)
-
-            # Filter used values and run basic completion
-            used_values = consumed_arg_values.get(arg_state.action.dest, [])
-            filtered = [choice for choice in all_choices if choice.text not in used_values]
-            completions = self._cmd_app.basic_complete(text, line, begidx, endidx, filtered)
+                choices_provider = arg_state.action.get_choices_provider()  # type: ignore[attr-defined]
+                if choices_provider is not None:
+                    args, kwargs = self._prepare_callable_params(
+                        choices_provider,
+                        arg_state,
+                        text,
+                        consumed_arg_values,
+                        cmd_set,
+                    )
+                    choices = self._cmd_app._await_completion(
+                        choices_provider(*args, **kwargs),
+                        arg_state.action.get_completion_timeout(),  # type: ignore[attr-defined]
+                    )
+
+                    # Keep the items of a Choices object in their tuple, which matchers can cache work for
+                    all_choices: Sequence[CompletionItem] = (
+                        choices.items if isinstance(choices, CompletionResultsBase) else list(choices)
+                    )
+                else:
+                    all_choices = self._choices_to_items(arg_state)
+
+                # Filter used values and run basic completion
+                used_values = consumed_arg_values.get(arg_state.action.dest, [])
+                filtered = [choice for choice in all_choices if choice.text not in used_values] if used_values else all_choices
+                completions = self._cmd_app.basic_complete(text, line, begidx, endidx, filtered, matcher=matcher)
+                if cache is not None:
+                    cache.store(cache_key, text, completions.items)
 
         return self._build_completion_table(arg_state, completions)
 
@@ -110,6 +110,31 @@ values. All tokens are stored in the dictionary as the raw strings provided on
 the command line. It is up to the developer to determine if the user entered
 the correct argument type (e.g. int) and validate their values.
 
+``choices_provider`` and ``completer`` functions can be async, or return any other
+awaitable or a ``concurrent.futures.Future``. This suits slow data sources like
+remote lookups. Awaitables run on the app's event loop. When the user changes what
+they typed before the result arrives, cmd2 cancels the request and discards its
+result. After a short wait, it shows a loading hint. To limit how long cmd2 waits,
+pass ``completion_timeout`` to add_argument(). When that many seconds pass, the
+request is cancelled and an error is shown.
+
+    Example::
+
+        async def my_choices_provider(self) -> Choices:
+            return Choices.from_values(await fetch_hosts())
+
+
+        parser.add_argument("host", choices_provider=my_choices_provider, completion_timeout=5)
+
+By default, an argument's values are completed if they start with the text being
+completed. To match them another way, pass a ``Matcher`` from ``cmd2.matching`` as
+``completion_matcher``. ``FuzzyMatcher`` matches values which contain the typed
+characters in order and lists the best matches first.
+
+    Example::
+
+        parser.add_argument("host", choices_provider=my_choices_provider, completion_matcher=FuzzyMatcher())
+
 **CompletionItem Class**
 
 This class represents a single completion result and what the ``Choices``
@@ -252,6 +277,7 @@ from rich.table import Column
 
 from . import constants
 from .completion import CompletionItem
+from .matching import Matcher
 from .rich_utils import (
     Cmd2HelpFormatter,
     HelpContent,
@@ -264,7 +290,10 @@ from .types import (
 )
 
 if TYPE_CHECKING:  # pragma: no cover
-    from .argparse_completer import ArgparseCompleter
+    from .argparse_completer import (
+        ArgparseCompleter,
+        _ParserIndex,
+    )
 
     # In Python 3.14+, move these definitions outside the TYPE_CHECKING
     # block as staticmethod/classmethod become subscriptable at runtime.
@@ -441,6 +470,13 @@ def _validate_completion_callable(self: argparse.Action, value: Any) -> Any:
     return value
 
 
+def _validate_completion_timeout(_self: argparse.Action, value: Any) -> Any:
+    """Validate that a completion_timeout value is a positive number of seconds."""
+    if value is not None and (isinstance(value, bool) or not isinstance(value, int | float) or value <= 0):
+        raise ValueError(f"completion_timeout must be a positive number of seconds, not {value!r}")
+    return value
+
+
 # Add new attributes to argparse.Action.
 # See _ActionsContainer_add_argument() for details on these attributes.
 register_argparse_argument_parameter("choices_provider", validator=_validate_completion_callable)
@@ -448,6 +484,8 @@ register_argparse_argument_parameter("completer", validator=_validate_completion
 register_argparse_argument_parameter("table_columns")
 register_argparse_argument_parameter("nargs_range")
 register_argparse_argument_parameter("suppress_tab_hint")
+register_argparse_argument_parameter("completion_timeout", validator=_validate_completion_timeout)
+register_argparse_argument_parameter("completion_matcher")
 
 
 ############################################################################################################
@@ -466,6 +504,8 @@ def _ActionsContainer_add_argument(  # noqa: N802
     completer: UnboundCompleter[CmdOrSetT] | None = None,
     suppress_tab_hint: bool = False,
     table_columns: Sequence[str | Column] | None = None,
+    completion_timeout: float | None = None,
+    completion_matcher: Matcher | None = None,
     **kwargs: Any,
 ) -> argparse.Action:
     """Patch _ActionsContainer.add_argument() to support cmd2-specific settings.
@@ -486,6 +526,10 @@ def _ActionsContainer_add_argument(  # noqa: N802
                               argument's help text is set to argparse.SUPPRESS, then tab hints will not display
                               regardless of the value passed for suppress_tab_hint. Defaults to False.
     :param table_columns: optional headers for when displaying a completion table. Defaults to None.
+    :param completion_timeout: maximum time in seconds to wait for an asynchronous choices_provider or completer.
+                               Defaults to None, which waits until the result is ready.
+    :param completion_matcher: decides which of this argument's choices match the text being completed and in
+                               what order. Defaults to None, which uses the app's completion_matcher.
 
     # Args from original function
     :param kwargs: keyword-arguments recognized by argparse._ActionsContainer.add_argument
@@ -569,6 +613,8 @@ def _ActionsContainer_add_argument(  # noqa: N802
     new_arg.set_completer(completer)  # type: ignore[attr-defined]
     new_arg.set_suppress_tab_hint(suppress_tab_hint)  # type: ignore[attr-defined]
     new_arg.set_table_columns(table_columns)  # type: ignore[attr-defined]
+    new_arg.set_completion_timeout(completion_timeout)  # type: ignore[attr-defined]
+    new_arg.set_completion_matcher(completion_matcher)  # type: ignore[attr-defined]
 
     # Set other registered custom attributes
     for keyword, value in custom_attribs.items():
@@ -767,6 +813,9 @@ class Cmd2ArgumentParser(argparse.ArgumentParser):
             completer_class = argparse_completer.DEFAULT_ARGPARSE_COMPLETER
         self.completer_class = completer_class
 
+        # Index of this parser's arguments which ArgparseCompleter builds when first needed
+        self._completer_index: _ParserIndex | None = None
+
         # To assist type checkers, recast these to reflect our usage of rich-argparse.
         self.formatter_class: type[Cmd2HelpFormatter]
         self.description: HelpContent | None  # type: ignore[assignment]
@@ -29,24 +29,25 @@ Documentation: https://cmd2.readthedocs.io/
 # import this module, many of these imports are lazy-loaded
 # i.e. we only import the module when we use it.
 import argparse
+import bisect
+import concurrent.futures
 import contextlib
 import copy
 import dataclasses
 import datetime
 import functools
-import glob
 import inspect
+import io
 import os
-import pydoc
 import re
 import sys
-import tempfile
 import threading
 import time
-from code import InteractiveConsole
+import weakref
 from collections import deque
 from collections.abc import (
     Callable,
+    Coroutine,
     Iterable,
     Mapping,
     Sequence,
@@ -61,34 +62,19 @@ from typing import (
     TYPE_CHECKING,
     Any,
     ClassVar,
+    Generic,
     NamedTuple,
     TextIO,
     TypeVar,
     cast,
+    overload,
 )
 
-from prompt_toolkit import (
-    filters,
-    print_formatted_text,
-)
-from prompt_toolkit.application import create_app_session, get_app
-from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
-from prompt_toolkit.completion import Completer, DummyCompleter
-from prompt_toolkit.formatted_text import ANSI, AnyFormattedText
-from prompt_toolkit.history import InMemoryHistory
-from prompt_toolkit.input import DummyInput, create_input
-from prompt_toolkit.key_binding import KeyBindings
-from prompt_toolkit.output import DummyOutput, create_output
-from prompt_toolkit.patch_stdout import patch_stdout
-from prompt_toolkit.shortcuts import CompleteStyle, PromptSession, choice, set_title
-from prompt_toolkit.styles import DynamicStyle
 from rich.console import (
     Group,
     JustifyMethod,
     RenderableType,
 )
-from rich.highlighter import ReprHighlighter
-from rich.pretty import Pretty
 from rich.rule import Rule
 from rich.style import (
     Style,
@@ -99,7 +85,6 @@ from rich.table import (
     Table,
 )
 from rich.text import Text
-from rich.traceback import Traceback
 
 from . import (
     argparse_completer,
@@ -121,10 +106,15 @@ from .clipboard import (
     get_paste_buffer,
     write_to_paste_buffer,
 )
-from .command_set import CommandSet
+from .command_set import (
+    CommandSet,
+    LazyCommandSet,
+)
 from .completion import (
     Choices,
+    ChoicesCache,
     CompletionItem,
+    CompletionRequest,
     Completions,
 )
 from .constants import (
@@ -136,6 +126,7 @@ from .decorators import (
     as_subcommand_to,
     with_argparser,
 )
+from .event_loop import EventLoopThread
 from .exceptions import (
     Cmd2ShlexError,
     CommandSetRegistrationError,
@@ -152,13 +143,31 @@ from .history import (
     History,
     HistoryItem,
 )
+from .jobs import (
+    Job,
+    JobOutput,
+)
+from .matching import (
+    Matcher,
+    PrefixMatcher,
+)
 from .parsing import (
     Macro,
     MacroArg,
+    MultilineScanner,
     Statement,
     StatementParser,
+    _ObservedDict,
     shlex_split,
 )
+from .profiling import (
+    PROFILE_ALL,
+    PROFILE_CPU,
+    PROFILE_MEMORY,
+    PROFILE_MODES,
+    PROFILE_OFF,
+    CommandProfile,
+)
 from .rich_utils import (
     Cmd2BaseConsole,
     Cmd2ExceptionConsole,
@@ -168,11 +177,25 @@ from .rich_utils import (
 )
 from .styles import Cmd2Style
 from .theme import get_pt_theme
+from .timing import (
+    NULL_COMMAND_TIMING,
+    PHASE_COMMAND,
+    PHASE_EXPANSION,
+    PHASE_FINALIZATION,
+    PHASE_PARSING,
+    PHASE_POSTCMD,
+    PHASE_POSTPARSING,
+    PHASE_PRECMD,
+    PHASE_REDIRECTION,
+    CommandTiming,
+    TimingStats,
+)
 from .types import (
-    BoundCommandFunc,
+    AnyBoundCommandFunc,
     BoundCompleter,
     CmdOrSet,
     CmdOrSetT,
+    CommandFuncResult,
     UnboundChoicesProvider,
     UnboundCompleter,
 )
@@ -193,13 +216,6 @@ except ImportError:
             super().__init__(msg)
 
 
-from .pt_utils import (
-    Cmd2Completer,
-    Cmd2History,
-    Cmd2Lexer,
-    pt_filter_style,
-    pt_resolve_color_depth,
-)
 from .utils import (
     Settable,
     get_defining_class,
@@ -209,7 +225,17 @@ from .utils import (
 )
 
 if TYPE_CHECKING:  # pragma: no cover
+    import asyncio
+    from code import InteractiveConsole
+
     from prompt_toolkit.buffer import Buffer
+    from prompt_toolkit.completion import Completer
+    from prompt_toolkit.formatted_text import ANSI, AnyFormattedText
+    from prompt_toolkit.shortcuts import PromptSession
+
+    from .pt_utils import Cmd2History
+
+T = TypeVar("T")
 
 
 class _SavedCmd2Env:
@@ -226,17 +252,210 @@ class DisabledCommand(NamedTuple):
     This data is used to restore its functions when the command is enabled.
     """
 
-    command_func: BoundCommandFunc
+    command_func: AnyBoundCommandFunc
     help_func: Callable[[], Any] | None
     completer_func: BoundCompleter | None
 
 
+class CommandInfo(NamedTuple):
+    """Information about a command. See [cmd2.Cmd.get_command_info][]."""
+
+    # The command's name
+    name: str
+
+    # The bound function that runs the command. If the command is disabled, this is the
+    # function which reports that it is disabled.
+    func: AnyBoundCommandFunc
+
+    # The help category of the command
+    category: str
+
+    # The CommandSet which provides the command or None if it is defined in the Cmd class
+    command_set: "CommandSet[Any] | None"
+
+    # Whether the command is excluded from the help menu and completion
+    hidden: bool
+
+    # Whether the command has been disabled with disable_command() or disable_category()
+    disabled: bool
+
+
+# Prefixes of the attributes which provide the commands and help topics in the command registry
+_REGISTRY_ATTR_PREFIXES = (COMMAND_FUNC_PREFIX, HELP_FUNC_PREFIX)
+
+
+class _RegisteredCommand(NamedTuple):
+    """A command in the command registry."""
+
+    # The bound do_* function. This is a placeholder while the command is disabled or its LazyCommandSet
+    # hasn't been loaded.
+    func: AnyBoundCommandFunc
+
+    # Help category of the command
+    category: str
+
+    # The CommandSet which installed the command, or None if the application's class defines it
+    command_set: CommandSet[Any] | None
+
+
+class _HookStages(NamedTuple):
+    """The hooks onecmd_plus_hooks() runs at each stage of a command.
+
+    This is rebuilt whenever a hook is registered, so running a command only has to check whether a
+    stage's tuple is empty.
+    """
+
+    postparsing: tuple[Callable[[plugin.PostparsingData], plugin.PostparsingData], ...] = ()
+    precmd: tuple[Callable[[plugin.PrecommandData], plugin.PrecommandData], ...] = ()
+    postcmd: tuple[Callable[[plugin.PostcommandData], plugin.PostcommandData], ...] = ()
+    cmdfinalization: tuple[Callable[[plugin.CommandFinalizationData], plugin.CommandFinalizationData], ...] = ()
+
+
+@dataclass
+class _CommandRegistry:
+    """The commands and help topics of a Cmd instance.
+
+    This is built from the names returned by get_names() when first needed. After that, Cmd updates it
+    whenever a do_* or help_* attribute of the instance is set or deleted, which is how commands are
+    installed, removed, disabled, and enabled.
+    """
+
+    # Commands keyed by name
+    commands: dict[str, _RegisteredCommand] = field(default_factory=dict)
+
+    # Help functions keyed by the name of their help topic
+    help_topics: dict[str, Callable[..., Any]] = field(default_factory=dict)
+
+    # Names of the commands and help topics in alphabetical order. These are sorted again after a name
+    # is added or removed.
+    _command_names: tuple[str, ...] | None = None
+    _help_topic_names: tuple[str, ...] | None = None
+
+    @property
+    def command_names(self) -> tuple[str, ...]:
+        """Names of all commands in alphabetical order."""
+        if self._command_names is None:
+            self._command_names = tuple(sorted(self.commands))
+        return self._command_names
+
+    @property
+    def help_topic_names(self) -> tuple[str, ...]:
+        """Names of all help topics in alphabetical order."""
+        if self._help_topic_names is None:
+            self._help_topic_names = tuple(sorted(self.help_topics))
+        return self._help_topic_names
+
+    def set_command(self, name: str, command: _RegisteredCommand | None) -> None:
+        """Add, replace, or remove a command.
+
+        :param name: name of the command
+        :param command: the command, or None to remove it
+        """
+        if command is None:
+            if self.commands.pop(name, None) is not None:
+                self._command_names = None
+        else:
+            if name not in self.commands:
+                self._command_names = None
+            self.commands[name] = command
+
+    def set_help_topic(self, name: str, help_func: Callable[..., Any] | None) -> None:
+        """Add, replace, or remove a help topic.
+
+        :param name: name of the help topic
+        :param help_func: the bound help_* function, or None to remove the topic
+        """
+        if help_func is None:
+            if self.help_topics.pop(name, None) is not None:
+                self._help_topic_names = None
+        else:
+            if name not in self.help_topics:
+                self._help_topic_names = None
+            self.help_topics[name] = help_func
+
+
+class _CommandNameIndex:
+    """The visible commands, aliases, and macros of a Cmd instance, indexed for completing command names.
+
+    Completing a command name is a prefix search, so the names are kept sorted and searched with bisect.
+    Each name's CompletionItem is built once, along with its position in display order, so matches are
+    neither rebuilt nor sorted with the display sort key on every keystroke.
+    """
+
+    def __init__(self, items: Sequence[CompletionItem], version: tuple[Any, ...]) -> None:
+        """Build the index.
+
+        :param items: CompletionItems of the commands, aliases, and macros
+        :param version: describes the state of the Cmd instance the items were built from
+        """
+        self.version = version
+
+        # All items in display order
+        self.choices = Choices(items=items)
+        self._items = cast(tuple[CompletionItem, ...], self.choices.items)
+
+        # Names in sorted order and each name's position in display order
+        order = sorted(range(len(self._items)), key=lambda pos: self._items[pos].text)
+        self._names = [self._items[pos].text for pos in order]
+        self._positions = order
+
+        # Completions of every name, built when first needed
+        self._all: Completions | None = None
+
+        # The range of sorted names matched by the last search and its Completions. Typing more of a
+        # name often matches the same names, so they can be returned again.
+        self._last: tuple[int, int, Completions] | None = None
+
+    def complete(self, text: str) -> Completions:
+        """Find the names which start with text.
+
+        :param text: the beginning of a name
+        :return: the matching items in display order
+        """
+        if not text:
+            if self._all is None:
+                self._all = Completions(items=self._items, is_sorted=True)
+            return self._all
+
+        # Names starting with text sort before text with its last character incremented
+        start = bisect.bisect_left(self._names, text)
+        if text[-1] == chr(sys.maxunicode):
+            end = start
+            while end < len(self._names) and self._names[end].startswith(text):
+                end += 1
+        else:
+            end = bisect.bisect_left(self._names, text[:-1] + chr(ord(text[-1]) + 1), start)
+
+        last = self._last
+        if last is not None and last[0] == start and last[1] == end:
+            return last[2]
+
+        completions = Completions(items=[self._items[pos] for pos in sorted(self._positions[start:end])], is_sorted=True)
+        self._last = (start, end, completions)
+        return completions
+
+
+# Matcher used by basic_complete() when none is given
+_PREFIX_MATCHER = PrefixMatcher()
+
+
 class CommandParsers:
     """Create and store all command method argument parsers for a given Cmd instance.
 
     Parser creation and retrieval are accomplished through the get() method.
+
+    Since building parsers is expensive, each parser is built once per class and shared by every
+    instance of that class. Shared parsers must not be modified. A Cmd instance which modifies a
+    parser, like attach_subcommand() does, builds its own copy with get_for_update().
     """
 
+    # Parsers shared by all instances, keyed by the class which owns the command. Each class's parsers
+    # are keyed by the command method's fully qualified name and the default argument parser class,
+    # since parser factories use the default class and it can be changed at runtime.
+    _shared_parsers: ClassVar[
+        "weakref.WeakKeyDictionary[type[Any], dict[tuple[str, type[Cmd2ArgumentParser]], Cmd2ArgumentParser]]"
+    ] = weakref.WeakKeyDictionary()
+
     def __init__(self, cmd_app: "Cmd") -> None:
         """Initialize CommandParsers.
 
@@ -244,19 +463,20 @@ class CommandParsers:
         """
         self._cmd_app = cmd_app
 
-        # Keyed by the fully qualified method names. This is more reliable than
-        # the methods themselves, since wrapping a method will change its address.
+        # This instance's own copies of parsers, which it can modify. Keyed by the fully qualified
+        # method names. This is more reliable than the methods themselves, since wrapping a method
+        # will change its address.
         self._parsers: dict[str, Cmd2ArgumentParser] = {}
 
     @staticmethod
-    def _fully_qualified_name(command_method: BoundCommandFunc) -> str:
+    def _fully_qualified_name(command_method: AnyBoundCommandFunc) -> str:
         """Return the fully qualified name of a method or None if a method wasn't passed in."""
         try:
             return f"{command_method.__module__}.{command_method.__qualname__}"
         except AttributeError:
             return ""
 
-    def __contains__(self, command_method: BoundCommandFunc) -> bool:
+    def __contains__(self, command_method: AnyBoundCommandFunc) -> bool:
         """Return whether a given method's parser is in self.
 
         If the parser does not yet exist, it will be created if applicable.
@@ -265,41 +485,86 @@ class CommandParsers:
         parser = self.get(command_method)
         return bool(parser)
 
-    def get(self, command_method: BoundCommandFunc) -> Cmd2ArgumentParser | None:
+    def get(self, command_method: AnyBoundCommandFunc) -> Cmd2ArgumentParser | None:
         """Return a given method's parser or None if the method is not argparse-based.
 
-        If the parser does not yet exist, it will be created.
+        If the parser does not yet exist, it will be created. Unless this instance has its own copy
+        of the parser from get_for_update(), the parser is shared with other instances and must not
+        be modified.
+        """
+        full_method_name = self._fully_qualified_name(command_method)
+        if not full_method_name:
+            return None
+
+        parser = self._parsers.get(full_method_name)
+        if parser is not None:
+            return parser
+
+        target = self._find_target(command_method)
+        if target is None:
+            return None
+
+        owner, spec = target
+        class_parsers = self._shared_parsers.setdefault(type(owner), {})
+        key = (full_method_name, argparse_utils.DEFAULT_ARGUMENT_PARSER)
+
+        parser = class_parsers.get(key)
+        if parser is None:
+            parser = class_parsers.setdefault(key, self._build(command_method, owner, spec))
+        return parser
+
+    def get_for_update(self, command_method: AnyBoundCommandFunc) -> Cmd2ArgumentParser | None:
+        """Return this instance's own copy of a given method's parser or None if the method is not argparse-based.
+
+        The first call for a method builds the copy, which replaces the shared parser for this instance.
+        It can be modified without affecting other instances.
         """
         full_method_name = self._fully_qualified_name(command_method)
         if not full_method_name:
             return None
 
         if full_method_name not in self._parsers:
-            if not command_method.__name__.startswith(COMMAND_FUNC_PREFIX):
+            target = self._find_target(command_method)
+            if target is None:
                 return None
-            command = command_method.__name__[len(COMMAND_FUNC_PREFIX) :]
 
-            spec: ArgparseCommandSpec | None = getattr(command_method, constants.ARGPARSE_COMMAND_ATTR_SPEC, None)
-            if spec is None:
-                return None
+            owner, spec = target
+            self._parsers[full_method_name] = self._build(command_method, owner, spec)
+
+        return self._parsers[full_method_name]
+
+    def _find_target(self, command_method: AnyBoundCommandFunc) -> tuple[CmdOrSet, ArgparseCommandSpec] | None:
+        """Return the object which owns a command method and its argparse spec, or None if it isn't argparse-based."""
+        if not command_method.__name__.startswith(COMMAND_FUNC_PREFIX):
+            return None
+        command = command_method.__name__[len(COMMAND_FUNC_PREFIX) :]
+
+        spec: ArgparseCommandSpec | None = getattr(command_method, constants.ARGPARSE_COMMAND_ATTR_SPEC, None)
+        if spec is None:
+            return None
 
-            owner = self._cmd_app.find_commandset_for_command(command) or self._cmd_app
-            parser = self._cmd_app._build_parser(owner, spec.parser_source)
+        owner = self._cmd_app.find_commandset_for_command(command) or self._cmd_app
+        return owner, spec
 
-            # To ensure accurate usage strings, recursively update 'prog' values
-            # within the parser to match the command name.
-            parser.update_prog(command)
+    def _build(self, command_method: AnyBoundCommandFunc, owner: CmdOrSet, spec: ArgparseCommandSpec) -> Cmd2ArgumentParser:
+        """Build a command method's parser."""
+        parser = self._cmd_app._build_parser(owner, spec.parser_source)
 
-            # If the description has not been set, then use the method docstring if one exists
-            if parser.description is None and command_method.__doc__:
-                parser.description = strip_doc_annotations(command_method.__doc__)
+        # To ensure accurate usage strings, recursively update 'prog' values
+        # within the parser to match the command name.
+        parser.update_prog(command_method.__name__[len(COMMAND_FUNC_PREFIX) :])
 
-            self._parsers[full_method_name] = parser
+        # If the description has not been set, then use the method docstring if one exists
+        if parser.description is None and command_method.__doc__:
+            parser.description = strip_doc_annotations(command_method.__doc__)
 
-        return self._parsers.get(full_method_name)
+        return parser
+
+    def remove(self, command_method: AnyBoundCommandFunc) -> None:
+        """Remove this instance's copy of a given method's parser if it exists.
 
-    def remove(self, command_method: BoundCommandFunc) -> None:
-        """Remove a given method's parser if it exists."""
+        Parsers shared with other instances are kept.
+        """
         full_method_name = self._fully_qualified_name(command_method)
         if full_method_name in self._parsers:
             del self._parsers[full_method_name]
@@ -335,6 +600,84 @@ class _ConsoleCache(threading.local):
     stderr: Cmd2BaseConsole | None = None
 
 
+@dataclass
+class _ThreadState(threading.local):
+    """Thread-local state of the commands being run.
+
+    This lets a background job run a command in its own thread without disturbing the command being run
+    in the main thread.
+    """
+
+    # Streams which replace self.stdout and sys.stderr in a background job's thread
+    stdout: TextIO | None = None
+    stderr: TextIO | None = None
+
+    # Profiles of the commands being run when the profile setting is enabled. The last one is the
+    # innermost command, which is the only one being profiled by cProfile.
+    profile_stack: list[CommandProfile] = field(default_factory=list)
+
+    # Cache of matches which the argparse completer may reuse. It's only set while prompt-toolkit
+    # is completing what the user types, since that's when completion repeats as a token grows.
+    choices_cache: ChoicesCache | None = None
+
+    # Completion which prompt-toolkit is running in this thread. It's cancelled when the user changes
+    # what they typed before it finishes.
+    completion_request: CompletionRequest | None = None
+
+    # Values of _JobLocal attributes in a background job's thread, keyed by attribute name. This is None
+    # in all other threads, which share the application's values.
+    job_values: dict[str, Any] | None = None
+
+    # Background job whose command this thread is running
+    job: Job | None = None
+
+
+class _JobLocal(Generic[T]):
+    """Attribute of Cmd which each background job's thread has its own value of.
+
+    Commands set attributes like last_result as they run. A command run in a background job sets its
+    thread's value instead, so it doesn't overwrite the value of the command being run at the prompt.
+    """
+
+    def __init__(self, default_factory: Callable[[], T]) -> None:
+        """_JobLocal initializer.
+
+        :param default_factory: function which creates the value a background job's thread starts with
+        """
+        self._default_factory = default_factory
+        self._name = ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._name = name
+
+    @overload
+    def __get__(self, obj: None, objtype: type | None = None) -> "_JobLocal[T]": ...
+
+    @overload
+    def __get__(self, obj: "Cmd", objtype: type | None = None) -> T: ...
+
+    def __get__(self, obj: "Cmd | None", objtype: type | None = None) -> "T | _JobLocal[T]":
+        if obj is None:
+            return self
+
+        job_values = obj._thread_state.job_values
+        if job_values is None:
+            try:
+                return cast(T, obj.__dict__[self._name])
+            except KeyError:
+                raise AttributeError(self._name) from None
+        if self._name not in job_values:
+            job_values[self._name] = self._default_factory()
+        return cast(T, job_values[self._name])
+
+    def __set__(self, obj: "Cmd", value: T) -> None:
+        job_values = obj._thread_state.job_values
+        if job_values is None:
+            obj.__dict__[self._name] = value
+        else:
+            job_values[self._name] = value
+
+
 class Cmd:
     """An easy but powerful framework for writing line-oriented command interpreters.
 
@@ -348,6 +691,9 @@ class Cmd:
     DEFAULT_EDITOR: ClassVar[str | None] = utils.find_editor()
     DEFAULT_PROMPT: ClassVar[str] = "(Cmd) "
 
+    # Values of the timing_report setting
+    TIMING_REPORTS: ClassVar[tuple[str, ...]] = ("total", "phases", "percentiles")
+
     # Default category for commands defined in this class which have
     # not been explicitly categorized with the @with_category decorator.
     # This value is inherited by subclasses but they can set their own
@@ -359,21 +705,35 @@ class Cmd:
     # Header for table listing help topics not related to a command.
     MISC_HEADER: ClassVar[str] = "Miscellaneous Help Topics"
 
+    # State of the commands being run. A background job's commands have their own values of these, while
+    # all other threads share the application's values. See __init__() for what each one holds.
+    last_result: _JobLocal[Any] = _JobLocal(lambda: None)
+    last_command_timing: _JobLocal[CommandTiming | None] = _JobLocal(lambda: None)
+    current_command: _JobLocal[Statement | None] = _JobLocal(lambda: None)
+    _in_py: _JobLocal[bool] = _JobLocal(lambda: False)
+    _script_dir: _JobLocal[list[str]] = _JobLocal(list)
+    sigint_protection: _JobLocal[utils.ContextFlag] = _JobLocal(utils.ContextFlag)
+    _cur_pipe_proc_reader: _JobLocal[utils.ProcReader | None] = _JobLocal(lambda: None)
+    _redirecting: _JobLocal[bool] = _JobLocal(lambda: False)
+    _command_timing: _JobLocal[CommandTiming | None] = _JobLocal(lambda: None)
+
     def __init__(
         self,
         completekey: str | None = None,
         stdin: TextIO | None = None,
         stdout: TextIO | None = None,
         *,
+        allow_background_jobs: bool = False,
         allow_cli_args: bool = True,
         allow_clipboard: bool = True,
         allow_redirection: bool = True,
         auto_load_commands: bool = False,
         auto_suggest: bool = True,
         complete_in_thread: bool = True,
-        command_sets: Iterable[CommandSet[Any]] | None = None,
+        command_sets: Iterable[CommandSet[Any] | LazyCommandSet] | None = None,
         enable_bottom_toolbar: bool = False,
         enable_rprompt: bool = False,
+        headless: bool = False,
         include_ipy: bool = False,
         include_py: bool = False,
         intro: RenderableType = "",
@@ -392,6 +752,10 @@ class Cmd:
         :param completekey: name of a completion key, default to 'tab'. (If None or an empty string, 'tab' is used)
         :param stdin: alternate input file object, if not specified, sys.stdin is used
         :param stdout: alternate output file object, if not specified, sys.stdout is used
+        :param allow_background_jobs: If ``True``, a command line ending with a standalone ``&`` runs
+                                      its command as a background job, and the jobs, fg, wait, and
+                                      kill commands are included to manage jobs. Otherwise ``&`` is
+                                      parsed as an argument.
         :param allow_cli_args: if ``True``, then [cmd2.Cmd.__init__][] will process command
                                line arguments as either commands to be run. This should be
                                set to ``False`` if your application parses its own command line
@@ -413,11 +777,15 @@ class Cmd:
         :param command_sets: Provide CommandSet instances to load during cmd2 initialization.
                              This allows CommandSets with custom constructor parameters to be
                              loaded.  This also allows the a set of CommandSets to be provided
-                             when `auto_load_commands` is set to False
+                             when `auto_load_commands` is set to False. LazyCommandSets can be
+                             included to register CommandSets which are imported when first used.
         :param enable_bottom_toolbar: if ``True``, enables a bottom toolbar while at the main prompt.
                                       Override ``get_bottom_toolbar()`` to define its content.
         :param enable_rprompt: if ``True``, enables a right prompt while at the main prompt.
                                Override ``get_rprompt()`` to define its content.
+        :param headless: if ``True``, prompt-toolkit is never used to read from or write to a terminal.
+                         Input is read from stdin a line at a time, as it is when stdin isn't a
+                         terminal. This suits applications embedded in services and batch jobs.
         :param include_ipy: should the "ipy" command be included for an embedded IPython shell
         :param include_py: should the "py" command be included for an embedded Python shell
         :param intro: introduction to display at startup
@@ -450,6 +818,9 @@ class Cmd:
             setattr(self, "do_py", None)  # noqa: B010
         if not include_ipy:
             setattr(self, "do_ipy", None)  # noqa: B010
+        if not allow_background_jobs:
+            for command in ("jobs", "fg", "wait", "kill"):
+                setattr(self, constants.COMMAND_FUNC_PREFIX + command, None)
 
         # initialize plugin system
         # needs to be done before we most of the other stuff below
@@ -468,9 +839,13 @@ class Cmd:
         else:
             self.stdin = sys.stdin
 
+        # State of the commands being run which is kept separately for each thread
+        self._thread_state = _ThreadState()
+
         # Standard output stream. The interactive UI remains attached to this initial
         # stream even when self.stdout is temporarily swapped during command output
         # redirection.
+        self._stdout: TextIO
         if stdout is not None:
             self.stdout = stdout
         else:
@@ -489,9 +864,13 @@ class Cmd:
         self.debug = False
         self.echo = False
         self.editor = self.DEFAULT_EDITOR
+        self.profile = PROFILE_OFF  # Profile each command: off, cpu, memory, or all
+        self.profile_dir = ""  # Directory where profiles are saved. Empty means they aren't saved.
+        self.profile_top = 20  # Number of entries printed from each profile
         self.quiet = False  # Do not suppress nonessential output
         self.scripts_add_to_history = True  # Scripts and pyscripts add commands to history
         self.timing = False  # Prints elapsed time for each command
+        self.timing_report = "total"  # What timing prints: total, phases, or percentiles
 
         # Default settings for Rich tracebacks created by format_exception().
         # This dictionary can contain any parameter accepted by the
@@ -517,6 +896,15 @@ class Cmd:
         # If the number of results exceeds this, CompleteStyle.MULTI_COLUMN will be used.
         self.max_column_completion_results: int = 7
 
+        # How many seconds the matches of the argument being completed are reused while the user keeps
+        # typing it, instead of calling its choices provider again. Set this to 0 to disable reuse.
+        self.completion_cache_ttl: float = 5.0
+        self._choices_cache = ChoicesCache()
+
+        # How command names and the values of arguments with choices or a choices_provider are matched
+        # against the text being completed. An argument's completion_matcher overrides this.
+        self.completion_matcher: Matcher = PrefixMatcher()
+
         # A dictionary mapping settable names to their Settable instance
         self._settables: dict[str, Settable] = {}
         self._always_prefix_settables: bool = False
@@ -525,6 +913,13 @@ class Cmd:
         self._installed_command_sets: set[CommandSet[Any]] = set()
         self._cmd_to_command_sets: dict[str, CommandSet[Any]] = {}
 
+        # Commands of LazyCommandSets which haven't been loaded yet, mapped to their LazyCommandSet
+        self._lazy_command_sets: dict[str, LazyCommandSet] = {}
+
+        # Commands and help topics found on this instance. This is built when first needed and is kept up to date
+        # as do_* and help_* attributes are set and deleted.
+        self._command_registry: _CommandRegistry | None = None
+
         self.build_settables()
 
         # Use as prompt for multiline commands on the 2nd+ line of input
@@ -541,26 +936,35 @@ class Cmd:
         self._persistent_history_length = persistent_history_length
         self._initialize_history(persistent_history_file)
 
-        # Create the main PromptSession
-        self.main_session = self._create_main_session(
-            auto_suggest=auto_suggest,
-            complete_in_thread=complete_in_thread,
-            completekey=completekey,
-            enable_bottom_toolbar=enable_bottom_toolbar,
-            enable_rprompt=enable_rprompt,
-            refresh_interval=refresh_interval,
-        )
+        # If True, prompt-toolkit never reads from or writes to the terminal
+        self.headless = headless
+
+        # The main PromptSession is created the first time it's needed, since applications which only
+        # run commands from scripts or onecmd_plus_hooks() never use it. Access it with main_session.
+        self._main_session: PromptSession[str] | None = None
+        self._main_session_options: dict[str, Any] = {
+            "auto_suggest": auto_suggest,
+            "complete_in_thread": complete_in_thread,
+            "completekey": completekey,
+            "enable_bottom_toolbar": enable_bottom_toolbar,
+            "enable_rprompt": enable_rprompt,
+            "refresh_interval": refresh_interval,
+        }
 
-        # The session currently holding focus (either the main REPL or a command's
-        # custom prompt). Completion and UI logic should reference this variable
-        # to ensure they modify the correct session state.
-        self.active_session = self.main_session
+        # The session currently holding focus, which is a command's custom prompt
+        # or None for the main session. Access it with active_session.
+        self._active_session: PromptSession[str] | None = None
 
         # Commands to exclude from the history command
         self.exclude_from_history = ["_eof", "history"]
 
-        # Dictionary of macro names and their values
-        self.macros: dict[str, Macro] = {}
+        # Dictionary of macro names and their values. Changes made to it increment _macros_version.
+        self._macros_version = 0
+        self._macros: _ObservedDict[Macro] = _ObservedDict(self._macros_changed)
+
+        # Index of command, alias, and macro names used to complete them. This is rebuilt whenever
+        # its version no longer matches the state it was built from.
+        self._command_name_index: _CommandNameIndex | None = None
 
         # Keeps track of typed command history in the Python shell
         self._py_history: list[str] = []
@@ -575,25 +979,53 @@ class Cmd:
         self._in_py = False
 
         self.statement_parser: StatementParser = StatementParser(
-            terminators=terminators, multiline_commands=multiline_commands, shortcuts=shortcuts
+            terminators=terminators,
+            multiline_commands=multiline_commands,
+            shortcuts=shortcuts,
+            background_jobs=allow_background_jobs,
         )
 
+        # The text of an incomplete multiline statement being typed at the prompt and the scanner
+        # tracking it. This lets _should_continue_multiline() scan only newly added text.
+        self._multiline_scan: tuple[str, MultilineScanner] | None = None
+
         # Stores results from the last command run to enable usage of results in Python shells and pyscripts
-        self.last_result: Any = None
+        self.last_result = None
+
+        # Timing of the last command which finished and the most recent ones in this session. These are
+        # recorded while the timing setting is enabled or record_command_timing is True.
+        self.last_command_timing = None
+        self.timing_stats = TimingStats()
+
+        # Set this to True to record the timing of each command even when the timing setting is disabled,
+        # like when a hook uses command_timing. Commands run by pyscripts are always timed.
+        self.record_command_timing = False
 
         # Used by run_script command to store current script dir as a LIFO queue to support _relative_run_script command
-        self._script_dir: list[str] = []
+        self._script_dir = []
 
-        # Context manager used to protect critical sections in the main thread from stopping due to a KeyboardInterrupt
-        self.sigint_protection: utils.ContextFlag = utils.ContextFlag()
+        # Context manager used to protect critical sections from stopping due to a KeyboardInterrupt. A
+        # background job has its own, so the SIGINT handler is only affected by the commands run at the prompt.
+        self.sigint_protection = utils.ContextFlag()
 
         # If the current command created a process to pipe to, then this will be a ProcReader object.
         # Otherwise it will be None. It's used to know when a pipe process can be killed and/or waited upon.
-        self._cur_pipe_proc_reader: utils.ProcReader | None = None
+        self._cur_pipe_proc_reader = None
 
         # Used to keep track of whether we are redirecting or piping output
         self._redirecting = False
 
+        # Timing of the command currently running in onecmd_plus_hooks()
+        self._command_timing = None
+
+        # Background jobs which are running or whose results haven't been shown yet, keyed by job ID
+        self._jobs: dict[int, Job] = {}
+        self._jobs_lock = threading.Lock()
+
+        # Runs coroutines returned by async commands, completers, and choices providers. Its thread
+        # isn't started until the first coroutine runs.
+        self._event_loop_thread = EventLoopThread()
+
         # Set text which prints right before all of the help tables are listed.
         self.doc_leader = ""
 
@@ -614,7 +1046,6 @@ class Cmd:
         self._initial_termios_settings = None
         if not sys.platform.startswith("win") and self.stdin.isatty():
             try:
-                import io
                 import termios
 
                 self._initial_termios_settings = termios.tcgetattr(self.stdin.fileno())
@@ -690,7 +1121,10 @@ class Cmd:
         # Load modular commands
         if command_sets:
             for command_set in command_sets:
-                self.register_command_set(command_set)
+                if isinstance(command_set, LazyCommandSet):
+                    self.register_lazy_command_set(command_set)
+                else:
+                    self.register_command_set(command_set)
 
         if auto_load_commands:
             self._autoload_commands()
@@ -705,14 +1139,32 @@ class Cmd:
         self.default_suggestion_message = "Did you mean {}?"
 
         # the current command being executed
-        self.current_command: Statement | None = None
+        self.current_command = None
 
     def _should_continue_multiline(self) -> bool:
         """Return whether prompt-toolkit should continue prompting the user for a multiline command."""
+        from prompt_toolkit.application import get_app
+
         buffer: Buffer = get_app().current_buffer
         line: str = buffer.text
 
-        used_macros = []
+        # If the user only added lines since the last check, then scan just the new text
+        multiline_scan = self._multiline_scan
+        self._multiline_scan = None
+        if multiline_scan is not None:
+            scanned_text, scanner = multiline_scan
+            scanned_len = len(scanned_text)
+            if (
+                line[scanned_len : scanned_len + 1] == constants.LINE_FEED
+                and line.startswith(scanned_text)
+                and not scanner.is_stale
+            ):
+                scanner.add_line(line[scanned_len + 1 :])
+                if not scanner.maybe_complete:
+                    self._multiline_scan = (line, scanner)
+                    return True
+
+        used_macros: list[str] = []
 
         # Continue until all macros are resolved
         while True:
@@ -721,6 +1173,8 @@ class Cmd:
             except IncompleteStatement:
                 # The statement (or the resolved macro) is incomplete.
                 # Keep prompting the user.
+                if not used_macros:
+                    self._multiline_scan = (line, self.statement_parser.multiline_scanner(line))
                 return True
 
             except (Cmd2ShlexError, EmptyStatement):
@@ -740,6 +1194,32 @@ class Cmd:
                 # No macro found or already processed. The statement is complete.
                 return False
 
+    @property
+    def main_session(self) -> "PromptSession[str]":
+        """The PromptSession which reads commands at the main prompt.
+
+        It's created the first time it's accessed.
+        """
+        if self._main_session is None:
+            self._main_session = self._create_main_session(**self._main_session_options)
+        return self._main_session
+
+    @main_session.setter
+    def main_session(self, session: "PromptSession[str]") -> None:
+        self._main_session = session
+
+    @property
+    def active_session(self) -> "PromptSession[str]":
+        """The session currently holding focus (either the main REPL or a command's custom prompt).
+
+        Completion and UI logic should reference this to ensure they modify the correct session state.
+        """
+        return self.main_session if self._active_session is None else self._active_session
+
+    @active_session.setter
+    def active_session(self, session: "PromptSession[str]") -> None:
+        self._active_session = session
+
     def _create_main_session(
         self,
         *,
@@ -749,13 +1229,28 @@ class Cmd:
         enable_bottom_toolbar: bool,
         enable_rprompt: bool,
         refresh_interval: float,
-    ) -> PromptSession[str]:
+    ) -> "PromptSession[str]":
         """Create and return the main PromptSession for the application.
 
-        Builds an interactive session if self.stdin and self.stdout are TTYs.
-        Otherwise, uses dummy drivers to support non-interactive streams like
-        pipes or files.
+        Builds an interactive session if self.stdin and self.stdout are TTYs and
+        the application isn't headless. Otherwise, uses dummy drivers to support
+        non-interactive streams like pipes or files.
         """
+        from prompt_toolkit import filters
+        from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
+        from prompt_toolkit.input import DummyInput, create_input
+        from prompt_toolkit.key_binding import KeyBindings
+        from prompt_toolkit.output import DummyOutput, create_output
+        from prompt_toolkit.shortcuts import CompleteStyle, PromptSession
+        from prompt_toolkit.styles import DynamicStyle
+
+        from .pt_utils import (
+            Cmd2Completer,
+            Cmd2History,
+            Cmd2Lexer,
+            pt_resolve_color_depth,
+        )
+
         # Configure custom key bindings
         key_bindings = KeyBindings()
 
@@ -795,7 +1290,7 @@ class Cmd:
             "style": DynamicStyle(get_pt_theme),
         }
 
-        if self.stdin.isatty() and self.stdout.isatty():
+        if not self.headless and self.stdin.isatty() and self.stdout.isatty():
             try:
                 if self.stdin != sys.stdin:
                     kwargs["input"] = create_input(stdin=self.stdin)
@@ -925,6 +1420,9 @@ class Cmd:
 
                 self._cmd_to_command_sets[command] = cmdset
 
+                # The command was registered before its CommandSet was recorded
+                self._command_attr_changed(cmd_func_name)
+
                 # If this command is in a disabled category, then disable it
                 command_category = self._get_command_category(command_method)
                 if command_category in self.disabled_categories:
@@ -946,6 +1444,90 @@ class Cmd:
             cmdset.on_unregistered()
             raise
 
+    def register_lazy_command_set(self, lazy_cmdset: LazyCommandSet) -> None:
+        """Install a CommandSet's commands without importing the CommandSet.
+
+        Each declared command is installed as a placeholder which help lists and which completes by name.
+        The first time one of the commands is run, has its arguments completed, or is looked up with
+        ``help <command>``, the CommandSet is imported and registered with [cmd2.Cmd.register_command_set][]
+        in place of the placeholders.
+
+        :param lazy_cmdset: declaration of the CommandSet and its commands
+        :raises CommandSetRegistrationError: if a command can't be installed
+        """
+        installed: list[str] = []
+        try:
+            for command in lazy_cmdset.commands:
+                self._install_lazy_command(command, lazy_cmdset)
+                installed.append(command)
+        except Exception:
+            for command in installed:
+                self._uninstall_lazy_command(command)
+            raise
+
+    def _install_lazy_command(self, command: str, lazy_cmdset: LazyCommandSet) -> None:
+        """Install the placeholder for a command of a LazyCommandSet."""
+
+        def lazy_command(statement: Statement) -> CommandFuncResult:
+            self._load_lazy_command_set(command)
+            command_func = self.get_command_func(command)
+            if command_func is None:
+                # The CommandSet didn't define the command it was declared with
+                return self.default(statement)
+            return command_func(statement)
+
+        lazy_command.__name__ = COMMAND_FUNC_PREFIX + command
+        lazy_command.__doc__ = lazy_cmdset.commands[command]
+        setattr(lazy_command, constants.COMMAND_ATTR_HELP_CATEGORY, lazy_cmdset.category_of(command))
+
+        self._install_command_function(lazy_command.__name__, lazy_command, lazy_cmdset.path)
+        self._lazy_command_sets[command] = lazy_cmdset
+
+        # If this command is in a disabled category, then disable it
+        category = lazy_cmdset.category_of(command)
+        if category in self.disabled_categories:
+            self.disable_command(command, self.disabled_categories[category])
+
+    def _uninstall_lazy_command(self, command: str) -> None:
+        """Remove the placeholder for a command of a LazyCommandSet."""
+        self.enable_command(command)
+        delattr(self, COMMAND_FUNC_PREFIX + command)
+        del self._lazy_command_sets[command]
+
+    def _load_lazy_command_set(self, command: str) -> None:
+        """Import and register the CommandSet of a command if it was registered with a LazyCommandSet.
+
+        :param command: name of the command which is needed
+        :raises CommandSetRegistrationError: if the CommandSet can't be registered
+        :raises ImportError: if the CommandSet's module can't be imported
+        """
+        # A disabled command isn't loaded since its placeholder only reports that it's disabled
+        lazy_cmdset = self._lazy_command_sets.get(command)
+        if lazy_cmdset is None or command in self.disabled_commands:
+            return
+
+        # Import the CommandSet before removing any placeholders so they remain if this fails
+        cmdset = lazy_cmdset.load()
+
+        # Disabled commands remain disabled once the real ones are installed
+        disabled: dict[str, str] = {}
+        for name in [name for name, value in self._lazy_command_sets.items() if value is lazy_cmdset]:
+            if name in self.disabled_commands:
+                disabled_func = cast(functools.partial[None], getattr(self, COMMAND_FUNC_PREFIX + name))
+                disabled[name] = disabled_func.keywords["message_to_print"]
+            self._uninstall_lazy_command(name)
+
+        try:
+            self.register_command_set(cmdset)
+        except Exception:
+            # Put the placeholders back so loading can be tried again
+            self.register_lazy_command_set(lazy_cmdset)
+            raise
+        finally:
+            for name, message in disabled.items():
+                if self.get_command_func(name) is not None:
+                    self.disable_command(name, message)
+
     def _build_parser(
         self,
         owner: CmdOrSet,
@@ -994,7 +1576,9 @@ class Cmd:
 
         return parser
 
-    def _install_command_function(self, command_func_name: str, command_method: BoundCommandFunc, context: str = "") -> None:
+    def _install_command_function(
+        self, command_func_name: str, command_method: AnyBoundCommandFunc, context: str = ""
+    ) -> None:
         """Install a new command function into the CLI.
 
         :param command_func_name: name of command function to add
@@ -1148,6 +1732,29 @@ class Cmd:
                 if command_parser is not None:
                     check_parser_uninstallable(command_parser)
 
+    @staticmethod
+    def _get_subcommand_methods(owner: CmdOrSet) -> list[tuple[str, Callable[..., Any]]]:
+        """Find the methods of a Cmd or CommandSet which are decorated as subcommands.
+
+        The class and instance dictionaries are searched directly instead of using inspect.getmembers(),
+        which evaluates every property, and some, like main_session, are expensive to evaluate.
+
+        :param owner: Cmd or CommandSet to search
+        :return: name and bound method of each subcommand method, sorted by name
+        """
+        namespaces: list[Mapping[str, Any]] = [vars(cls) for cls in type(owner).__mro__]
+        namespaces.append(getattr(owner, "__dict__", {}))
+        names = {
+            name
+            for namespace in namespaces
+            for name, member in namespace.items()
+            if callable(member) and hasattr(member, constants.SUBCOMMAND_ATTR_SPEC)
+        }
+
+        # A name found in a base class may be overridden by something which isn't a subcommand
+        methods = [(name, getattr(owner, name)) for name in sorted(names)]
+        return [(name, method) for name, method in methods if hasattr(method, constants.SUBCOMMAND_ATTR_SPEC)]
+
     def _register_subcommands(self, owner: CmdOrSet) -> None:
         """Register subcommands with their base command.
 
@@ -1157,13 +1764,7 @@ class Cmd:
             raise CommandSetRegistrationError("Cannot register subcommands with an unregistered CommandSet")
 
         # find methods that have the required attributes necessary to be recognized as a sub-command
-        methods = inspect.getmembers(
-            owner,
-            predicate=lambda meth: (
-                isinstance(meth, Callable)  # type: ignore[arg-type]
-                and hasattr(meth, constants.SUBCOMMAND_ATTR_SPEC)
-            ),
-        )
+        methods = self._get_subcommand_methods(owner)
 
         # iterate through all matching methods
         for _method_name, method in methods:
@@ -1209,13 +1810,7 @@ class Cmd:
             raise CommandSetRegistrationError("Cannot unregister subcommands with an unregistered CommandSet")
 
         # find methods that have the required attributes necessary to be recognized as a sub-command
-        methods = inspect.getmembers(
-            owner,
-            predicate=lambda meth: (
-                isinstance(meth, Callable)  # type: ignore[arg-type]
-                and hasattr(meth, constants.SUBCOMMAND_ATTR_SPEC)
-            ),
-        )
+        methods = self._get_subcommand_methods(owner)
 
         # iterate through all matching methods
         for _method_name, method in methods:
@@ -1230,6 +1825,7 @@ class Cmd:
         This helper handles the initial resolution of a command string (e.g., 'foo bar baz') by
         identifying 'foo' as the root command, retrieving its associated parser, and returning
         any remaining tokens (['bar', 'baz']) as a path relative to that parser for further traversal.
+        The parser is this instance's own copy, so it can be modified without affecting other instances.
 
         :param command: full space-delimited command path leading to a parser (e.g. 'foo' or 'foo bar')
         :return: a tuple containing the Cmd2ArgumentParser for the root command and a list of
@@ -1249,7 +1845,7 @@ class Cmd:
         if command_func is None:
             raise ValueError(f"Root command '{root_command}' does not exist")
 
-        root_parser = self.command_parsers.get(command_func)
+        root_parser = self.command_parsers.get_for_update(command_func)
         if root_parser is None:
             raise ValueError(f"Command '{root_command}' does not use argparse")
 
@@ -1401,6 +1997,14 @@ class Cmd:
             )
         )
 
+        self.add_settable(
+            Settable(
+                "completion_cache_ttl",
+                float,
+                "Seconds to reuse an argument's matches while typing it (0 to disable)",
+                self,
+            )
+        )
         self.add_settable(
             Settable(
                 "max_completion_table_items",
@@ -1417,9 +2021,37 @@ class Cmd:
                 self,
             )
         )
+        self.add_settable(
+            Settable(
+                "profile",
+                str,
+                "Profile each command: off, cpu (cProfile), memory (tracemalloc), or all",
+                self,
+                choices=PROFILE_MODES,
+            )
+        )
+        self.add_settable(
+            Settable(
+                "profile_dir",
+                str,
+                "Directory to save profiles in (empty to not save them)",
+                self,
+                completer=Cmd.path_complete,
+            )
+        )
+        self.add_settable(Settable("profile_top", int, "Number of entries printed from each profile", self))
         self.add_settable(Settable("quiet", bool, "Don't print nonessential feedback", self))
         self.add_settable(Settable("scripts_add_to_history", bool, "Scripts and pyscripts add commands to history", self))
         self.add_settable(Settable("timing", bool, "Report execution times", self))
+        self.add_settable(
+            Settable(
+                "timing_report",
+                str,
+                "What timing reports: total, phases, or session percentiles",
+                self,
+                choices=self.TIMING_REPORTS,
+            )
+        )
         self.add_settable(Settable("traceback_show_locals", bool, "Display local variables in tracebacks", self))
 
         traceback_width_description = Text.assemble(
@@ -1444,8 +2076,13 @@ class Cmd:
     @allow_style.setter
     def allow_style(self, value: ru.AllowStyle) -> None:
         """Setter property needed to support do_set when it updates allow_style."""
+        from .pt_utils import pt_resolve_color_depth
+
         ru.ALLOW_STYLE = value
-        self.main_session.color_depth = pt_resolve_color_depth()
+
+        # A main session created later resolves the color depth itself
+        if self._main_session is not None:
+            self._main_session.color_depth = pt_resolve_color_depth()
 
     @property
     def traceback_show_locals(self) -> bool:
@@ -1453,6 +2090,8 @@ class Cmd:
         if "show_locals" in self.traceback_kwargs:
             return cast(bool, self.traceback_kwargs["show_locals"])
 
+        from rich.traceback import Traceback
+
         # If setting is not present, then return its default value.
         traceback_sig = inspect.signature(Traceback.__init__)
         show_locals = traceback_sig.parameters["show_locals"].default
@@ -1469,6 +2108,8 @@ class Cmd:
         if "width" in self.traceback_kwargs:
             return cast(int | None, self.traceback_kwargs["width"])
 
+        from rich.traceback import Traceback
+
         # If setting is not present, then return its default value.
         traceback_sig = inspect.signature(Traceback.__init__)
         width = traceback_sig.parameters["width"].default
@@ -1489,6 +2130,29 @@ class Cmd:
         """
         return su.strip_style(self.prompt)
 
+    @property
+    def stdout(self) -> TextIO:
+        """Standard output stream.
+
+        A background job's thread has its own stream, which keeps the job's output apart from the output
+        of commands run at the prompt. All other threads share the application's stream.
+        """
+        stdout = self._thread_state.stdout
+        return stdout if stdout is not None else self._stdout
+
+    @stdout.setter
+    def stdout(self, value: TextIO) -> None:
+        if self._thread_state.stdout is not None:
+            self._thread_state.stdout = value
+        else:
+            self._stdout = value
+
+    @property
+    def _stderr(self) -> TextIO:
+        """Stream for error output, which is sys.stderr except in a background job's thread."""
+        stderr = self._thread_state.stderr
+        return stderr if stderr is not None else sys.stderr
+
     def _get_core_print_console(
         self,
         *,
@@ -1669,7 +2333,7 @@ class Cmd:
         For details on the other parameters, refer to the `print_to` method documentation.
         """
         self.print_to(
-            sys.stderr,
+            self._stderr,
             *objects,
             sep=sep,
             end=end,
@@ -1754,6 +2418,8 @@ class Cmd:
         with console.capture() as capture:
             # Only print a traceback if we're in debug mode and one exists.
             if self.debug and sys.exc_info() != (None, None, None):
+                from rich.traceback import Traceback
+
                 traceback = Traceback(**self.traceback_kwargs)
                 console.print(traceback, end="")
 
@@ -1762,6 +2428,8 @@ class Cmd:
                 exception_str = str(exception)
 
                 if exception_str:
+                    from rich.highlighter import ReprHighlighter
+
                     highlighter = ReprHighlighter()
 
                     final_msg = Text.assemble(
@@ -1799,7 +2467,7 @@ class Cmd:
                        method and still call `super()` without encountering unexpected keyword argument errors.
         """
         formatted_exception = self.format_exception(exception)
-        self.print_to(sys.stderr, formatted_exception)
+        self.print_to(self._stderr, formatted_exception)
 
     def pfeedback(
         self,
@@ -1983,6 +2651,8 @@ class Cmd:
         :param expand_all: Expand all containers. Defaults to False.
         :param end: string to write at end of printed text. Defaults to a newline.
         """
+        from rich.pretty import Pretty
+
         # The overflow and soft_wrap values match those in rich.pretty.pprint().
         # This ensures long strings are neither truncated with ellipses nor broken
         # up by injected newlines.
@@ -2004,7 +2674,7 @@ class Cmd:
             end=end,
         )
 
-    def get_bottom_toolbar(self) -> AnyFormattedText:
+    def get_bottom_toolbar(self) -> "AnyFormattedText":
         """Get the bottom toolbar content.
 
         This method is called by prompt-toolkit while at the main prompt if ``enable_bottom_toolbar``
@@ -2020,7 +2690,7 @@ class Cmd:
         """
         return None
 
-    def get_rprompt(self) -> AnyFormattedText:
+    def get_rprompt(self) -> "AnyFormattedText":
         """Provide text to populate the prompt-toolkit right prompt.
 
         This method is called by prompt-toolkit while at the main prompt if ``enable_rprompt``
@@ -2107,28 +2777,30 @@ class Cmd:
         match_against: Iterable[str | CompletionItem],
         *,
         sort: bool = True,
+        matcher: Matcher | None = None,
     ) -> Completions:
         """Perform completion without considering line contents or cursor position.
 
         Strings are matched directly while CompletionItems are matched against their 'text' member.
 
-        :param text: the string prefix we are attempting to match (all matches must begin with it)
+        :param text: the string we are attempting to match (by default, all matches must begin with it)
         :param line: the current input line with leading whitespace removed
         :param begidx: the beginning index of the prefix text
         :param endidx: the ending index of the prefix text
         :param match_against: the items being matched against
         :param sort: if True, then results will be sorted. If False, then items will
-                     be in the same order they appeared in match_against.
+                     be in the same order they appeared in match_against. Matches which
+                     the matcher ranks are always in order of rank.
+        :param matcher: decides which items match text. Defaults to matching by prefix.
         :return: a Completions object
         """
-        matches: list[CompletionItem] = []
-
-        for item in match_against:
-            candidate = item.text if isinstance(item, CompletionItem) else item
-            if candidate.startswith(text):
-                matches.append(item if isinstance(item, CompletionItem) else CompletionItem(item))
+        if matcher is None:
+            matcher = _PREFIX_MATCHER
 
-        return Completions(items=matches, is_sorted=not sort)
+        matches = [
+            item if isinstance(item, CompletionItem) else CompletionItem(item) for item in matcher.match(text, match_against)
+        ]
+        return Completions(items=matches, is_sorted=not sort or matcher.ranks(text))
 
     def delimiter_complete(
         self,
@@ -2317,6 +2989,8 @@ class Cmd:
                 search_str = os.path.join(os.getcwd(), search_str)
                 cwd_added = True
 
+        import glob
+
         # Find all matching path completions
         matches = glob.glob(search_str)
 
@@ -2466,7 +3140,7 @@ class Cmd:
                 return Completions()
 
         # Call the command's completer function
-        return compfunc(text, line, begidx, endidx)
+        return cast(Completions, self._await_completion(compfunc(text, line, begidx, endidx)))
 
     def _perform_completion(
         self, text: str, line: str, begidx: int, endidx: int, custom_settings: utils.CustomCompletionSettings | None = None
@@ -2524,7 +3198,9 @@ class Cmd:
                 completer_func = self.macro_arg_complete
 
             # Check if a command was entered
-            elif command in self.get_all_commands():
+            elif self.get_command_func(command) is not None:
+                self._load_lazy_command_set(command)
+
                 # Get the completer function for this command
                 func_attr = getattr(self, constants.COMPLETER_FUNC_PREFIX + command, None)
 
@@ -2656,28 +3332,38 @@ class Cmd:
             # of the text variable if there isn't a word break, like a space, after it. We need to remove it
             # from text and update the indexes. This only applies if we are at the beginning of the command line.
             shortcut_to_restore = ""
+            completions: Completions | None = None
             if begidx == 0 and custom_settings is None:
-                for shortcut, _ in self.statement_parser.shortcuts:
-                    if text.startswith(shortcut):
-                        # Save the shortcut to restore later
-                        shortcut_to_restore = shortcut
-
-                        # Adjust text and where it begins
-                        text = text[len(shortcut_to_restore) :]
-                        begidx += len(shortcut_to_restore)
-                        break
+                shortcut_match = self.statement_parser.match_shortcut(text)
+                if shortcut_match is not None:
+                    # Save the shortcut to restore later
+                    shortcut_to_restore = shortcut_match[0]
+
+                    # Adjust text and where it begins
+                    text = text[len(shortcut_to_restore) :]
+                    begidx += len(shortcut_to_restore)
                 else:
-                    # No shortcut was found. Complete the command token.
-                    parser = argparse_utils.DEFAULT_ARGUMENT_PARSER(add_help=False)
-                    parser.add_argument(
-                        "command",
-                        metavar="COMMAND",
-                        help="command, alias, or macro name",
-                        choices=self._get_commands_aliases_and_macros_choices(),
-                    )
-                    custom_settings = utils.CustomCompletionSettings(parser)
+                    # No shortcut was found. Complete the command token. When matching by prefix, a word which
+                    # could be a command name is looked up in the command name index. Other text, like a quoted
+                    # word, text without matches, and other matchers go through the argparse completer, which
+                    # handles quotes and hints.
+                    if type(self.completion_matcher) is PrefixMatcher and (
+                        not text or self.statement_parser.is_valid_command(text)[0]
+                    ):
+                        completions = self._get_command_name_index().complete(text) or None
+
+                    if completions is None:
+                        parser = argparse_utils.DEFAULT_ARGUMENT_PARSER(add_help=False)
+                        parser.add_argument(
+                            "command",
+                            metavar="COMMAND",
+                            help="command, alias, or macro name",
+                            choices=self._get_commands_aliases_and_macros_choices(),
+                        )
+                        custom_settings = utils.CustomCompletionSettings(parser)
 
-            completions = self._perform_completion(text, line, begidx, endidx, custom_settings)
+            if completions is None:
+                completions = self._perform_completion(text, line, begidx, endidx, custom_settings)
 
             # Check if we need to restore a shortcut in the completion text
             # so it doesn't get erased from the command line.
@@ -2699,10 +3385,16 @@ class Cmd:
                 )
 
             # Swap between COLUMN and MULTI_COLUMN style based on the number of matches.
-            if len(completions) > self.max_column_completion_results:
-                self.active_session.complete_style = CompleteStyle.MULTI_COLUMN
-            else:
-                self.active_session.complete_style = CompleteStyle.COLUMN
+            # Completion requested before the main session exists, like in a headless
+            # application, has no session to update.
+            session = self._active_session if self._active_session is not None else self._main_session
+            if session is not None:
+                from prompt_toolkit.shortcuts import CompleteStyle
+
+                if len(completions) > self.max_column_completion_results:
+                    session.complete_style = CompleteStyle.MULTI_COLUMN
+                else:
+                    session.complete_style = CompleteStyle.COLUMN
 
             return completions  # noqa: TRY300
 
@@ -2741,26 +3433,145 @@ class Cmd:
         """Read-only property to access the aliases stored in the StatementParser."""
         return self.statement_parser.aliases
 
+    @property
+    def macros(self) -> dict[str, Macro]:
+        """Dictionary of macro names and their values.
+
+        Changes made to this dictionary are tracked so command name completion stays accurate.
+        """
+        return self._macros
+
+    @macros.setter
+    def macros(self, value: Mapping[str, Macro]) -> None:
+        self._macros = _ObservedDict(self._macros_changed, value)
+        self._macros_changed()
+
+    def _macros_changed(self) -> None:
+        """Record that the macros changed."""
+        self._macros_version += 1
+
+    if not TYPE_CHECKING:
+        # Only defined at runtime so type checkers still report assignments to undeclared attributes
+
+        # Attributes are set several times for each command run, so these only call into the registry for the
+        # attributes it tracks
+
+        def __setattr__(self, name: str, value: Any) -> None:
+            """Set an attribute and update the command registry if it's a command or help function."""
+            object.__setattr__(self, name, value)
+            if name.startswith(_REGISTRY_ATTR_PREFIXES) or name == "__class__":
+                self._command_attr_changed(name)
+
+        def __delattr__(self, name: str) -> None:
+            """Delete an attribute and update the command registry if it was a command or help function."""
+            object.__delattr__(self, name)
+            if name.startswith(_REGISTRY_ATTR_PREFIXES):
+                self._command_attr_changed(name)
+
+    def _command_attr_changed(self, name: str) -> None:
+        """Update the command registry after a do_* or help_* attribute, or __class__, was set or deleted.
+
+        :param name: name of the attribute
+        """
+        if name == "__class__":
+            # The new class may have different commands
+            self.refresh_commands()
+            return
+
+        # The registry doesn't exist yet while __init__() is running
+        registry = self.__dict__.get("_command_registry")
+        if registry is not None:
+            self._update_command_registry(registry, name)
+
+    def _update_command_registry(self, registry: _CommandRegistry, name: str) -> None:
+        """Add, replace, or remove the command or help topic an attribute provides.
+
+        :param registry: the registry to update
+        :param name: name of the attribute, which may or may not exist
+        """
+        if name.startswith(COMMAND_FUNC_PREFIX):
+            command = name[len(COMMAND_FUNC_PREFIX) :]
+            command_func = self.get_command_func(command)
+            if command_func is None:
+                registry.set_command(command, None)
+                return
+
+            # A disabled command keeps the category of the function it replaced
+            disabled = self.disabled_commands.get(command)
+            category = self._get_command_category(disabled.command_func if disabled is not None else command_func)
+            registry.set_command(
+                command, _RegisteredCommand(command_func, category, self.find_commandset_for_command(command))
+            )
+        elif name.startswith(HELP_FUNC_PREFIX):
+            help_func = getattr(self, name, None)
+            registry.set_help_topic(name[len(HELP_FUNC_PREFIX) :], help_func if callable(help_func) else None)
+
+    def refresh_commands(self) -> None:
+        """Find the commands and help topics again the next time they are needed.
+
+        cmd2 keeps track of the commands and help topics as ``do_*`` and ``help_*`` attributes of the
+        application are set and deleted, including when it installs, removes, disables, or enables a
+        command. Changes to the application's class or its base classes after the application first
+        listed its commands aren't seen though. Call this after making one.
+
+        Applications which override get_names() or ``__dir__()`` are asked for their names each time
+        instead, so they don't need to call this.
+        """
+        self._command_registry = None
+
+    def _get_command_registry(self) -> _CommandRegistry:
+        """Get the command registry, building it if needed.
+
+        :return: the command registry
+        """
+        registry = self._command_registry
+        if registry is None:
+            registry = _CommandRegistry()
+            for name in self.get_names():
+                self._update_command_registry(registry, name)
+
+            # Names from an overridden get_names() or __dir__() may change without cmd2 knowing
+            cls = type(self)
+            if cls.get_names is Cmd.get_names and cls.__dir__ is object.__dir__:
+                self._command_registry = registry
+        return registry
+
     def get_names(self) -> list[str]:
         """Return an alphabetized list of names comprising the attributes of the cmd2 class instance."""
         return dir(self)
 
     def get_all_commands(self) -> list[str]:
         """Return a list of all commands."""
-        return [
-            name[len(constants.COMMAND_FUNC_PREFIX) :]
-            for name in self.get_names()
-            if name.startswith(constants.COMMAND_FUNC_PREFIX) and callable(getattr(self, name))
-        ]
+        return list(self._get_command_registry().command_names)
 
     def get_visible_commands(self) -> list[str]:
         """Return a list of commands that have not been hidden or disabled."""
+        hidden_commands = set(self.hidden_commands)
         return [
             command
-            for command in self.get_all_commands()
-            if command not in self.hidden_commands and command not in self.disabled_commands
+            for command in self._get_command_registry().command_names
+            if command not in hidden_commands and command not in self.disabled_commands
         ]
 
+    def get_command_info(self, command: str) -> CommandInfo | None:
+        """Get information about a command.
+
+        :param command: the name of the command
+        :return: information about the command, or None if there is no such command
+        """
+        registered = self._get_command_registry().commands.get(command)
+        if registered is None:
+            return None
+
+        return CommandInfo(
+            name=command,
+            func=registered.func,
+            category=registered.category,
+            command_set=registered.command_set,
+            hidden=command in self.hidden_commands,
+            disabled=command in self.disabled_commands,
+        )
+
     def _get_alias_choices(self) -> Choices:
         """Return list of alias names and values as Choices."""
         items: list[CompletionItem] = []
@@ -2796,11 +3607,37 @@ class Cmd:
 
     def _get_commands_aliases_and_macros_choices(self) -> Choices:
         """Return a list of visible commands, aliases, and macros as Choices."""
+        return self._get_command_name_index().choices
+
+    def _get_command_name_index(self) -> _CommandNameIndex:
+        """Get the index of visible commands, aliases, and macros, building it if it's out of date.
+
+        :return: the command name index
+        """
+        # Everything the index depends on. The statement parser's generation changes when aliases change.
+        version = (
+            self._get_command_registry().command_names,
+            tuple(self.hidden_commands),
+            tuple(self.disabled_commands),
+            self.statement_parser,
+            self.statement_parser._generation,
+            self._macros_version,
+            utils.DEFAULT_STR_SORT_KEY,
+        )
+
+        index = self._command_name_index
+        if index is None or index.version != version:
+            index = _CommandNameIndex(self._build_command_name_items(), version)
+            self._command_name_index = index
+        return index
+
+    def _build_command_name_items(self) -> list[CompletionItem]:
+        """Build CompletionItems for the visible commands, aliases, and macros."""
         items: list[CompletionItem] = []
 
         # Add commands
         for command in self.get_visible_commands():
-            command_func = cast(BoundCommandFunc, self.get_command_func(command))
+            command_func = cast(AnyBoundCommandFunc, self.get_command_func(command))
             description = strip_doc_annotations(command_func.__doc__).splitlines()[0] if command_func.__doc__ else ""
             items.append(CompletionItem(command, display_meta=description))
 
@@ -2812,18 +3649,17 @@ class Cmd:
         for name, macro in self.macros.items():
             items.append(CompletionItem(name, display_meta=f"Macro: {macro.value}"))
 
-        return Choices(items=items)
+        return items
 
     def get_help_topics(self) -> list[str]:
         """Return a list of help topics."""
-        all_topics = [
-            name[len(constants.HELP_FUNC_PREFIX) :]
-            for name in self.get_names()
-            if name.startswith(constants.HELP_FUNC_PREFIX) and callable(getattr(self, name))
-        ]
-
         # Filter out hidden and disabled commands
-        return [topic for topic in all_topics if topic not in self.hidden_commands and topic not in self.disabled_commands]
+        hidden_commands = set(self.hidden_commands)
+        return [
+            topic
+            for topic in self._get_command_registry().help_topic_names
+            if topic not in hidden_commands and topic not in self.disabled_commands
+        ]
 
     def sigint_handler(
         self,
@@ -2832,7 +3668,8 @@ class Cmd:
     ) -> None:
         """Signal handler for SIGINTs which typically come from Ctrl-C events.
 
-        If you need custom SIGINT behavior, then override this method.
+        The KeyboardInterrupt this raises also cancels the coroutine of an async command which is
+        being waited for. If you need custom SIGINT behavior, then override this method.
 
         :param signum: signal number
         :param frame: the current stack frame or None
@@ -2919,6 +3756,80 @@ class Cmd:
         See [Hooks](../features/hooks.md) for more information.
         """
 
+    def get_event_loop(self) -> "asyncio.AbstractEventLoop":
+        """Get the event loop which runs async commands, completers, and choices providers.
+
+        The loop runs in its own thread, which is started the first time the loop is needed and stopped
+        when [cmd2.Cmd.cmdloop][] returns. Use [cmd2.Cmd.run_coroutine][] to run a coroutine on it and
+        wait for the result.
+
+        :return: the running event loop
+        """
+        return self._event_loop_thread.get_loop()
+
+    def run_coroutine(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine on the application's event loop and wait for its result.
+
+        This is how cmd2 runs the coroutines returned by async commands. If Ctrl-C is pressed while
+        waiting, the coroutine is cancelled and KeyboardInterrupt is raised once it has handled the
+        cancellation. In a background job, the coroutine is also cancelled when the kill command
+        cancels the job.
+
+        :param coro: the coroutine to run
+        :return: the coroutine's result
+        :raises RuntimeError: if called from a coroutine running on the event loop. Await the
+                              coroutine there instead.
+        :raises concurrent.futures.CancelledError: if the background job running this was cancelled
+        """
+        job = self._thread_state.job
+        return self._event_loop_thread.run(coro, cancel_event=job.cancel_event if job is not None else None)
+
+    def _resolve_awaitable(self, result: Any) -> Any:
+        """Run result on the event loop if it is a coroutine and return its result, otherwise return result.
+
+        :param result: value returned by a function which may be async
+        """
+        if inspect.iscoroutine(result):
+            return self.run_coroutine(result)
+        return result
+
+    def _await_completion(self, result: Any, timeout: float | None = None) -> Any:
+        """Wait for the result of a choices provider or completer if it is an awaitable or a future.
+
+        Awaitables run on the event loop. While prompt-toolkit is completing, waiting stops when the user
+        changes what they typed, since the result would be stale.
+
+        :param result: value returned by a choices provider or completer
+        :param timeout: maximum time in seconds to wait, or None to wait until the result is ready
+        :return: the awaited result, or result itself if there is nothing to wait for
+        :raises CompletionError: if the timeout expires first
+        """
+        import concurrent.futures
+
+        if inspect.isawaitable(result):
+            future = self._event_loop_thread.submit(result)
+        elif isinstance(result, concurrent.futures.Future):
+            future = result
+        else:
+            return result
+
+        request = self._thread_state.completion_request or CompletionRequest()
+        return request.wait(future, timeout)
+
+    @property
+    def command_timing(self) -> CommandTiming | None:
+        """Timing of the command currently being run by [cmd2.Cmd.onecmd_plus_hooks][].
+
+        Hooks can use this to see how long the phases which already finished took. When commands are
+        nested, such as those run by run_script, this is the timing of the innermost one. None when no
+        command is running.
+
+        Timing is only recorded while the timing setting is enabled or record_command_timing is True,
+        and for commands run by pyscripts. Otherwise this is cmd2.timing.NULL_COMMAND_TIMING, which
+        never has any phases.
+        """
+        return self._command_timing
+
     def onecmd_plus_hooks(
         self,
         line: str,
@@ -2929,7 +3840,8 @@ class Cmd:
     ) -> bool:
         """Top-level function called by cmdloop() to handle parsing a line and running the command and all of its hooks.
 
-        :param line: command line to run
+        :param line: command line to run. This can also be a Statement which was already parsed
+                     with the current settings, in which case it won't be parsed again.
         :param add_to_history: If True, then add this command to history. Defaults to True.
         :param raise_keyboard_interrupt: if True, then KeyboardInterrupt exceptions will be raised if stop isn't already
                                          True. This is used when running commands in a loop to be able to stop the whole
@@ -2941,73 +3853,114 @@ class Cmd:
         """
         stop = False
         statement = None
+        job = None
+
+        # Each command gets its own timing if timing is recorded. Save the one of any command this one is nested in.
+        outer_timing = self._command_timing
+        start_time = time.perf_counter()
+        if self.timing or self.record_command_timing or py_bridge_call:
+            timing = CommandTiming(line.raw if isinstance(line, Statement) else line)
+        else:
+            timing = NULL_COMMAND_TIMING
+        self._command_timing = timing
 
         try:
             # Convert the line into a Statement
-            statement = self._input_line_to_statement(line)
+            statement = self._input_line_to_statement(line, timing=timing)
+
+            if statement.background:
+                # The job's thread runs the hooks and the command
+                job = self._start_job(statement, add_to_history=add_to_history)
+                raise EmptyStatement  # noqa: TRY301
 
             # call the postparsing hooks
-            postparsing_data = plugin.PostparsingData(False, statement)
-            for postparsing_func in self._postparsing_hooks:
-                postparsing_data = postparsing_func(postparsing_data)
-                if postparsing_data.stop:
-                    break
+            # Each hook stage is skipped when no hooks are registered for it, so its hook
+            # data object isn't created.
+            postparsing_hooks = self._hook_stages.postparsing
+            if postparsing_hooks:
+                postparsing_data = plugin.PostparsingData(False, statement)
+                for postparsing_func in postparsing_hooks:
+                    postparsing_data = postparsing_func(postparsing_data)
+                    if postparsing_data.stop:
+                        break
 
-            # unpack the postparsing_data object
-            statement = postparsing_data.statement
-            stop = postparsing_data.stop
-            if stop:
-                # we should not run the command, but
-                # we need to run the finalization hooks
-                raise EmptyStatement  # noqa: TRY301
+                # unpack the postparsing_data object
+                statement = postparsing_data.statement
+                stop = postparsing_data.stop
+                timing.mark(PHASE_POSTPARSING)
+                if stop:
+                    # we should not run the command, but
+                    # we need to run the finalization hooks
+                    raise EmptyStatement  # noqa: TRY301
 
             redir_saved_state: utils.RedirectionSavedState | None = None
 
+            # Saving and restoring the redirection state changes nothing when this command doesn't
+            # redirect and isn't nested in a command which does, so both are skipped along with
+            # their sigint protection.
+            redirects = bool(statement.redirector) or self._redirecting or self._cur_pipe_proc_reader is not None
+
             try:
-                # Get sigint protection while we set up redirection
-                with self.sigint_protection:
-                    if py_bridge_call:
-                        # Start saving command's stdout at this point
-                        self.stdout.pause_storage = False  # type: ignore[attr-defined]
+                if redirects or py_bridge_call:
+                    # Get sigint protection while we set up redirection
+                    with self.sigint_protection:
+                        if py_bridge_call:
+                            # Start saving command's stdout at this point
+                            self.stdout.pause_storage = False  # type: ignore[attr-defined]
 
-                    redir_saved_state = self._redirect_output(statement)
+                        if redirects:
+                            redir_saved_state = self._redirect_output(statement)
 
-                timestart = datetime.datetime.now(tz=datetime.timezone.utc)
+                timing.mark(PHASE_REDIRECTION)
 
                 # precommand hooks
-                precmd_data = plugin.PrecommandData(statement)
-                for precmd_func in self._precmd_hooks:
-                    precmd_data = precmd_func(precmd_data)
-                statement = precmd_data.statement
+                precmd_hooks = self._hook_stages.precmd
+                if precmd_hooks:
+                    precmd_data = plugin.PrecommandData(statement)
+                    for precmd_func in precmd_hooks:
+                        precmd_data = precmd_func(precmd_data)
+                    statement = precmd_data.statement
 
                 # call precmd() for compatibility with cmd.Cmd
                 statement = self.precmd(statement)
+                timing.mark(PHASE_PRECMD)
 
                 # go run the command function
-                stop = self.onecmd(statement, add_to_history=add_to_history)
+                profile = self._start_profile(statement) if self.profile != PROFILE_OFF else None
+                try:
+                    stop = self.onecmd(statement, add_to_history=add_to_history)
+                finally:
+                    timing.mark(PHASE_COMMAND)
+                    if profile is not None:
+                        self._finish_profile(profile)
+                        timing.skip()
 
                 # postcommand hooks
-                postcmd_data = plugin.PostcommandData(stop, statement)
-                for postcmd_func in self._postcmd_hooks:
-                    postcmd_data = postcmd_func(postcmd_data)
+                postcmd_hooks = self._hook_stages.postcmd
+                if postcmd_hooks:
+                    postcmd_data = plugin.PostcommandData(stop, statement)
+                    for postcmd_func in postcmd_hooks:
+                        postcmd_data = postcmd_func(postcmd_data)
 
-                # retrieve the final value of stop, ignoring any statement modification from the hooks
-                stop = postcmd_data.stop
+                    # retrieve the final value of stop, ignoring any statement modification from the hooks
+                    stop = postcmd_data.stop
 
                 # call postcmd() for compatibility with cmd.Cmd
                 stop = self.postcmd(stop, statement)
-
-                if self.timing:
-                    self.perror(f"Elapsed: {datetime.datetime.now(tz=datetime.timezone.utc) - timestart}", style=None)
+                timing.mark(PHASE_POSTCMD)
             finally:
-                # Get sigint protection while we restore stuff
-                with self.sigint_protection:
-                    if redir_saved_state is not None:
-                        self._restore_output(statement, redir_saved_state)
-
-                    if py_bridge_call:
-                        # Stop saving command's stdout before command finalization hooks run
-                        self.stdout.pause_storage = True  # type: ignore[attr-defined]
+                if redir_saved_state is not None or py_bridge_call:
+                    # Get sigint protection while we restore stuff
+                    with self.sigint_protection:
+                        if redir_saved_state is not None:
+                            # If a hook raised an exception, don't count its time toward restoring output
+                            timing.skip()
+                            self._restore_output(statement, redir_saved_state)
+                            timing.mark(PHASE_REDIRECTION)
+
+                        if py_bridge_call:
+                            # Stop saving command's stdout before command finalization hooks run
+                            self.stdout.pause_storage = True  # type: ignore[attr-defined]
         except (SkipPostcommandHooks, EmptyStatement):
             # Don't do anything, but do allow command finalization hooks to run
             pass
@@ -3024,11 +3977,18 @@ class Cmd:
             stop = True
         except PassThroughException as ex:
             raise ex.wrapped_ex from None
+        except concurrent.futures.CancelledError as ex:
+            # A background job's coroutine which the kill command cancelled isn't an error
+            if not self.job_cancelled():
+                self.pexcept(ex)
         except Exception as ex:  # noqa: BLE001
             self.pexcept(ex)
         finally:
+            # Don't count the time spent reporting an error toward finalization
+            timing.skip()
             try:
-                stop = self._run_cmdfinalization_hooks(stop, statement)
+                if job is None:
+                    stop = self._run_cmdfinalization_hooks(stop, statement)
             except KeyboardInterrupt:
                 if raise_keyboard_interrupt and not stop:
                     raise
@@ -3040,23 +4000,238 @@ class Cmd:
                 raise ex.wrapped_ex from None
             except Exception as ex:  # noqa: BLE001
                 self.pexcept(ex)
+            finally:
+                timing.mark(PHASE_FINALIZATION)
+                self._command_timing = outer_timing
+                self._finish_command_timing(timing, start_time)
 
         return stop
 
+    def _start_job(self, statement: Statement, *, add_to_history: bool) -> Job:
+        """Start running a command as a background job.
+
+        :param statement: the command, which has its background field set
+        :param add_to_history: if True, add the command to history now rather than when the job runs it
+        :return: the job
+        """
+        if add_to_history and self.get_command_func(statement.command) is not None:
+            self._add_to_history(statement)
+
+        with self._jobs_lock:
+            job_id = max(self._jobs, default=0) + 1
+            job = Job(job_id, dataclasses.replace(statement, background=False), JobOutput(self.stdout))
+            self._jobs[job_id] = job
+
+        self.poutput(f"[{job.id}] {job.line}")
+        job.start(self._run_job, self._finish_job)
+        self.last_result = job
+        return job
+
+    def _run_job(self, job: Job) -> bool:
+        """Run a background job's command with the job's output as stdout and stderr. This runs in the job's thread.
+
+        :param job: the job being run
+        :return: True if the command indicated the application should stop
+        """
+        self._thread_state.stdout = self._thread_state.stderr = cast(TextIO, job.output)
+        self._thread_state.job_values = {}
+        self._thread_state.job = job
+        return self.onecmd_plus_hooks(job.statement, add_to_history=False)
+
+    def job_cancelled(self) -> bool:
+        """Check whether the background job running the current command was cancelled by the kill command.
+
+        Cancelling a job is cooperative. A command which may run for a while as a job should check this
+        periodically and return early once it's True. Coroutines which an async command's job is waiting
+        for are cancelled on the event loop instead.
+
+        :return: True if the current thread is running a background job which was cancelled. This is
+                 always False outside of background jobs.
+        """
+        job = self._thread_state.job
+        return job is not None and job.cancel_event.is_set()
+
+    def _finish_job(self, job: Job) -> None:
+        """Report a finished background job in an alert unless a command like fg or wait is reporting it.
+
+        This runs in the job's thread.
+
+        :param job: the job which finished
+        """
+        with self._jobs_lock:
+            if job.watched or self._jobs.get(job.id) is not job:
+                return
+            del self._jobs[job.id]
+
+        self.add_alert(msg=self._format_job_report(job))
+
+    def _watch_jobs(self, job_ids: Iterable[int] | None) -> list[Job] | None:
+        """Find background jobs and mark them as watched, so they aren't reported in alerts when they finish.
+
+        :param job_ids: IDs of the jobs to find or None for all jobs
+        :return: the jobs or None if any of them don't exist, in which case an error is printed
+        """
+        with self._jobs_lock:
+            if job_ids is None:
+                jobs = list(self._jobs.values())
+            else:
+                jobs = []
+                for job_id in utils.remove_duplicates(job_ids):
+                    if (job := self._jobs.get(job_id)) is None:
+                        self.perror(f"No such job: {job_id}")
+                        return None
+                    jobs.append(job)
+
+            for job in jobs:
+                job.watched = True
+
+        return jobs
+
+    def _release_job(self, job: Job) -> bool:
+        """Stop watching a background job.
+
+        :param job: a job returned by _watch_jobs()
+        :return: True if the job finished, in which case it was removed from the jobs and the caller must report it
+        """
+        with self._jobs_lock:
+            job.watched = False
+            if job.done and self._jobs.get(job.id) is job:
+                del self._jobs[job.id]
+                return True
+
+        return False
+
+    @staticmethod
+    def _format_job_report(job: Job) -> str:
+        """Return a finished job's output which hasn't been shown yet, followed by its status."""
+        output = job.output.read()
+        if output and not output.endswith("\n"):
+            output += "\n"
+        return f"{output}[{job.id}] {job.status}  {job.line}"
+
+    def _start_profile(self, statement: Statement) -> CommandProfile | None:
+        """Start profiling a command based on the profile setting.
+
+        :param statement: the command being profiled
+        :return: the command's profile, or None if it can't be profiled since a command in another thread,
+                 like a background job, is being profiled
+        """
+        profile = CommandProfile(
+            statement.raw,
+            statement.command,
+            cpu=self.profile in (PROFILE_CPU, PROFILE_ALL),
+            memory=self.profile in (PROFILE_MEMORY, PROFILE_ALL),
+        )
+
+        # Only one cProfile profiler can be enabled at a time, so pause the command this one is nested in
+        if self._thread_state.profile_stack:
+            self._thread_state.profile_stack[-1].pause()
+        try:
+            profile.start()
+        except BaseException as ex:
+            if self._thread_state.profile_stack:
+                self._thread_state.profile_stack[-1].resume()
+
+            # A RuntimeError means another thread's command is being profiled, which this one doesn't stop
+            if isinstance(ex, RuntimeError):
+                self.pwarning(f"Not profiling {statement.command}: {ex}")
+                return None
+            raise
+
+        self._thread_state.profile_stack.append(profile)
+        return profile
+
+    def _finish_profile(self, profile: CommandProfile) -> None:
+        """Stop profiling a command, then report and save its profile.
+
+        :param profile: the command's profile
+        """
+        profile.stop()
+        self._thread_state.profile_stack.pop()
+        if self._thread_state.profile_stack:
+            self._thread_state.profile_stack[-1].resume()
+
+        self.perror(f"Profile of: {profile.line}", style=None)
+        for report in (profile.cpu_report(self.profile_top), profile.memory_report(self.profile_top)):
+            if report:
+                self.perror(report, style=None)
+
+        if self.profile_dir:
+            try:
+                paths = profile.save(os.path.expanduser(self.profile_dir))
+            except OSError as ex:
+                self.perror(f"Unable to save profile: {ex}")
+            else:
+                self.perror(f"Profile saved to: {', '.join(paths)}", style=None)
+
+    def _finish_command_timing(self, timing: CommandTiming, start_time: float) -> None:
+        """Store the timing of a command which finished and report it if the timing setting is enabled.
+
+        Lines which didn't run a command, like blank lines and syntax errors, are not stored, and neither
+        are commands whose timing wasn't recorded.
+
+        :param timing: the command's timing
+        :param start_time: value of time.perf_counter() when the command started
+        """
+        if timing is NULL_COMMAND_TIMING:
+            # A command which enabled the timing setting still reports how long it took
+            if self.timing:
+                self.perror(f"Elapsed: {datetime.timedelta(seconds=time.perf_counter() - start_time)}", style=None)
+            return
+
+        if PHASE_COMMAND not in timing.phases:
+            return
+
+        self.last_command_timing = timing
+        self.timing_stats.add(timing)
+
+        if not self.timing:
+            return
+
+        self.perror(f"Elapsed: {datetime.timedelta(seconds=timing.total)}", style=None)
+
+        if self.timing_report == "phases":
+            for phase, seconds in timing.phases.items():
+                self.perror(f"  {phase:<13} {seconds * 1000:10.3f} ms", style=None)
+
+        elif self.timing_report == "percentiles":
+            percents = (50, 90, 99)
+            stats_table = Cmd2SimpleTable(
+                Column("Phase", no_wrap=True),
+                *(Column(f"p{percent} (ms)", justify="right") for percent in percents),
+            )
+            for phase, values in self.timing_stats.percentiles(percents).items():
+                stats_table.add_row(phase, *(f"{value * 1000:.3f}" for value in values))
+
+            self.perror(f"Percentiles of the last {len(self.timing_stats)} commands", style=None)
+            self.perror(stats_table, style=None, soft_wrap=False)
+
     def _run_cmdfinalization_hooks(self, stop: bool, statement: Statement | None) -> bool:
         """Run the command finalization hooks."""
-        if self._initial_termios_settings is not None and self.stdin.isatty():  # type: ignore[unreachable]
-            import io  # type: ignore[unreachable]
-            import termios
+        # Only restore the terminal from the main thread. Background jobs run in other threads while
+        # prompt_toolkit has put the terminal in raw mode to read the next command.
+        if (
+            self._initial_termios_settings is not None
+            and threading.current_thread() is threading.main_thread()
+            and self.stdin.isatty()
+        ):  # type: ignore[unreachable]
+            import termios  # type: ignore[unreachable]
 
             # Before the next command runs, fix any terminal problems like those
             # caused by certain binary characters having been printed to it.
             with self.sigint_protection, contextlib.suppress(io.UnsupportedOperation, termios.error):
-                # This can fail if stdin is a pseudo-TTY, in which case we just ignore it
-                termios.tcsetattr(self.stdin.fileno(), termios.TCSANOW, self._initial_termios_settings)
+                # This can fail if stdin is a pseudo-TTY, in which case we just ignore it.
+                # Reading the settings is cheaper than writing them, so only write them if they changed.
+                fd = self.stdin.fileno()
+                if termios.tcgetattr(fd) != self._initial_termios_settings:
+                    termios.tcsetattr(fd, termios.TCSANOW, self._initial_termios_settings)
+
+        cmdfinalization_hooks = self._hook_stages.cmdfinalization
+        if not cmdfinalization_hooks:
+            return stop
 
         data = plugin.CommandFinalizationData(stop, statement)
-        for func in self._cmdfinalization_hooks:
+        for func in cmdfinalization_hooks:
             data = func(data)
         # retrieve the final value of stop, ignoring any
         # modifications to the statement
@@ -3073,7 +4248,7 @@ class Cmd:
 
         The prompt and command line for each command will be printed if echo is True.
 
-        :param cmds: commands to run
+        :param cmds: commands to run. Any Statement objects in cmds are run without being parsed again.
         :param add_to_history: If True, then add these commands to history. Defaults to True.
         :param stop_on_keyboard_interrupt: if True, then stop running contents of cmds if Ctrl-C is pressed instead of moving
                                            to the next command in the list. This is used when the commands are part of a
@@ -3085,7 +4260,7 @@ class Cmd:
                 line = line.raw  # noqa: PLW2901
 
             if self.echo:
-                self.poutput(f"{self.prompt}{line}")
+                self.poutput(f"{self.prompt}{line.raw if isinstance(line, Statement) else line}")
 
             try:
                 if self.onecmd_plus_hooks(
@@ -3129,37 +4304,63 @@ class Cmd:
         # - Multiline command with an unclosed quotation mark
         raise IncompleteStatement
 
-    def _complete_statement(self, line: str) -> Statement:
+    def _complete_statement(self, line: str, *, timing: CommandTiming | None = None) -> Statement:
         """Keep accepting lines of input until the command is complete.
 
-        :param line: the line being parsed
+        :param line: the line being parsed. If this is already a Statement, then it is only
+                     parsed again if it is a multiline command that still needs a terminator.
+        :param timing: if provided, the time spent waiting for continuation lines is excluded from it
         :return: the completed Statement
         :raises Cmd2ShlexError: if a shlex error occurs (e.g. No closing quotation)
         :raises EmptyStatement: when the resulting Statement is blank
         """
+        if isinstance(line, Statement):
+            if line.terminator or not line.multiline_command:
+                if not line.command:
+                    raise EmptyStatement
+                return line
+            line = line.raw
+
+        # Tracks the quote and terminator state of a multiline statement so only
+        # the new text is scanned as each line is added.
+        scanner: MultilineScanner | None = None
+
         while True:
+            if scanner is None or scanner.maybe_complete:
+                try:
+                    return self._check_statement_complete(line)
+                except IncompleteStatement:
+                    if scanner is None:
+                        scanner = self.statement_parser.multiline_scanner(line)
+
+            # If incomplete, we need to fetch the next line
             try:
-                return self._check_statement_complete(line)
-            except IncompleteStatement:
-                # If incomplete, we need to fetch the next line
+                # Count the time spent so far as parsing, but not the time spent waiting for the user
+                if timing is not None:
+                    timing.mark(PHASE_PARSING)
                 try:
-                    try:
-                        nextline = self._read_command_line(self.continuation_prompt)
-                    except EOFError:
-                        # Add a blank line, which serves as a command terminator.
-                        nextline = "\n"
-                        self.poutput(nextline)
+                    nextline = self._read_command_line(self.continuation_prompt)
+                except EOFError:
+                    # Add a blank line, which serves as a command terminator.
+                    nextline = "\n"
+                    self.poutput(nextline)
+                finally:
+                    if timing is not None:
+                        timing.skip()
 
-                    line += f"\n{nextline}"
+                line += f"\n{nextline}"
+                scanner.add_line(nextline)
 
-                except KeyboardInterrupt:
-                    self.poutput("^C")
-                    raise EmptyStatement from None
+            except KeyboardInterrupt:
+                self.poutput("^C")
+                raise EmptyStatement from None
 
-    def _input_line_to_statement(self, line: str) -> Statement:
+    def _input_line_to_statement(self, line: str, *, timing: CommandTiming | None = None) -> Statement:
         """Parse the user's input line and convert it to a Statement, ensuring that all macros are also resolved.
 
-        :param line: the line being parsed
+        :param line: the line being parsed. This can also be a Statement which was already parsed
+                     with the current settings, such as one from [cmd2.parsing.StatementParser.parse_many][].
+        :param timing: if provided, the time spent parsing and resolving macros is recorded in it
         :return: parsed command line as a Statement
         :raises Cmd2ShlexError: if a shlex error occurs (e.g. No closing quotation)
         :raises EmptyStatement: when the resulting Statement is blank
@@ -3170,7 +4371,9 @@ class Cmd:
         # Continue until all macros are resolved
         while True:
             # Get a complete statement (handling multiline input)
-            statement = self._complete_statement(line)
+            statement = self._complete_statement(line, timing=timing)
+            if timing is not None:
+                timing.mark(PHASE_PARSING)
 
             # If this is the first loop iteration, save the original line
             if orig_line is None:
@@ -3184,15 +4387,15 @@ class Cmd:
                 except MacroError as ex:
                     self.perror(ex)
                     raise EmptyStatement from None
+                if timing is not None:
+                    timing.mark(PHASE_EXPANSION)
             else:
                 # No macro found or already processed. The statement is complete.
                 break
 
         # Restore original 'raw' text if a macro was expanded
         if orig_line != statement.raw:
-            statement_dict = statement.to_dict()
-            statement_dict["raw"] = orig_line
-            statement = Statement.from_dict(statement_dict)
+            statement = dataclasses.replace(statement, raw=orig_line)
 
         return statement
 
@@ -3210,32 +4413,21 @@ class Cmd:
         macro = self.macros[statement.command]
 
         # Make sure enough arguments were passed in
-        if len(statement.arg_list) < macro.minimum_arg_count:
+        arg_list = statement.arg_list
+        if len(arg_list) < macro.minimum_arg_count:
             plural = "" if macro.minimum_arg_count == 1 else "s"
             raise MacroError(f"The macro '{statement.command}' expects at least {macro.minimum_arg_count} argument{plural}")
 
-        # Resolve the arguments in reverse and read their values from statement.argv since those
-        # are unquoted. Macro args should have been quoted when the macro was created.
-        resolved = macro.value
-        reverse_arg_list = sorted(macro.args, key=lambda ma: ma.start_index, reverse=True)
-
-        for macro_arg in reverse_arg_list:
-            if macro_arg.is_escaped:
-                to_replace = "{{" + macro_arg.number_str + "}}"
-                replacement = "{" + macro_arg.number_str + "}"
-            else:
-                to_replace = "{" + macro_arg.number_str + "}"
-                replacement = statement.argv[int(macro_arg.number_str)]
-
-            parts = resolved.rsplit(to_replace, maxsplit=1)
-            resolved = parts[0] + replacement + parts[1]
+        # Fill in the arguments from statement.argv since those are unquoted.
+        # Macro args should have been quoted when the macro was created.
+        parts = [macro.resolve(statement.argv)]
 
         # Append extra arguments and use statement.arg_list since these arguments need their quotes preserved
-        for stmt_arg in statement.arg_list[macro.minimum_arg_count :]:
-            resolved += " " + stmt_arg
+        parts.extend(f" {stmt_arg}" for stmt_arg in arg_list[macro.minimum_arg_count :])
 
         # Restore any terminator, suffix, redirection, etc.
-        return resolved + statement.post_command
+        parts.append(statement.post_command)
+        return "".join(parts)
 
     def _redirect_output(self, statement: Statement) -> utils.RedirectionSavedState:
         """Set up a command's output redirection for >, >>, and |.
@@ -3283,7 +4475,7 @@ class Cmd:
                 statement.redirect_to,
                 stdin=subproc_stdin,
                 stdout=subprocess.PIPE if isinstance(self.stdout, utils.StdSim) else self.stdout,  # type: ignore[unreachable]
-                stderr=subprocess.PIPE if isinstance(sys.stderr, utils.StdSim) else sys.stderr,
+                stderr=subprocess.PIPE if isinstance(self._stderr, utils.StdSim) else self._stderr,  # type: ignore[unreachable]
                 shell=True,
                 **kwargs,
             )
@@ -3301,7 +4493,7 @@ class Cmd:
                 new_stdout.close()
                 raise RedirectionError(f"Pipe process exited with code {proc.returncode} before command could run")
             redir_saved_state.redirecting = True
-            cmd_pipe_proc_reader = utils.ProcReader(proc, self.stdout, sys.stderr)
+            cmd_pipe_proc_reader = utils.ProcReader(proc, self.stdout, self._stderr)
 
             self.stdout = new_stdout
 
@@ -3334,6 +4526,8 @@ class Cmd:
                 # no point opening up the temporary file
                 current_paste_buffer = get_paste_buffer()
                 # create a temporary file to store output
+                import tempfile
+
                 new_stdout = cast(TextIO, tempfile.TemporaryFile(mode="w+"))  # noqa: SIM115
                 redir_saved_state.redirecting = True
 
@@ -3379,7 +4573,7 @@ class Cmd:
         self._cur_pipe_proc_reader = saved_redir_state.saved_pipe_proc_reader
         self._redirecting = saved_redir_state.saved_redirecting
 
-    def get_command_func(self, command: str) -> BoundCommandFunc | None:
+    def get_command_func(self, command: str) -> AnyBoundCommandFunc | None:
         """Get the bound command function for a command.
 
         :param command: the name of the command
@@ -3387,9 +4581,9 @@ class Cmd:
         """
         command_func_name = constants.COMMAND_FUNC_PREFIX + command
         command_func = getattr(self, command_func_name, None)
-        return cast(BoundCommandFunc, command_func) if callable(command_func) else None
+        return cast(AnyBoundCommandFunc, command_func) if callable(command_func) else None
 
-    def _get_command_category(self, func: BoundCommandFunc) -> str:
+    def _get_command_category(self, func: AnyBoundCommandFunc) -> str:
         """Determine the category for a command.
 
         :param func: the do_* function implementing the command
@@ -3422,25 +4616,28 @@ class Cmd:
 
         command_func = self.get_command_func(statement.command)
         if command_func:
-            # Check to see if this command should be stored in history
-            if (
-                statement.command not in self.exclude_from_history
-                and statement.command not in self.disabled_commands
-                and add_to_history
-            ):
-                self.history.append(statement)
+            if add_to_history:
+                self._add_to_history(statement)
 
             try:
                 self.current_command = statement
-                stop = command_func(statement)
+                stop = self._resolve_awaitable(command_func(statement))
             finally:
                 self.current_command = None
 
         else:
-            stop = self.default(statement)
+            stop = self._resolve_awaitable(self.default(statement))
 
         return stop if stop is not None else False
 
+    def _add_to_history(self, statement: Statement) -> None:
+        """Add a command to history unless it's excluded from history or disabled.
+
+        :param statement: the command being run
+        """
+        if statement.command not in self.exclude_from_history and statement.command not in self.disabled_commands:
+            self.history.append(statement)
+
     def default(self, statement: Statement) -> bool | None:
         """Execute when the command given isn't a recognized command implemented by a do_* method.
 
@@ -3466,7 +4663,7 @@ class Cmd:
         return suggest_similar(command, self.get_visible_commands())
 
     @staticmethod
-    def _is_tty_session(session: PromptSession[str]) -> bool:
+    def _is_tty_session(session: "PromptSession[str]") -> bool:
         """Determine if the session supports full terminal interactions.
 
         Returns True if the session is attached to a real TTY or a virtual
@@ -3477,12 +4674,14 @@ class Cmd:
         # This respects the fallback logic in _create_main_session() and allows unit
         # tests to inject PipeInput for programmatic interaction even if paired with
         # a DummyOutput.
+        from prompt_toolkit.input import DummyInput
+
         return not isinstance(session.input, DummyInput)
 
     def _read_raw_input(
         self,
-        prompt: Callable[[], ANSI | str] | ANSI | str,
-        session: PromptSession[str],
+        prompt: "Callable[[], ANSI | str] | ANSI | str",
+        session: "PromptSession[str] | None",
         **prompt_kwargs: Any,
     ) -> str:
         """Execute the low-level input read from either a terminal or a redirected stream.
@@ -3492,13 +4691,18 @@ class Cmd:
         a direct line read from `stdin`.
 
         :param prompt: the prompt text or a callable that returns the prompt.
-        :param session: the PromptSession instance to use for reading.
+        :param session: the PromptSession instance to use for reading, or None to read from `stdin`
+                        without one.
         :param prompt_kwargs: additional arguments passed directly to session.prompt().
         :return: the stripped input string.
         :raises EOFError: if the input stream is closed or the user signals EOF (e.g., Ctrl+D)
         """
         # Check if the session is configured for interactive terminal use.
-        if self._is_tty_session(session):
+        if session is not None and self._is_tty_session(session):
+            from prompt_toolkit.patch_stdout import patch_stdout
+
+            from .pt_utils import pt_filter_style
+
             if not callable(prompt):
                 prompt = pt_filter_style(prompt)
 
@@ -3513,7 +4717,7 @@ class Cmd:
 
         # We're not at a terminal, so we're likely reading from a file or a pipe.
         prompt_obj = prompt() if callable(prompt) else prompt
-        prompt_str = prompt_obj.value if isinstance(prompt_obj, ANSI) else prompt_obj
+        prompt_str = prompt_obj if isinstance(prompt_obj, str) else prompt_obj.value
 
         # If this is an interactive pipe, then display the prompt first
         if self.interactive_pipe:
@@ -3544,8 +4748,12 @@ class Cmd:
         choices_provider: UnboundChoicesProvider[CmdOrSetT] | None = None,
         completer: UnboundCompleter[CmdOrSetT] | None = None,
         parser: Cmd2ArgumentParser | None = None,
-    ) -> Completer:
+    ) -> "Completer":
         """Determine the appropriate completer based on provided arguments."""
+        from prompt_toolkit.completion import DummyCompleter
+
+        from .pt_utils import Cmd2Completer
+
         if not any((parser, choices, choices_provider, completer)):
             return DummyCompleter()
 
@@ -3598,6 +4806,12 @@ class Cmd:
         :raises EOFError: if the input stream is closed or the user signals EOF (e.g., Ctrl+D)
         :raises Exception: any other exceptions raised by prompt()
         """
+        if self.headless:
+            return self._read_raw_input(prompt, None)
+
+        from prompt_toolkit.history import InMemoryHistory
+        from prompt_toolkit.shortcuts import PromptSession
+
         completer_to_use = self._resolve_completer(
             preserve_quotes=preserve_quotes,
             choices=choices,
@@ -3633,6 +4847,11 @@ class Cmd:
         :raises EOFError: if the input stream is closed or the user signals EOF (e.g., Ctrl+D)
         :raises Exception: any other exceptions raised by prompt()
         """
+        if self.headless:
+            return self._read_raw_input(prompt, None, is_password=True)
+
+        from prompt_toolkit.shortcuts import PromptSession
+
         temp_session: PromptSession[str] = PromptSession(
             color_depth=self.main_session.color_depth,
             input=self.main_session.input,
@@ -3693,11 +4912,17 @@ class Cmd:
                     self.prompt = latest_prompt
 
                 if alert_text:
+                    from prompt_toolkit import print_formatted_text
+                    from prompt_toolkit.formatted_text import ANSI
+                    from prompt_toolkit.patch_stdout import patch_stdout
+
                     # Print the alert messages above the prompt.
                     with patch_stdout():
                         print_formatted_text(ANSI(alert_text), end="")
 
                 elif latest_prompt is not None:
+                    from prompt_toolkit.application import get_app
+
                     # Refresh UI immediately to show the new prompt
                     get_app().invalidate()
 
@@ -3709,6 +4934,12 @@ class Cmd:
         :raises EOFError: if the input stream is closed or the user signals EOF (e.g., Ctrl+D)
         :raises Exception: any other exceptions raised by prompt()
         """
+        if self.headless:
+            return self._read_raw_input(prompt, None)
+
+        from prompt_toolkit.formatted_text import ANSI
+
+        from .pt_utils import pt_filter_style
 
         # Use dynamic prompt if the prompt matches self.prompt
         def get_prompt() -> str | ANSI:
@@ -3725,6 +4956,9 @@ class Cmd:
             self._alert_prompt_timestamp = time.monotonic()
             self.pre_prompt()
 
+            # Matches cached while completing the previous command line may be out of date
+            self._choices_cache.clear()
+
             # Start alerter thread if it's not already running.
             if self._alert_thread is None or not self._alert_thread.is_alive():
                 self._alert_allowed = False
@@ -3861,7 +5095,7 @@ class Cmd:
             self.perror(f"Invalid alias name: {errmsg}")
             return
 
-        if args.name in self.get_all_commands():
+        if self.get_command_func(args.name) is not None:
             self.perror("Alias cannot have the same name as a command")
             return
 
@@ -3885,6 +5119,11 @@ class Cmd:
         self.aliases[args.name] = value
         self.last_result = True
 
+        # Warn about cycles since expansion stops at the first repeated alias
+        cycle = self.statement_parser.find_alias_cycle(args.name)
+        if cycle:
+            self.pwarning(f"Alias '{args.name}' expands into a cycle: {' -> '.join(cycle)}")
+
     # alias -> delete
     @classmethod
     def _build_alias_delete_parser(cls) -> Cmd2ArgumentParser:
@@ -4106,7 +5345,7 @@ class Cmd:
             self.perror(f"Invalid macro name: {errmsg}")
             return
 
-        if args.name in self.get_all_commands():
+        if self.get_command_func(args.name) is not None:
             self.perror("Macro cannot have the same name as a command")
             return
 
@@ -4287,6 +5526,8 @@ class Cmd:
         if not command:
             return Completions()
 
+        self._load_lazy_command_set(command)
+
         # Check if this command uses argparse
         if (command_func := self.get_command_func(command)) is None or (
             parser := self.command_parsers.get(command_func)
@@ -4316,8 +5557,7 @@ class Cmd:
                 help_topics.remove(command)
 
             # Store the command within its category
-            command_func = cast(BoundCommandFunc, self.get_command_func(command))
-            category = self._get_command_category(command_func)
+            category = cast(CommandInfo, self.get_command_info(command)).category
             cmds_cats.setdefault(category, []).append(command)
 
         return cmds_cats, help_topics
@@ -4396,6 +5636,7 @@ class Cmd:
                     self._report_disabled_command_usage(message_to_print=f"{args.command} is currently disabled.")
                 return
 
+            self._load_lazy_command_set(args.command)
             command_func = self.get_command_func(args.command)
             parser = None if command_func is None else self.command_parsers.get(command_func)
 
@@ -4410,6 +5651,8 @@ class Cmd:
 
             # If the command function has a docstring, then print it
             elif command_func is not None and command_func.__doc__ is not None:
+                import pydoc
+
                 self.poutput(pydoc.getdoc(command_func))
 
             # If there is no help information then print an error
@@ -4631,7 +5874,10 @@ class Cmd:
                 except (IndexError, TypeError):
                     fulloptions.append((opt[0], str(opt[0])))
 
-        if self._is_tty_session(self.main_session):
+        if not self.headless and self._is_tty_session(self.main_session):
+            from prompt_toolkit.application import create_app_session
+            from prompt_toolkit.shortcuts import choice
+
             try:
                 while True:
                     with create_app_session(input=self.main_session.input, output=self.main_session.output):
@@ -4849,12 +6095,12 @@ class Cmd:
             proc = subprocess.Popen(  # noqa: S602
                 expanded_command,
                 stdout=subprocess.PIPE if isinstance(self.stdout, utils.StdSim) else self.stdout,  # type: ignore[unreachable]
-                stderr=subprocess.PIPE if isinstance(sys.stderr, utils.StdSim) else sys.stderr,
+                stderr=subprocess.PIPE if isinstance(self._stderr, utils.StdSim) else self._stderr,  # type: ignore[unreachable]
                 shell=True,
                 **kwargs,
             )
 
-            proc_reader = utils.ProcReader(proc, self.stdout, sys.stderr)
+            proc_reader = utils.ProcReader(proc, self.stdout, self._stderr)
             proc_reader.wait()
 
             # Save the return code of the application for use in a pyscript
@@ -4887,7 +6133,7 @@ class Cmd:
         sys.displayhook = sys.__displayhook__
         sys.excepthook = sys.__excepthook__
 
-    def _set_up_py_shell_env(self, interp: InteractiveConsole) -> _SavedCmd2Env:
+    def _set_up_py_shell_env(self, interp: "InteractiveConsole") -> _SavedCmd2Env:
         """Set up interactive Python shell environment.
 
         :return: Class containing saved up cmd2 environment.
@@ -5026,6 +6272,8 @@ class Cmd:
                 local_vars["__name__"] = "__console__"
 
             # Create the Python interpreter
+            from code import InteractiveConsole
+
             self.last_result = True
             interp = InteractiveConsole(locals=local_vars)
 
@@ -5197,6 +6445,172 @@ class Cmd:
         finally:
             self._in_py = False
 
+    def _get_job_choices(self) -> Choices:
+        """Return the IDs of background jobs as Choices."""
+        with self._jobs_lock:
+            jobs = list(self._jobs.values())
+
+        return Choices(
+            items=[CompletionItem(job.id, display_meta=job.line, table_data=[job.status, job.line]) for job in jobs]
+        )
+
+    @staticmethod
+    def _build_jobs_parser() -> Cmd2ArgumentParser:
+        return argparse_utils.DEFAULT_ARGUMENT_PARSER(description="List background jobs.")
+
+    @with_argparser(_build_jobs_parser)
+    def do_jobs(self, _: argparse.Namespace) -> None:
+        """List background jobs."""
+        with self._jobs_lock:
+            jobs = list(self._jobs.values())
+
+        if jobs:
+            jobs_table = Cmd2SimpleTable(
+                Column("Job", justify="right", no_wrap=True),
+                Column("Status", no_wrap=True),
+                Column("Elapsed", justify="right", no_wrap=True),
+                Column("Command", overflow="fold"),
+            )
+            for job in jobs:
+                elapsed = datetime.timedelta(seconds=round(job.elapsed))
+                jobs_table.add_row(str(job.id), job.status, str(elapsed), Text(job.line))
+            self.poutput(jobs_table)
+
+        self.last_result = jobs
+
+    @classmethod
+    def _build_fg_parser(cls) -> Cmd2ArgumentParser:
+        fg_description = Text.assemble(
+            "Bring a background job to the foreground.",
+            "\n\n",
+            "Its output is shown as it is written until it finishes. Pressing Ctrl-C cancels the job like the "
+            "kill command does. Pressing it again stops waiting for a job which is still running and leaves it "
+            "in the background.",
+        )
+
+        fg_parser = argparse_utils.DEFAULT_ARGUMENT_PARSER(description=fg_description)
+        fg_parser.add_argument(
+            "id",
+            nargs=argparse.OPTIONAL,
+            type=int,
+            help="job to bring to the foreground (default: the most recent job)",
+            choices_provider=cls._get_job_choices,
+            table_columns=["Status", "Command"],
+        )
+
+        return fg_parser
+
+    @with_argparser(_build_fg_parser)
+    def do_fg(self, args: argparse.Namespace) -> None:
+        """Bring a background job to the foreground."""
+        self.last_result = None
+
+        if args.id is not None:
+            job_ids = [args.id]
+        else:
+            with self._jobs_lock:
+                job_ids = list(self._jobs)[-1:]
+            if not job_ids:
+                self.perror("No background jobs")
+                return
+
+        jobs = self._watch_jobs(job_ids)
+        if jobs is None:
+            return
+
+        job = jobs[0]
+        self.poutput(job.line)
+        try:
+            with job.output.foreground(self.stdout):
+                try:
+                    job.wait()
+                except KeyboardInterrupt:
+                    job.cancel()
+                    job.wait()
+        finally:
+            # If a job is still running, it will be reported in an alert once it finishes
+            self._release_job(job)
+
+        self.last_result = job
+
+    @classmethod
+    def _build_wait_parser(cls) -> Cmd2ArgumentParser:
+        wait_parser = argparse_utils.DEFAULT_ARGUMENT_PARSER(
+            description="Wait for background jobs to finish and show their output."
+        )
+        wait_parser.add_argument(
+            "ids",
+            nargs=argparse.ZERO_OR_MORE,
+            type=int,
+            help="jobs to wait for (default: all jobs)",
+            choices_provider=cls._get_job_choices,
+            table_columns=["Status", "Command"],
+        )
+
+        return wait_parser
+
+    @with_argparser(_build_wait_parser)
+    def do_wait(self, args: argparse.Namespace) -> None:
+        """Wait for background jobs to finish and show their output."""
+        self.last_result = None
+
+        jobs = self._watch_jobs(args.ids or None)
+        if jobs is None:
+            return
+
+        finished = 0
+        try:
+            for job in jobs:
+                job.wait()
+                finished += 1
+                if self._release_job(job):
+                    self.poutput(self._format_job_report(job))
+        finally:
+            # If waiting was interrupted, the jobs which are still running will be reported in alerts
+            for job in jobs[finished:]:
+                if self._release_job(job):
+                    self.add_alert(msg=self._format_job_report(job))
+
+        self.last_result = jobs
+
+    @classmethod
+    def _build_kill_parser(cls) -> Cmd2ArgumentParser:
+        kill_parser = argparse_utils.DEFAULT_ARGUMENT_PARSER(description="Cancel background jobs.")
+        kill_parser.epilog = TextGroup(
+            "Note",
+            "Cancelling is cooperative. A job stops once its command checks whether it was cancelled, "
+            "or once the coroutine of an async command handles being cancelled. "
+            "Jobs whose commands do neither run until they finish.",
+        )
+        kill_parser.add_argument(
+            "ids",
+            nargs=argparse.ONE_OR_MORE,
+            type=int,
+            help="jobs to cancel",
+            choices_provider=cls._get_job_choices,
+            table_columns=["Status", "Command"],
+        )
+
+        return kill_parser
+
+    @with_argparser(_build_kill_parser)
+    def do_kill(self, args: argparse.Namespace) -> None:
+        """Cancel background jobs."""
+        self.last_result = True
+
+        for job_id in utils.remove_duplicates(args.ids):
+            with self._jobs_lock:
+                job = self._jobs.get(job_id)
+
+            if job is None:
+                self.perror(f"No such job: {job_id}")
+                self.last_result = False
+            elif not job.cancel():
+                self.perror(f"Job {job_id} is not running")
+                self.last_result = False
+            else:
+                self.poutput(f"[{job.id}] Cancellation requested  {job.line}")
+
     @classmethod
     def _build_history_parser(cls) -> Cmd2ArgumentParser:
         history_description = "View, run, edit, save, or clear previously entered commands."
@@ -5277,7 +6691,8 @@ class Cmd:
 
             # Clear command and prompt-toolkit history
             self.history.clear()
-            cast(Cmd2History, self.main_session.history).clear()
+            if self._main_session is not None:
+                cast("Cmd2History", self._main_session.history).clear()
 
             if self.persistent_history_file:
                 try:
@@ -5303,6 +6718,8 @@ class Cmd:
                 self.last_result = True
                 return stop
         elif args.edit:
+            import tempfile
+
             fd, fname = tempfile.mkstemp(suffix=".txt", text=True)
             fobj: TextIO
             with os.fdopen(fd, "w") as fobj:
@@ -5529,6 +6946,12 @@ class Cmd:
             help="path to the script file",
             completer=cls.path_complete,
         )
+        run_script_parser.add_argument(
+            "-c",
+            "--check",
+            action="store_true",
+            help="check the script for syntax errors without running it",
+        )
 
         return run_script_parser
 
@@ -5571,12 +6994,23 @@ class Cmd:
             self.perror(f"Problem accessing script from '{expanded_path}': {ex}")
             return None
 
+        if args.check:
+            self.last_result = self._check_script(expanded_path, script_commands)
+            return None
+
         orig_script_dir_count = len(self._script_dir)
 
         try:
             self._script_dir.append(os.path.dirname(expanded_path))
+
+            # Each line is parsed right before it runs so changes made by earlier lines, like new aliases,
+            # still apply. Lines with syntax errors are passed along unparsed so they are reported as usual.
+            statements = (
+                parsed.line if parsed.statement is None else parsed.statement
+                for parsed in self.statement_parser.parse_many(script_commands)
+            )
             stop = self.runcmds_plus_hooks(
-                script_commands,
+                statements,
                 add_to_history=self.scripts_add_to_history,
                 stop_on_keyboard_interrupt=True,
             )
@@ -5588,6 +7022,29 @@ class Cmd:
                 if orig_script_dir_count != len(self._script_dir):
                     self._script_dir.pop()
 
+    def _check_script(self, script_path: str, script_commands: list[str]) -> bool:
+        """Check the lines of a text script for syntax errors without running them.
+
+        :param script_path: path of the script, used in error messages
+        :param script_commands: lines of the script
+        :return: True if no errors were found
+        """
+        error_count = 0
+        for parsed in self.statement_parser.parse_many(script_commands):
+            error = parsed.error
+            if parsed.statement is not None and parsed.statement.multiline_command and not parsed.statement.terminator:
+                error = "Multiline command is missing a terminator"
+            if error:
+                self.perror(f"{script_path}:{parsed.line_number}: {error}")
+                error_count += 1
+
+        if error_count:
+            self.perror(f"Found {error_count} error(s) in '{script_path}'")
+            return False
+
+        self.pfeedback(f"No errors found in '{script_path}'")
+        return True
+
     @classmethod
     def _build__relative_run_script_parser(cls) -> Cmd2ArgumentParser:
         _relative_run_script_parser = cls._build_base_run_script_parser()
@@ -5621,8 +7078,12 @@ class Cmd:
         # NOTE: Relative path is an absolute path, it is just relative to the current script directory
         relative_path = os.path.join(self._current_script_dir or "", script_path)
 
+        run_script_args = su.quote(relative_path)
+        if args.check:
+            run_script_args = f"--check {run_script_args}"
+
         # self.last_result will be set by do_run_script()
-        return self.do_run_script(su.quote(relative_path))
+        return self.do_run_script(run_script_args)
 
     def add_alert(
         self,
@@ -5660,6 +7121,8 @@ class Cmd:
 
         :param title: the new window title
         """
+        from prompt_toolkit.shortcuts import set_title
+
         set_title(title)
 
     def enable_command(self, command: str) -> None:
@@ -5785,7 +7248,7 @@ class Cmd:
         all_commands = self.get_all_commands()
 
         for command in all_commands:
-            command_func = cast(BoundCommandFunc, self.get_command_func(command))
+            command_func = cast(AnyBoundCommandFunc, self.get_command_func(command))
             if self._get_command_category(command_func) == category:
                 self.disable_command(command, message_to_print)
 
@@ -5858,6 +7321,9 @@ class Cmd:
             func()
         self.postloop()
 
+        # Cancel any coroutines still running and stop the event loop's thread
+        self._event_loop_thread.close()
+
         # Restore original signal handlers
         signal.signal(signal.SIGINT, original_sigint_handler)
 
@@ -5880,6 +7346,16 @@ class Cmd:
         self._precmd_hooks: list[Callable[[plugin.PrecommandData], plugin.PrecommandData]] = []
         self._postcmd_hooks: list[Callable[[plugin.PostcommandData], plugin.PostcommandData]] = []
         self._cmdfinalization_hooks: list[Callable[[plugin.CommandFinalizationData], plugin.CommandFinalizationData]] = []
+        self._hook_stages = _HookStages()
+
+    def _update_hook_stages(self) -> None:
+        """Rebuild the hooks run at each stage of a command after a hook is registered."""
+        self._hook_stages = _HookStages(
+            tuple(self._postparsing_hooks),
+            tuple(self._precmd_hooks),
+            tuple(self._postcmd_hooks),
+            tuple(self._cmdfinalization_hooks),
+        )
 
     @classmethod
     def _validate_callable_param_count(cls, func: Callable[..., Any], count: int) -> None:
@@ -5927,6 +7403,7 @@ class Cmd:
         """Register a function to be called after parsing user input but before running the command."""
         self._validate_postparsing_callable(func)
         self._postparsing_hooks.append(func)
+        self._update_hook_stages()
 
     CommandDataType = TypeVar("CommandDataType")
 
@@ -5955,11 +7432,13 @@ class Cmd:
         """Register a hook to be called before the command function."""
         self._validate_prepostcmd_hook(func, plugin.PrecommandData)
         self._precmd_hooks.append(func)
+        self._update_hook_stages()
 
     def register_postcmd_hook(self, func: Callable[[plugin.PostcommandData], plugin.PostcommandData]) -> None:
         """Register a hook to be called after the command function."""
         self._validate_prepostcmd_hook(func, plugin.PostcommandData)
         self._postcmd_hooks.append(func)
+        self._update_hook_stages()
 
     @classmethod
     def _validate_cmdfinalization_callable(
@@ -5984,6 +7463,7 @@ class Cmd:
         """Register a hook to be called after a command is completed, whether it completes successfully or not."""
         self._validate_cmdfinalization_callable(func)
         self._cmdfinalization_hooks.append(func)
+        self._update_hook_stages()
 
     def _resolve_func_self(
         self,
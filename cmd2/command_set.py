@@ -1,7 +1,12 @@
 """Supports the definition of commands in separate classes to be composed into cmd2.Cmd."""
 
 from collections.abc import Mapping
+from dataclasses import (
+    dataclass,
+    field,
+)
 from typing import (
+    Any,
     ClassVar,
     Generic,
 )
@@ -135,3 +140,52 @@ class CommandSet(Generic[CmdT]):
                  False to raise a KeyboardInterrupt.
         """
         return False
+
+
+@dataclass(frozen=True)
+class LazyCommandSet:
+    """Declares a CommandSet whose module isn't imported until one of its commands is needed.
+
+    Register it with [cmd2.Cmd.register_lazy_command_set][] or pass it to the ``command_sets`` parameter
+    of [cmd2.Cmd][]. Its commands are listed by ``help`` and completed by name using only what is declared
+    here. The CommandSet is imported, created with no arguments, and registered the first time one of its
+    commands is run, has its arguments completed, or is looked up with ``help <command>``.
+    """
+
+    # Where to import the CommandSet class from, written as "package.module:ClassName"
+    path: str
+
+    # Names of the commands the CommandSet defines, mapped to the summary help shows for each one
+    commands: Mapping[str, str]
+
+    # Help category of the commands
+    category: str = CommandSet.DEFAULT_CATEGORY
+
+    # Help categories of individual commands which aren't in the category above
+    categories: Mapping[str, str] = field(default_factory=dict)
+
+    def category_of(self, command: str) -> str:
+        """Return the help category of one of the declared commands.
+
+        :param command: name of the command
+        """
+        return self.categories.get(command, self.category)
+
+    def load(self) -> CommandSet[Any]:
+        """Import the CommandSet class and create an instance of it.
+
+        :return: the new CommandSet
+        :raises CommandSetRegistrationError: if path doesn't name a CommandSet class
+        :raises ImportError: if the CommandSet's module can't be imported
+        """
+        module_name, sep, class_name = self.path.partition(":")
+        if not sep or not module_name or not class_name:
+            raise CommandSetRegistrationError(f"Lazy CommandSet path '{self.path}' is not in the form 'module:ClassName'")
+
+        import importlib
+
+        module = importlib.import_module(module_name)
+        cmdset_type = getattr(module, class_name, None)
+        if not isinstance(cmdset_type, type) or not issubclass(cmdset_type, CommandSet):
+            raise CommandSetRegistrationError(f"'{self.path}' is not a CommandSet class")
+        return cmdset_type()
@@ -2,7 +2,11 @@
 
 import copy
 import re
+import threading
+import time
 from collections.abc import (
+    Callable,
+    Hashable,
     Iterable,
     Iterator,
     Sequence,
@@ -12,6 +16,7 @@ from dataclasses import (
     field,
 )
 from typing import (
+    TYPE_CHECKING,
     Any,
     Self,
     cast,
@@ -23,6 +28,10 @@ from rich.table import Table
 
 from . import rich_utils as ru
 from . import string_utils as su
+from .exceptions import CompletionError
+
+if TYPE_CHECKING:  # pragma: no cover
+    import concurrent.futures
 
 
 class _UnsetStr(str):
@@ -110,6 +119,11 @@ class CompletionItem:
         object.__setattr__(self, "display_plain", su.strip_style(self.display))
         object.__setattr__(self, "display_meta_plain", su.strip_style(self.display_meta))
 
+        # Most items have no table data, so skip preparing it for rendering
+        if not self.table_data:
+            object.__setattr__(self, "table_data", ())
+            return
+
         # Make sure all table data objects are renderable by a Rich table.
         renderable_data = [obj if is_renderable(obj) else str(obj) for obj in self.table_data]
 
@@ -305,3 +319,178 @@ class Completions(CompletionResultsBase):
 
     # The quote character to use if adding an opening or closing quote to the matches.
     _quote_char: str = ""
+
+
+class ChoicesCache:
+    """Caches the matches of the argument being completed so they can be narrowed as the user keeps typing.
+
+    When prompt-toolkit completes while the user types, each keystroke runs completion again. As long as
+    the user is extending the same token, its matches are a subset of the previous ones. So instead of
+    calling a choices provider again, the previous matches are filtered.
+
+    Only one argument is cached at a time. Its entry is replaced when completion moves to a different
+    argument or the token's start moves, and it is ignored once it is older than the time to live or the
+    text being completed no longer extends the cached text.
+
+    This class is thread-safe.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._lock = threading.Lock()
+        self._key: Hashable = None
+        self._text = ""
+        self._items: Sequence[CompletionItem] = ()
+        self._time = 0.0
+
+    def get(self, key: Hashable, text: str, ttl: float) -> Sequence[CompletionItem] | None:
+        """Get the cached matches for an argument.
+
+        :param key: identifies the argument being completed and everything on the line before it
+        :param text: the text being completed
+        :param ttl: maximum age in seconds of the cached matches
+        :return: the matches of a previous completion of this argument, which are a superset of the matches
+                 for text, or None if nothing usable is cached
+        """
+        with self._lock:
+            if key is None or key != self._key or not text.startswith(self._text):
+                return None
+            if time.monotonic() - self._time >= ttl:
+                return None
+            return self._items
+
+    def store(self, key: Hashable, text: str, items: Sequence[CompletionItem]) -> None:
+        """Cache the matches for an argument, replacing what was cached.
+
+        :param key: identifies the argument being completed and everything on the line before it
+        :param text: the text which was completed
+        :param items: the matches for text
+        """
+        with self._lock:
+            self._key = key
+            self._text = text
+            self._items = items
+            self._time = time.monotonic()
+
+    def narrow(self, key: Hashable, text: str, items: Sequence[CompletionItem]) -> None:
+        """Replace the cached matches for an argument with the matches for a longer text.
+
+        Unlike store(), this keeps the time the matches were first cached, so they still expire.
+
+        :param key: identifies the argument being completed and everything on the line before it
+        :param text: the text which was completed, which extends the cached text
+        :param items: the matches for text
+        """
+        with self._lock:
+            if key == self._key and text.startswith(self._text):
+                self._text = text
+                self._items = items
+
+    def clear(self) -> None:
+        """Remove what is cached."""
+        self.store(None, "", ())
+
+
+class _CompletionCancelledError(CompletionError):
+    """Raised when a completion is cancelled because a newer one superseded it.
+
+    Its message is blank, so nothing is displayed.
+    """
+
+    def __init__(self) -> None:
+        """Initialize _CompletionCancelledError instance."""
+        super().__init__("")
+
+
+class CompletionRequest:
+    """A completion which is waiting for asynchronous choices providers and completers.
+
+    prompt-toolkit starts a new completion whenever the user changes what they typed, while an earlier
+    one may still be waiting for a slow provider. Cancelling the earlier request stops it from waiting,
+    cancels what it was waiting for, and tells the caller to discard its stale result.
+
+    This class is thread-safe.
+    """
+
+    # How long, in seconds, to wait for a result before calling on_loading
+    LOADING_HINT_DELAY = 0.25
+
+    # How often, in seconds, a waiting request checks whether it was cancelled or timed out
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, on_loading: Callable[[], None] | None = None) -> None:
+        """CompletionRequest initializer.
+
+        :param on_loading: optional function called once if waiting for a result takes longer than
+                           LOADING_HINT_DELAY, which can show the user that results are on the way
+        """
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._futures: set[concurrent.futures.Future[Any]] = set()
+        self._on_loading = on_loading
+        self._loading_shown = False
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the request was cancelled."""
+        return self._cancelled
+
+    def cancel(self) -> None:
+        """Cancel the request and the futures it is waiting for."""
+        with self._lock:
+            self._cancelled = True
+            futures = list(self._futures)
+
+        for future in futures:
+            future.cancel()
+
+    def wait(self, future: "concurrent.futures.Future[Any]", timeout: float | None = None) -> Any:
+        """Wait for the result of a choices provider or completer.
+
+        :param future: future which will hold the result
+        :param timeout: maximum time in seconds to wait, or None to wait until the result is ready
+        :return: the future's result
+        :raises CompletionError: if the timeout expires first, after cancelling the future, or if the
+                                 choices provider or completer raises TimeoutError
+        :raises _CompletionCancelledError: if the request is cancelled first
+        """
+        import concurrent.futures
+
+        with self._lock:
+            if self._cancelled:
+                future.cancel()
+                raise _CompletionCancelledError
+            self._futures.add(future)
+
+        start = time.monotonic()
+        try:
+            # Wait without calling result() until the future is done, since the provider may raise a
+            # TimeoutError of its own which result() couldn't be told apart from the wait timing out
+            while not future.done():
+                concurrent.futures.wait([future], self.POLL_INTERVAL)
+                if future.done():
+                    break
+
+                if self.cancelled:
+                    future.cancel()
+                    raise _CompletionCancelledError
+
+                elapsed = time.monotonic() - start
+                if timeout is not None and elapsed >= timeout:
+                    future.cancel()
+                    raise CompletionError(f"Timed out after {timeout:g} seconds waiting for results")
+
+                if self._on_loading is not None and not self._loading_shown and elapsed >= self.LOADING_HINT_DELAY:
+                    self._loading_shown = True
+                    self._on_loading()
+
+            if future.cancelled():
+                raise _CompletionCancelledError
+
+            try:
+                return future.result()
+            except TimeoutError as ex:
+                raise CompletionError("Timed out waiting for results") from ex
+        finally:
+            with self._lock:
+                self._futures.discard(future)
@@ -14,6 +14,7 @@ REDIRECTION_CHARS = (REDIRECTION_PIPE, REDIRECTION_OVERWRITE)
 REDIRECTION_TOKENS = (REDIRECTION_PIPE, REDIRECTION_OVERWRITE, REDIRECTION_APPEND)
 COMMENT_CHAR = "#"
 MULTILINE_TERMINATOR = ";"
+BACKGROUND_JOB = "&"
 
 LINE_FEED = "\n"
 
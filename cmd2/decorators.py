@@ -4,6 +4,7 @@ import argparse
 import functools
 from collections.abc import (
     Callable,
+    Coroutine,
     Sequence,
 )
 from typing import (
@@ -26,10 +27,11 @@ from .argparse_utils import (
 from .command_set import CommandSet
 from .exceptions import Cmd2ArgparseError
 from .parsing import Statement
-from .types import (
-    CmdOrSetT,
-    UnboundCommandFunc,
+from .timing import (
+    PHASE_ARGPARSE,
+    PHASE_COMMAND,
 )
+from .types import CmdOrSetT
 
 if TYPE_CHECKING:  # pragma: no cover
     from .cmd2 import Cmd
@@ -114,21 +116,25 @@ def _arg_swap(args: Sequence[Any], search_arg: Any, *replace_arg: Any) -> list[A
     return args_list
 
 
+# What a decorated command function returns. An async command function returns a coroutine, and
+# the function a decorator returns is async if the function it decorates is.
+CommandResultT = TypeVar("CommandResultT", bound=bool | Coroutine[Any, Any, bool | None] | None)
+
 # The standard cmd2 command function signature (e.g. do_command(self, statement))
-RawCommandFunc: TypeAlias = UnboundCommandFunc[CmdOrSetT, [Statement | str]]
+RawCommandFunc: TypeAlias = Callable[[CmdOrSetT, Statement | str], CommandResultT]
 
 
 # Function signature for a command function that accepts a pre-processed argument list from user input
-ArgListCommandFunc: TypeAlias = UnboundCommandFunc[CmdOrSetT, [list[str]]]
+ArgListCommandFunc: TypeAlias = Callable[[CmdOrSetT, list[str]], CommandResultT]
 
 
 # Overload for: @with_argument_list
 @overload
 def with_argument_list(
-    cmd_func: ArgListCommandFunc[CmdOrSetT],
+    cmd_func: ArgListCommandFunc[CmdOrSetT, CommandResultT],
     *,
     preserve_quotes: bool = False,
-) -> RawCommandFunc[CmdOrSetT]: ...
+) -> RawCommandFunc[CmdOrSetT, CommandResultT]: ...
 
 
 # Overload for: @with_argument_list(preserve_quotes=True)
@@ -137,14 +143,17 @@ def with_argument_list(
     cmd_func: None = None,
     *,
     preserve_quotes: bool = False,
-) -> Callable[[ArgListCommandFunc[CmdOrSetT]], RawCommandFunc[CmdOrSetT]]: ...
+) -> Callable[[ArgListCommandFunc[CmdOrSetT, CommandResultT]], RawCommandFunc[CmdOrSetT, CommandResultT]]: ...
 
 
 def with_argument_list(
-    cmd_func: ArgListCommandFunc[CmdOrSetT] | None = None,
+    cmd_func: ArgListCommandFunc[CmdOrSetT, CommandResultT] | None = None,
     *,
     preserve_quotes: bool = False,
-) -> RawCommandFunc[CmdOrSetT] | Callable[[ArgListCommandFunc[CmdOrSetT]], RawCommandFunc[CmdOrSetT]]:
+) -> (
+    RawCommandFunc[CmdOrSetT, CommandResultT]
+    | Callable[[ArgListCommandFunc[CmdOrSetT, CommandResultT]], RawCommandFunc[CmdOrSetT, CommandResultT]]
+):
     """Decorate a ``do_*`` command function to receive a list of parsed arguments.
 
     This decorator can be used either directly (``@with_argument_list``) or as a
@@ -170,7 +179,7 @@ def with_argument_list(
 
     """
 
-    def arg_decorator(func: ArgListCommandFunc[CmdOrSetT]) -> RawCommandFunc[CmdOrSetT]:
+    def arg_decorator(func: ArgListCommandFunc[CmdOrSetT, CommandResultT]) -> RawCommandFunc[CmdOrSetT, CommandResultT]:
         """Decorate function that ingests an Argument List function and returns a raw command function.
 
         The returned function will process the raw input into an argument list to be passed to the wrapped function.
@@ -180,7 +189,7 @@ def with_argument_list(
         """
 
         @functools.wraps(func)
-        def cmd_wrapper(*args: Any, **kwargs: Any) -> bool | None:
+        def cmd_wrapper(*args: Any, **kwargs: Any) -> CommandResultT:
             """Command function wrapper which translates command line into an argument list and calls actual command function.
 
             :param args: All positional arguments to this function.  We're expecting there to be:
@@ -206,9 +215,9 @@ def with_argument_list(
 # Function signatures for command functions that use a Cmd2ArgumentParser to process user input
 ArgparseCommandFunc: TypeAlias = (
     # (self, args: argparse.Namespace)
-    UnboundCommandFunc[CmdOrSetT, [argparse.Namespace]]
+    Callable[[CmdOrSetT, argparse.Namespace], CommandResultT]
     # (self, args: argparse.Namespace, unknown_args: list[str])
-    | UnboundCommandFunc[CmdOrSetT, [argparse.Namespace, list[str]]]
+    | Callable[[CmdOrSetT, argparse.Namespace, list[str]], CommandResultT]
 )
 
 
@@ -220,7 +229,7 @@ def with_argparser(
     ns_provider: Callable[..., argparse.Namespace] | None = None,
     preserve_quotes: bool = False,
     with_unknown_args: bool = False,
-) -> Callable[[ArgparseCommandFunc[CmdOrSetT]], RawCommandFunc[CmdOrSetT]]: ...
+) -> Callable[[ArgparseCommandFunc[CmdOrSetT, CommandResultT]], RawCommandFunc[CmdOrSetT, CommandResultT]]: ...
 
 
 # Overload for: factory with no arguments (including staticmethod)
@@ -231,7 +240,7 @@ def with_argparser(
     ns_provider: Callable[..., argparse.Namespace] | None = None,
     preserve_quotes: bool = False,
     with_unknown_args: bool = False,
-) -> Callable[[ArgparseCommandFunc[CmdOrSetT]], RawCommandFunc[CmdOrSetT]]: ...
+) -> Callable[[ArgparseCommandFunc[CmdOrSetT, CommandResultT]], RawCommandFunc[CmdOrSetT, CommandResultT]]: ...
 
 
 # Overload for: factory with a class argument (including classmethod)
@@ -242,7 +251,7 @@ def with_argparser(
     ns_provider: Callable[..., argparse.Namespace] | None = None,
     preserve_quotes: bool = False,
     with_unknown_args: bool = False,
-) -> Callable[[ArgparseCommandFunc[CmdOrSetT]], RawCommandFunc[CmdOrSetT]]: ...
+) -> Callable[[ArgparseCommandFunc[CmdOrSetT, CommandResultT]], RawCommandFunc[CmdOrSetT, CommandResultT]]: ...
 
 
 def with_argparser(
@@ -251,7 +260,7 @@ def with_argparser(
     ns_provider: Callable[..., argparse.Namespace] | None = None,
     preserve_quotes: bool = False,
     with_unknown_args: bool = False,
-) -> Callable[[ArgparseCommandFunc[CmdOrSetT]], RawCommandFunc[CmdOrSetT]]:
+) -> Callable[[ArgparseCommandFunc[CmdOrSetT, CommandResultT]], RawCommandFunc[CmdOrSetT, CommandResultT]]:
     """Decorate a ``do_*`` command function to populate its ``args`` argument with a Cmd2ArgumentParser.
 
     :param parser_source: an existing Cmd2ArgumentParser instance or a factory
@@ -301,7 +310,7 @@ def with_argparser(
 
     """
 
-    def arg_decorator(func: ArgparseCommandFunc[CmdOrSetT]) -> RawCommandFunc[CmdOrSetT]:
+    def arg_decorator(func: ArgparseCommandFunc[CmdOrSetT, CommandResultT]) -> RawCommandFunc[CmdOrSetT, CommandResultT]:
         """Decorate function that ingests an Argparse Command Function and returns a raw command function.
 
         The returned function will process the raw input into an argparse Namespace to be passed to the wrapped function.
@@ -311,7 +320,7 @@ def with_argparser(
         """
 
         @functools.wraps(func)
-        def cmd_wrapper(*args: Any, **kwargs: Any) -> bool | None:
+        def cmd_wrapper(*args: Any, **kwargs: Any) -> CommandResultT:
             """Command function wrapper which translates command line into argparse Namespace and call actual command function.
 
             :param args: All positional arguments to this function.  We're expecting there to be:
@@ -341,6 +350,10 @@ def with_argparser(
                 provider_self = cmd_app._resolve_func_self(ns_provider, args[0])
                 initial_namespace = ns_provider(provider_self if provider_self is not None else cmd_app)
 
+            timing = cmd_app.command_timing
+            if timing is not None:
+                timing.mark(PHASE_COMMAND)
+
             try:
                 parsing_results: tuple[argparse.Namespace] | tuple[argparse.Namespace, list[str]]
                 with arg_parser.output_to(cmd_app.stdout):
@@ -350,6 +363,9 @@ def with_argparser(
                         parsing_results = (arg_parser.parse_args(command_arg_list, initial_namespace),)
             except SystemExit as exc:
                 raise Cmd2ArgparseError from exc
+            finally:
+                if timing is not None:
+                    timing.mark(PHASE_ARGPARSE)
 
             # Add cmd2-specific attributes to the Namespace
             parsed_namespace = parsing_results[0]
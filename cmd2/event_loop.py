@@ -0,0 +1,179 @@
+"""An asyncio event loop running in a thread, which lets synchronous code like cmd2's command loop run coroutines."""
+
+import inspect
+import threading
+from collections.abc import (
+    Awaitable,
+    Coroutine,
+)
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    TypeVar,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    import asyncio
+    import concurrent.futures
+
+T = TypeVar("T")
+
+
+class EventLoopThread:
+    """An asyncio event loop which runs forever in a daemon thread.
+
+    The thread isn't started until the loop is first needed, so applications without coroutines
+    don't pay for it. Coroutines run by different threads, such as background jobs, share the
+    loop and run concurrently on it.
+    """
+
+    # How often, in seconds, a thread waiting for a coroutine checks whether it should stop waiting,
+    # like when a background job's coroutine is cancelled by the kill command
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, name: str = "cmd2-event-loop") -> None:
+        """EventLoopThread initializer.
+
+        :param name: name of the thread which runs the loop
+        """
+        self.name = name
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        """Whether the loop's thread was started and hasn't been closed."""
+        return self._loop is not None
+
+    def get_loop(self) -> "asyncio.AbstractEventLoop":
+        """Get the event loop, starting it if it isn't running."""
+        # Imported here since asyncio is slow to import and most applications never start the loop
+        import asyncio
+
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._run_loop, args=(loop,), name=self.name, daemon=True)
+                self._thread.start()
+                self._loop = loop
+            return self._loop
+
+    @staticmethod
+    def _run_loop(loop: "asyncio.AbstractEventLoop") -> None:
+        """Run the loop until it is stopped. This is the target of the loop's thread."""
+        import asyncio
+
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+    def run(self, coro: Coroutine[Any, Any, T], *, cancel_event: threading.Event | None = None) -> T:
+        """Run a coroutine on the loop and wait for its result.
+
+        If waiting is interrupted by a KeyboardInterrupt, like the one raised when Ctrl-C is pressed,
+        the coroutine is cancelled and the KeyboardInterrupt is raised again once the coroutine has
+        handled the cancellation. Pressing Ctrl-C again stops waiting for it to do so.
+
+        :param coro: the coroutine to run
+        :param cancel_event: optional event which cancels the coroutine when it's set
+        :return: the coroutine's result
+        :raises RuntimeError: if called from the loop's own thread, where waiting would deadlock.
+                              Coroutines should await other coroutines instead.
+        :raises concurrent.futures.CancelledError: if cancel_event was set before the coroutine finished.
+                                                   This is raised once the coroutine has handled the
+                                                   cancellation.
+        """
+        import asyncio
+        import concurrent.futures
+
+        loop = self.get_loop()
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("A coroutine can't be run and waited for from the event loop's thread")
+
+        started = threading.Event()
+        finished = threading.Event()
+
+        async def track() -> T:
+            started.set()
+            try:
+                return await coro
+            finally:
+                finished.set()
+
+        future: concurrent.futures.Future[T] | None = None
+        try:
+            future = asyncio.run_coroutine_threadsafe(track(), loop)
+
+            # Wait without calling result() until the future is done, since the coroutine may raise a
+            # TimeoutError of its own which result() couldn't be told apart from the wait timing out
+            while not future.done():
+                if cancel_event is not None and cancel_event.is_set() and future.cancel():
+                    if started.is_set():
+                        finished.wait()
+                    break
+                concurrent.futures.wait([future], self.POLL_INTERVAL)
+            return future.result()
+        except KeyboardInterrupt:
+            if future is not None:
+                future.cancel()
+
+            # A coroutine which never started has nothing to clean up
+            if started.is_set():
+                finished.wait()
+            raise
+
+    def submit(self, awaitable: Awaitable[T]) -> "concurrent.futures.Future[T]":
+        """Schedule an awaitable to run on the loop without waiting for it.
+
+        Cancelling the returned future cancels the awaitable.
+
+        :param awaitable: a coroutine, or any other awaitable which can be awaited on the loop, like a task or
+                          future created by the loop
+        :return: a future which holds the awaitable's result once it's done
+        :raises RuntimeError: if called from the loop's own thread, where the caller should await instead
+        """
+        import asyncio
+
+        loop = self.get_loop()
+        if threading.current_thread() is self._thread:
+            if inspect.iscoroutine(awaitable):
+                awaitable.close()
+            raise RuntimeError("An awaitable can't be submitted from the event loop's thread")
+
+        async def wrap() -> T:
+            return await awaitable
+
+        coro = awaitable if inspect.iscoroutine(awaitable) else wrap()
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+
+    def close(self) -> None:
+        """Cancel the coroutines still running on the loop, then stop the loop and its thread.
+
+        The loop is started again if it's needed after this.
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+
+        if loop is None or thread is None:
+            return
+
+        import asyncio
+
+        async def shutdown() -> None:
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await loop.shutdown_asyncgens()
+            await loop.shutdown_default_executor()
+
+        if thread is not threading.current_thread():
+            asyncio.run_coroutine_threadsafe(shutdown(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+        else:
+            # The loop can't wait for itself, so it closes once it has stopped
+            loop.call_soon(loop.stop)
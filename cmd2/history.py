@@ -144,8 +144,10 @@ class History(list[HistoryItem]):
     class to gain access to the historical record.
     """
 
-    # Used in JSON dictionaries
-    _history_version = "4.0.0"
+    # Used in JSON dictionaries. In the current version, each history item is stored as the flat list
+    # of its statement's fields from Statement.to_tuple(). The legacy version stored dictionaries.
+    _history_version = "4.2.0"
+    _legacy_history_version = "4.0.0"
     _history_version_field = "history_version"
     _history_items_field = "history_items"
 
@@ -343,9 +345,9 @@ class History(list[HistoryItem]):
         """Convert this History into a JSON string for use in persistent history files."""
         json_dict = {
             History._history_version_field: History._history_version,
-            History._history_items_field: [hi.to_dict() for hi in self],
+            History._history_items_field: [hi.statement.to_tuple() for hi in self],
         }
-        return json.dumps(json_dict, ensure_ascii=False, indent=2)
+        return json.dumps(json_dict, ensure_ascii=False, separators=(",", ":"))
 
     @staticmethod
     def from_json(history_json: str) -> "History":
@@ -355,18 +357,22 @@ class History(list[HistoryItem]):
         :return: History object
         :raises json.JSONDecodeError: if passed invalid JSON string
         :raises KeyError: if JSON is missing required elements
-        :raises ValueError: if history version in JSON isn't supported
+        :raises ValueError: if history version in JSON isn't supported or a history item has the wrong number of fields
         """
         json_dict = json.loads(history_json)
         version = json_dict[History._history_version_field]
-        if version != History._history_version:
+        if version not in (History._history_version, History._legacy_history_version):
             raise ValueError(
                 f"Unsupported history file version: {version}. This application uses version {History._history_version}."
             )
 
         items = json_dict[History._history_items_field]
         history = History()
-        for hi_dict in items:
-            history.append(HistoryItem.from_dict(hi_dict))
+        if version == History._legacy_history_version:
+            for hi_dict in items:
+                history.append(HistoryItem.from_dict(hi_dict))
+        else:
+            for values in items:
+                history.append(HistoryItem(Statement.from_tuple(values)))
 
         return history
@@ -0,0 +1,166 @@
+"""Classes for running commands as background jobs."""
+
+import threading
+import time
+from collections.abc import (
+    Callable,
+    Iterator,
+)
+from contextlib import contextmanager
+from typing import TextIO
+
+from . import utils
+from .parsing import Statement
+
+# Values of Job.status
+JOB_RUNNING = "Running"
+JOB_CANCELLING = "Cancelling"
+JOB_DONE = "Done"
+JOB_CANCELLED = "Cancelled"
+
+
+class JobOutput(utils.StdSim):
+    """A background job's stdout and stderr.
+
+    Output is stored until it is shown. While the job is in the foreground, output is written straight
+    through to a stream instead.
+    """
+
+    def __init__(self, inner_stream: TextIO) -> None:
+        """JobOutput initializer.
+
+        :param inner_stream: the stream the job was started from, which supplies attributes like encoding
+        """
+        super().__init__(inner_stream)
+        self._lock = threading.Lock()
+
+    def write(self, s: str) -> None:
+        """Store s, or write it to the foreground stream.
+
+        :param s: String to write to the stream
+        """
+        with self._lock:
+            super().write(s)
+
+    def read(self, size: int | None = -1) -> str:
+        """Read from the stored output and then clear what was read.
+
+        :param size: Number of bytes to read from the stream
+        """
+        with self._lock:
+            return super().read(size)
+
+    @contextmanager
+    def foreground(self, stream: TextIO) -> Iterator[None]:
+        """Write output straight through to a stream instead of storing it.
+
+        Output which was already stored is written to the stream first.
+
+        :param stream: the stream to write output to
+        """
+        with self._lock:
+            stream.write(super().read())
+            self.inner_stream = stream
+            self.echo = True
+            self.pause_storage = True
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.echo = False
+                self.pause_storage = False
+
+
+class Job:
+    """A command running in a background thread, which was started by ending its command line with &."""
+
+    def __init__(self, job_id: int, statement: Statement, output: JobOutput) -> None:
+        """Job initializer.
+
+        :param job_id: number which identifies the job in commands like fg and kill
+        :param statement: the command being run, without its background field set
+        :param output: stores the job's stdout and stderr
+        """
+        self.id = job_id
+        self.statement = statement
+        self.output = output
+        self.status = JOB_RUNNING
+
+        # The value the command returned to indicate whether the application should stop
+        self.stop = False
+
+        self.start_time = time.monotonic()
+        self.end_time: float | None = None
+
+        # True while a command like fg or wait is showing this job's output and status. Otherwise,
+        # they are shown in an alert when the job finishes.
+        self.watched = False
+
+        self.thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._finished = threading.Event()
+
+        # Set when the job is asked to stop. Its command checks this with Cmd.job_cancelled(), and
+        # a coroutine the job is waiting for is cancelled.
+        self.cancel_event = threading.Event()
+
+    @property
+    def line(self) -> str:
+        """The command line being run."""
+        return self.statement.expanded_command_line
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds the job has been running, or ran for if it finished."""
+        end_time = self.end_time if self.end_time is not None else time.monotonic()
+        return end_time - self.start_time
+
+    @property
+    def done(self) -> bool:
+        """Whether the job finished."""
+        return self._finished.is_set()
+
+    def start(self, run: Callable[["Job"], bool], on_finish: Callable[["Job"], None]) -> None:
+        """Start running the job in a daemon thread.
+
+        :param run: function which runs the job's command in its thread and returns whether the
+                    application should stop
+        :param on_finish: function called from the job's thread once the job finished
+        """
+        self.thread = threading.Thread(target=self._run, args=(run, on_finish), name=f"cmd2-job-{self.id}", daemon=True)
+        self.thread.start()
+
+    def _run(self, run: Callable[["Job"], bool], on_finish: Callable[["Job"], None]) -> None:
+        """Run the job. This is the target of the job's thread."""
+        try:
+            self.stop = run(self)
+        finally:
+            with self._lock:
+                self.status = JOB_CANCELLED if self.cancel_event.is_set() else JOB_DONE
+            self.end_time = time.monotonic()
+            self._finished.set()
+        on_finish(self)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Wait for the job to finish.
+
+        :param timeout: maximum seconds to wait or None to wait until the job finishes
+        :return: whether the job finished
+        """
+        return self._finished.wait(timeout)
+
+    def cancel(self) -> bool:
+        """Ask the job to stop.
+
+        Stopping is cooperative. A command run as a job checks Cmd.job_cancelled() and returns early
+        when it's True. A coroutine which the job's command is waiting for, like the one an async
+        command returns, is cancelled on the event loop. A command which does neither finishes normally.
+
+        :return: False if the job already finished or was already asked to stop
+        """
+        with self._lock:
+            if self.status != JOB_RUNNING:
+                return False
+            self.status = JOB_CANCELLING
+            self.cancel_event.set()
+            return True
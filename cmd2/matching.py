@@ -0,0 +1,285 @@
+"""Matchers decide which candidates match the text being completed and in what order.
+
+cmd2 completes argument values by prefix unless told otherwise. To match them another way, set
+``Cmd.completion_matcher`` for the whole application or pass ``completion_matcher`` to
+``add_argument()`` for a single argument.
+
+Example::
+
+    # Complete this argument's values by fuzzy matching, best matches first
+    parser.add_argument("host", choices_provider=get_hosts, completion_matcher=FuzzyMatcher())
+"""
+
+import heapq
+import re
+from abc import (
+    ABC,
+    abstractmethod,
+)
+from collections.abc import (
+    Iterable,
+    Iterator,
+    Sequence,
+)
+from typing import TypeVar
+
+from .completion import CompletionItem
+
+# A candidate is a string or a CompletionItem, which is matched by its text
+CandidateT = TypeVar("CandidateT", bound=str | CompletionItem)
+
+
+def _text(candidate: str | CompletionItem) -> str:
+    """Get the text of a candidate."""
+    return candidate.text if isinstance(candidate, CompletionItem) else candidate
+
+
+class _FoldedTexts:
+    """The case-folded texts of candidates, joined into one string with a line for each candidate.
+
+    This lets a regular expression search all of the candidates at once instead of one at a time.
+    The texts of the last tuple of candidates are kept, so completing the same choices again as the
+    user types doesn't fold them again. A Choices object's items are such a tuple.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._cached: tuple[Sequence[str | CompletionItem], str] | None = None
+
+    def get(self, candidates: Sequence[str | CompletionItem]) -> str:
+        """Get the case-folded texts of candidates.
+
+        :param candidates: the candidates
+        :return: their case-folded texts, each preceded by a newline. Newlines in the texts are replaced by spaces.
+        """
+        cached = self._cached
+        if cached is not None and cached[0] is candidates:
+            return cached[1]
+
+        texts = [_text(candidate) for candidate in candidates]
+        folded = "\n".join(["", *texts]).casefold()
+        if folded.count("\n") != len(texts):
+            folded = "\n".join(["", *(text.replace("\n", " ") for text in texts)]).casefold()
+
+        # Only immutable sequences can be cached, since the texts of a list could change
+        if isinstance(candidates, tuple):
+            self._cached = (candidates, folded)
+        return folded
+
+
+def _matching_lines(regex: "re.Pattern[str]", folded: str) -> Iterator[tuple[int, str]]:
+    """Search the lines of folded texts for a regular expression.
+
+    :param regex: regular expression from _prefix_regex() or _subsequence_regex()
+    :param folded: texts from _FoldedTexts
+    :return: the index and text of each line which contains a match
+    """
+    index = -1
+    counted = 0
+    for match in regex.finditer(folded):
+        # Each match runs to the end of its line, so a line never matches twice
+        end = match.end()
+        start = folded.rfind("\n", 0, end - 1) + 1
+        index += folded.count("\n", counted, start)
+        counted = start
+        yield index, folded[start:end]
+
+
+def _prefix_regex(pattern: str) -> "re.Pattern[str]":
+    """Build a regular expression which finds lines of folded texts that start with a case-folded pattern."""
+    return re.compile(re.escape("\n" + pattern) + "[^\n]*")
+
+
+def _subsequence_regex(pattern: str) -> "re.Pattern[str]":
+    """Build a regular expression which finds lines of folded texts that contain a case-folded pattern's characters in order.
+
+    Each character is followed by any characters other than a newline or the next character. So there is only
+    one way to match from each starting point and nothing to backtrack.
+    """
+    escaped = [re.escape(char) for char in pattern]
+    return re.compile(escaped[0] + "".join(f"[^\n{char}]*{char}" for char in escaped[1:]) + "[^\n]*")
+
+
+class Matcher(ABC):
+    """Base class for matchers.
+
+    Subclasses implement match(). If they order matches by how well they match, they also override
+    ranks() so the matches aren't sorted afterwards.
+    """
+
+    @property
+    def narrowable(self) -> bool:
+        """Whether the matches for a text are always among the matches for any shorter text it starts with.
+
+        When this is True, cmd2 filters the earlier matches as the user keeps typing an argument instead
+        of matching against all of its choices again.
+        """
+        return True
+
+    def ranks(self, text: str) -> bool:  # noqa: ARG002
+        """Whether match() returns the matches for text in order of how well they match.
+
+        :param text: the text being completed
+        :return: True if the matches are ranked, False if they should be sorted like other completions
+        """
+        return False
+
+    @abstractmethod
+    def match(self, text: str, candidates: Iterable[CandidateT]) -> list[CandidateT]:
+        """Find the candidates which match the text being completed.
+
+        :param text: the text being completed
+        :param candidates: the candidates, which are strings or CompletionItems matched by their text
+        :return: the matching candidates, in order of rank if ranks() is True for text
+        """
+
+
+class PrefixMatcher(Matcher):
+    """Matches candidates which start with the text being completed. This is cmd2's default."""
+
+    def match(self, text: str, candidates: Iterable[CandidateT]) -> list[CandidateT]:
+        """Find the candidates which start with text."""
+        return [candidate for candidate in candidates if _text(candidate).startswith(text)]
+
+
+class CaseInsensitiveMatcher(Matcher):
+    """Matches candidates which start with the text being completed, ignoring case."""
+
+    def __init__(self) -> None:
+        """CaseInsensitiveMatcher initializer."""
+        self._folded_texts = _FoldedTexts()
+
+    def match(self, text: str, candidates: Iterable[CandidateT]) -> list[CandidateT]:
+        """Find the candidates which start with text, ignoring case."""
+        candidates = candidates if isinstance(candidates, Sequence) else list(candidates)
+        if not text:
+            return list(candidates)
+
+        regex = _prefix_regex(text.casefold())
+        return [candidates[index] for index, _ in _matching_lines(regex, self._folded_texts.get(candidates))]
+
+
+class FuzzyMatcher(Matcher):
+    """Matches candidates which contain the characters of the text being completed in order, ignoring case.
+
+    Each match is scored, and matches are returned best first. Candidates which start with the text
+    score highest, followed by candidates where the characters are close together, at the start of
+    words, or both. Matches with equal scores are ordered shortest first, then in their original order.
+
+    With thousands of candidates, most of them match a short text, which makes the menu hard to use.
+    Pass a limit to only return the best matches. Once enough candidates start with the text, the
+    others aren't scored at all, since they can't outrank them.
+    """
+
+    # Points for each matched character
+    SCORE_MATCH = 16
+
+    # Bonus for matching the first character of the candidate
+    BONUS_START = 32
+
+    # Bonus for a character which directly follows the previous matched character
+    BONUS_CONSECUTIVE = 16
+
+    # Bonus for matching the start of a word within the candidate, like the "b" in "a-b" or "a.b".
+    # It's smaller than BONUS_CONSECUTIVE, so a candidate which starts with the text always outranks
+    # one which doesn't.
+    BONUS_WORD_START = 8
+
+    # Penalty for each unmatched character between the first and last matched characters
+    PENALTY_GAP = 1
+
+    def __init__(self, limit: int | None = None) -> None:
+        """FuzzyMatcher initializer.
+
+        :param limit: maximum number of matches to return, or None to return all of them
+        :raises ValueError: if limit is less than 1
+        """
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be at least 1")
+        self.limit = limit
+        self._folded_texts = _FoldedTexts()
+
+    @property
+    def narrowable(self) -> bool:
+        """Whether the matches for a text are always among the matches for any shorter text it starts with.
+
+        This is only True without a limit, since a candidate left out of the best matches for a
+        shorter text may be among the best matches for a longer one.
+        """
+        return self.limit is None
+
+    def ranks(self, text: str) -> bool:
+        """Whether match() ranks the matches for text. Everything matches an empty text, so it isn't ranked."""
+        return bool(text)
+
+    def _score_folded(self, pattern: str, folded: str) -> int | None:
+        """Score a case-folded candidate against a case-folded pattern.
+
+        :return: the score, or None if the candidate doesn't match
+        """
+        # Find where the last character can first match
+        pos = -1
+        for char in pattern:
+            pos = folded.find(char, pos + 1)
+            if pos < 0:
+                return None
+
+        # Then match backwards from there, so the matched characters are as close together as possible
+        positions = [0] * len(pattern)
+        end = pos + 1
+        for index in range(len(pattern) - 1, -1, -1):
+            end = folded.rfind(pattern[index], 0, end)
+            positions[index] = end
+
+        score = 0
+        prev = -2
+        for pos in positions:
+            score += self.SCORE_MATCH
+            if pos == 0:
+                score += self.BONUS_START
+            elif not folded[pos - 1].isalnum():
+                score += self.BONUS_WORD_START
+
+            if pos == prev + 1:
+                score += self.BONUS_CONSECUTIVE
+            elif prev >= 0:
+                score -= (pos - prev - 1) * self.PENALTY_GAP
+            prev = pos
+        return score
+
+    def score(self, text: str, candidate: str | CompletionItem) -> int | None:
+        """Score how well a candidate matches text.
+
+        :param text: the text being completed
+        :param candidate: a string or CompletionItem
+        :return: the score, which is higher for better matches, or None if the candidate doesn't match
+        """
+        return self._score_folded(text.casefold(), _text(candidate).casefold()) if text else 0
+
+    def match(self, text: str, candidates: Iterable[CandidateT]) -> list[CandidateT]:
+        """Find the candidates which contain the characters of text in order, best matches first."""
+        candidates = candidates if isinstance(candidates, Sequence) else list(candidates)
+        if not text:
+            return list(candidates[: self.limit])
+
+        pattern = text.casefold()
+        folded_texts = self._folded_texts.get(candidates)
+
+        # Every candidate which starts with the pattern has the same score, which no other match reaches.
+        # They're ranked by length, then original order.
+        prefix_ranked = [(len(folded), index) for index, folded in _matching_lines(_prefix_regex(pattern), folded_texts)]
+        if self.limit is not None and len(prefix_ranked) >= self.limit:
+            return [candidates[index] for _, index in heapq.nsmallest(self.limit, prefix_ranked)]
+        prefix_ranked.sort()
+
+        # Score the other candidates which contain the pattern's characters in order
+        scored = []
+        for index, folded in _matching_lines(_subsequence_regex(pattern), folded_texts):
+            if not folded.startswith(pattern):
+                score = self._score_folded(pattern, folded)
+                if score is not None:
+                    scored.append((-score, len(folded), index))
+
+        remaining = None if self.limit is None else self.limit - len(prefix_ranked)
+        best = sorted(scored) if remaining is None else heapq.nsmallest(remaining, scored)
+        return [candidates[index] for _, index in prefix_ranked] + [candidates[index] for _, _, index in best]
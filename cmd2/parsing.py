@@ -2,20 +2,27 @@
 
 import re
 import shlex
+import sys
+import threading
+from collections import OrderedDict
 from collections.abc import (
+    Callable,
     Iterable,
+    Iterator,
     Mapping,
     Sequence,
 )
 from dataclasses import (
-    asdict,
     dataclass,
     field,
 )
 from typing import (
     Any,
     ClassVar,
+    NamedTuple,
     Self,
+    TypeVar,
+    cast,
 )
 
 from . import (
@@ -86,15 +93,46 @@ class Macro:
     # This is stored internally as a tuple.
     args: Sequence[MacroArg] = field(default_factory=tuple)
 
+    # 'value' compiled into literal text and the argument numbers which fill the placeholders
+    # between them. Escaped placeholders are already unescaped in the literal text. This is
+    # computed from 'args' when the macro is created, so resolving it is a single join.
+    segments: tuple[str | int, ...] = field(init=False, repr=False, compare=False)
+
     def __post_init__(self) -> None:
         """Finalize the object after initialization."""
         # Convert args to an immutable tuple.
         if not isinstance(self.args, tuple):
             object.__setattr__(self, "args", tuple(self.args))
 
+        segments: list[str | int] = []
+        literal = ""
+        pos = 0
+        for macro_arg in sorted(self.args, key=lambda ma: ma.start_index):
+            literal += self.value[pos : macro_arg.start_index]
+            if macro_arg.is_escaped:
+                # Unescape {{5}} to {5}
+                literal += f"{{{macro_arg.number_str}}}"
+                pos = macro_arg.start_index + len(macro_arg.number_str) + 4
+            else:
+                # Replace {5} with a slot for argument 5
+                segments.extend((literal, int(macro_arg.number_str)))
+                literal = ""
+                pos = macro_arg.start_index + len(macro_arg.number_str) + 2
+        segments.append(literal + self.value[pos:])
+        object.__setattr__(self, "segments", tuple(segments))
+
+    def resolve(self, argv: Sequence[str]) -> str:
+        """Fill in the argument placeholders.
+
+        :param argv: the macro name followed by its arguments, so argument N is argv[N]
+        :return: the value with each placeholder replaced by its argument
+        :raises IndexError: if argv doesn't contain enough arguments
+        """
+        return "".join(segment if isinstance(segment, str) else argv[segment] for segment in self.segments)
+
 
-@dataclass(frozen=True)
-class Statement(str):  # noqa: SLOT000
+@dataclass(frozen=True, slots=True)
+class Statement(str):
     """String subclass with additional attributes to store the results of parsing.
 
     Instances of this class should not be created by anything other than the
@@ -117,8 +155,29 @@ class Statement(str):  # noqa: SLOT000
 
     3. If you don't want to have to worry about quoted arguments, see
        [argv][cmd2.parsing.Statement.argv] for a trick which strips quotes off for you.
+
+    Statements use slots instead of an instance dictionary, and their command, terminator,
+    and redirector strings are interned, since a long history holds many Statements that
+    share these values. Use [dataclasses.replace][] to copy a Statement with some fields changed.
     """
 
+    # Names of the fields which make up a Statement, in the order used by to_tuple()
+    FIELD_NAMES: ClassVar[tuple[str, ...]] = (
+        "args",
+        "raw",
+        "command",
+        "multiline_command",
+        "terminator",
+        "suffix",
+        "redirector",
+        "redirect_to",
+        "background",
+    )
+
+    # The number of leading FIELD_NAMES which from_tuple() requires. Fields after these were added
+    # later and can be missing from tuples saved in older persistent history files.
+    _REQUIRED_FIELD_COUNT: ClassVar[int] = 8
+
     # A space-delimited string containing the arguments to the command (quotes preserved).
     # This does not include any output redirection clauses.
     # Note: If a terminator is present, characters that would otherwise be
@@ -150,16 +209,35 @@ class Statement(str):  # noqa: SLOT000
     # Quotes are preserved.
     redirect_to: str = ""
 
-    def __new__(cls, value: object, *_pos_args: Any, **_kw_args: Any) -> Self:
+    # Whether the command line ended with & to run the command as a background job
+    background: bool = False
+
+    # Since a Statement is immutable, arg_list and argv are only computed the first time they are needed.
+    _arg_list_cache: tuple[str, ...] | None = field(default=None, init=False, repr=False, compare=False)
+    _argv_cache: tuple[str, ...] | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __new__(cls, *pos_args: Any, **kw_args: Any) -> Self:
         """Create a new instance of Statement.
 
         We must override __new__ because we are subclassing `str` which is
         immutable and takes a different number of arguments as Statement.
 
+        The string value is the args field. It is normally passed positionally, but
+        [dataclasses.replace][] passes it by keyword.
+
         NOTE:  @dataclass takes care of initializing other members in the __init__ it
         generates.
         """
-        return super().__new__(cls, value)
+        value = pos_args[0] if pos_args else kw_args.get("args", "")
+
+        # A slotted dataclass is a new class, so the zero-argument form of super() can't be used here.
+        return str.__new__(cls, value)
+
+    def __post_init__(self) -> None:
+        """Intern the strings which are shared by many Statements."""
+        object.__setattr__(self, "command", sys.intern(self.command))
+        object.__setattr__(self, "terminator", sys.intern(self.terminator))
+        object.__setattr__(self, "redirector", sys.intern(self.redirector))
 
     @property
     def command_and_args(self) -> str:
@@ -174,7 +252,7 @@ class Statement(str):  # noqa: SLOT000
 
     @property
     def post_command(self) -> str:
-        """A string containing any ending terminator, suffix, and redirection chars."""
+        """A string containing any ending terminator, suffix, redirection chars, and background job marker."""
         parts = []
         if self.terminator:
             parts.append(self.terminator)
@@ -187,6 +265,9 @@ class Statement(str):  # noqa: SLOT000
             if self.redirect_to:
                 parts.append(self.redirect_to)
 
+        if self.background:
+            parts.append(constants.BACKGROUND_JOB)
+
         return " ".join(parts)
 
     @property
@@ -206,20 +287,75 @@ class Statement(str):  # noqa: SLOT000
         useful if you are going to use ``argparse.parse_args()``.
 
         If you want to strip quotes from the input, you can use ``argv[1:]``.
-        """
-        if self.command:
-            return [su.strip_quotes(self.command)] + [su.strip_quotes(arg) for arg in self.arg_list]
 
-        return []
+        The list is computed once and a new copy is returned on each access.
+        """
+        return list(self._argv)
 
     @property
     def arg_list(self) -> list[str]:
-        """Return the arguments in a list (quotes preserved)."""
-        return shlex_split(self.args)
+        """Return the arguments in a list (quotes preserved).
+
+        The list is computed once and a new copy is returned on each access.
+        """
+        return list(self._arg_list)
+
+    @property
+    def _arg_list(self) -> tuple[str, ...]:
+        """Arguments with quotes preserved."""
+        if self._arg_list_cache is None:
+            object.__setattr__(self, "_arg_list_cache", tuple(shlex_split(self.args)))
+        return cast(tuple[str, ...], self._arg_list_cache)
+
+    @property
+    def _argv(self) -> tuple[str, ...]:
+        """Command and arguments with quotes removed."""
+        if self._argv_cache is None:
+            argv: tuple[str, ...] = ()
+            if self.command:
+                argv = (su.strip_quotes(self.command), *(su.strip_quotes(arg) for arg in self._arg_list))
+            object.__setattr__(self, "_argv_cache", argv)
+        return cast(tuple[str, ...], self._argv_cache)
+
+    def to_tuple(self) -> tuple[str | bool, ...]:
+        """Convert this Statement into a flat tuple of its fields in the order given by FIELD_NAMES.
+
+        This is a more compact alternative to to_dict() and is used in persistent JSON history files.
+        """
+        return (
+            self.args,
+            self.raw,
+            self.command,
+            self.multiline_command,
+            self.terminator,
+            self.suffix,
+            self.redirector,
+            self.redirect_to,
+            self.background,
+        )
+
+    @classmethod
+    def from_tuple(cls, values: Sequence[Any]) -> Self:
+        """Restore a Statement from a sequence of field values.
+
+        Values for fields which were added to Statement after the tuple was saved may be missing
+        from the end of the sequence, in which case those fields get their default values.
+
+        :param values: field values in the order given by FIELD_NAMES (generated using to_tuple())
+        :return: Statement object
+        :raises ValueError: if values doesn't contain one value for each required field or has too many values
+        """
+        if not cls._REQUIRED_FIELD_COUNT <= len(values) <= len(cls.FIELD_NAMES):
+            raise ValueError(
+                f"Statement requires {cls._REQUIRED_FIELD_COUNT} to {len(cls.FIELD_NAMES)} field values "
+                f"but {len(values)} were given"
+            )
+
+        return cls(*values)
 
     def to_dict(self) -> dict[str, Any]:
-        """Convert this Statement into a dictionary for use in persistent JSON history files."""
-        return asdict(self)
+        """Convert this Statement into a dictionary of its fields."""
+        return dict(zip(self.FIELD_NAMES, self.to_tuple(), strict=True))
 
     @classmethod
     def from_dict(cls, source_dict: dict[str, Any]) -> Self:
@@ -273,15 +409,116 @@ class PartialStatement:
         return self.command
 
 
+@dataclass(frozen=True, slots=True)
+class ParsedLine:
+    """The result of parsing one line with [cmd2.parsing.StatementParser.parse_many][]."""
+
+    # The 1-based number of this line within the lines that were parsed
+    line_number: int
+
+    # The original, unmodified line
+    line: str
+
+    # The parsed statement or None if the line has a syntax error
+    statement: Statement | None
+
+    # Description of the syntax error or an empty string if the line parsed successfully
+    error: str = ""
+
+
+class ParseCacheInfo(NamedTuple):
+    """Statistics about the parsing cache of a [cmd2.parsing.StatementParser][].
+
+    :hits: int - number of parsing results returned from the cache
+    :misses: int - number of lines which had to be parsed
+    :maxsize: int - maximum number of results the cache can hold
+    :currsize: int - number of results currently in the cache
+    """
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+_VT = TypeVar("_VT")
+
+
+class _ObservedDict(dict[str, _VT]):
+    """Dictionary which calls a function whenever its contents change."""
+
+    def __init__(self, on_change: Callable[[], None], *args: Any, **kwargs: Any) -> None:
+        """Initialize an _ObservedDict.
+
+        :param on_change: function to call after the contents change
+        :param args: positional arguments passed to dict
+        :param kwargs: keyword arguments passed to dict
+        """
+        super().__init__(*args, **kwargs)
+        self._on_change = on_change
+
+    def __setitem__(self, key: str, value: _VT) -> None:
+        super().__setitem__(key, value)
+        self._on_change()
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self._on_change()
+
+    def __ior__(self, other: Any) -> Self:  # type: ignore[misc, override]
+        super().__ior__(other)
+        self._on_change()
+        return self
+
+    def clear(self) -> None:
+        super().clear()
+        self._on_change()
+
+    def pop(self, *args: Any) -> Any:
+        result = super().pop(*args)
+        self._on_change()
+        return result
+
+    def popitem(self) -> tuple[str, _VT]:
+        result = super().popitem()
+        self._on_change()
+        return result
+
+    def setdefault(self, key: str, default: _VT) -> _VT:
+        result = super().setdefault(key, default)
+        self._on_change()
+        return result
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        super().update(*args, **kwargs)
+        self._on_change()
+
+
+class _AliasExpansion(NamedTuple):
+    """The result of following a chain of aliases."""
+
+    # Text which replaces the alias at the start of a line, or None if the expansion depends
+    # on the rest of the line
+    prefix: str | None
+
+    # The aliases in the cycle which ended the chain, or an empty tuple if there was no cycle
+    cycle: tuple[str, ...]
+
+
 class StatementParser:
     """Parse user input as a string into discrete command components."""
 
+    # Characters shlex treats as whitespace
+    _SHLEX_WHITESPACE: ClassVar[str] = " \t\r\n"
+
     def __init__(
         self,
         terminators: Iterable[str] | None = None,
         multiline_commands: Iterable[str] | None = None,
         aliases: Mapping[str, str] | None = None,
         shortcuts: Mapping[str, str] | None = None,
+        cache_size: int = 0,
+        background_jobs: bool = False,
     ) -> None:
         """Initialize an instance of StatementParser.
 
@@ -292,22 +529,159 @@ class StatementParser:
         :param multiline_commands: iterable containing the names of commands that accept multiline input
         :param aliases: dictionary containing aliases
         :param shortcuts: dictionary containing shortcuts
+        :param cache_size: maximum number of parsing results to keep in an LRU cache. Defaults to 0,
+                           which disables the cache.
+        :param background_jobs: if True, a standalone & at the end of a line is removed from it and
+                                sets the Statement's background field. Otherwise it is an argument.
         """
-        self.terminators: tuple[str, ...]
-        if terminators is None:
-            self.terminators = (constants.MULTILINE_TERMINATOR,)
-        else:
-            self.terminators = tuple(terminators)
-        self.multiline_commands: tuple[str, ...] = tuple(multiline_commands) if multiline_commands is not None else ()
-        self.aliases: dict[str, str] = dict(aliases) if aliases is not None else {}
+        # Incremented whenever a setting which affects parsing results changes
+        self._generation = 0
+
+        # Precomputed alias expansions, built as each alias is first used
+        self._alias_expansions: dict[str, _AliasExpansion] = {}
+
+        # Size-bounded LRU cache of parsing results. It is disabled when _cache_size is 0.
+        self._cache: OrderedDict[tuple[int, bool, str], Statement | PartialStatement] = OrderedDict()
+        self._cache_size = 0
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._cache_lock = threading.Lock()
+        self.cache_size = cache_size
+
+        self._aliases: _ObservedDict[str] = _ObservedDict(self._settings_changed)
+        self._terminators: tuple[str, ...] = ()
+        self._multiline_commands: tuple[str, ...] = ()
+        self._shortcuts: tuple[tuple[str, str], ...] = ()
+        self._shortcut_index: dict[str, tuple[tuple[str, str], ...]] = {}
+        self._background_jobs = background_jobs
+
+        self.terminators = (constants.MULTILINE_TERMINATOR,) if terminators is None else tuple(terminators)
+        self.multiline_commands = tuple(multiline_commands) if multiline_commands is not None else ()
+        self.aliases = dict(aliases) if aliases is not None else {}
 
         if shortcuts is None:
             shortcuts = constants.DEFAULT_SHORTCUTS
+        self.shortcuts = tuple(shortcuts.items())
+
+    def _settings_changed(self) -> None:
+        """Invalidate cached parsing results after a setting which affects parsing changes."""
+        self._generation += 1
+        self._alias_expansions.clear()
+
+    @property
+    def terminators(self) -> tuple[str, ...]:
+        """Strings which terminate commands."""
+        return self._terminators
+
+    @terminators.setter
+    def terminators(self, value: Iterable[str]) -> None:
+        self._terminators = tuple(value)
+        self._build_patterns()
+        self._settings_changed()
+
+    @property
+    def multiline_commands(self) -> tuple[str, ...]:
+        """Names of commands that accept multiline input."""
+        return self._multiline_commands
+
+    @multiline_commands.setter
+    def multiline_commands(self, value: Iterable[str]) -> None:
+        self._multiline_commands = tuple(value)
+        self._settings_changed()
+
+    @property
+    def aliases(self) -> dict[str, str]:
+        """Dictionary containing aliases.
+
+        Changes made to this dictionary are tracked so cached parsing results stay accurate.
+        """
+        return self._aliases
+
+    @aliases.setter
+    def aliases(self, value: Mapping[str, str]) -> None:
+        self._aliases = _ObservedDict(self._settings_changed, value)
+        self._settings_changed()
+
+    @property
+    def background_jobs(self) -> bool:
+        """Whether a standalone & at the end of a line marks the command as a background job."""
+        return self._background_jobs
 
+    @background_jobs.setter
+    def background_jobs(self, value: bool) -> None:
+        self._background_jobs = value
+        self._settings_changed()
+
+    @property
+    def shortcuts(self) -> tuple[tuple[str, str], ...]:
+        """Tuple of (shortcut, expansion) pairs sorted in descending order by shortcut length."""
+        return self._shortcuts
+
+    @shortcuts.setter
+    def shortcuts(self, value: Iterable[tuple[str, str]]) -> None:
         # Sort the shortcuts in descending order by name length because the longest match
         # should take precedence. (e.g., @@file should match '@@' and not '@'.
-        self.shortcuts = tuple(sorted(shortcuts.items(), key=lambda x: len(x[0]), reverse=True))
+        self._shortcuts = tuple(sorted(value, key=lambda x: len(x[0]), reverse=True))
+
+        # Index the shortcuts by their first character so match_shortcut() only has to check
+        # the few shortcuts which could possibly match. Each group stays sorted longest first.
+        shortcut_index: dict[str, list[tuple[str, str]]] = {}
+        for shortcut in self._shortcuts:
+            if shortcut[0]:
+                shortcut_index.setdefault(shortcut[0][0], []).append(shortcut)
+        self._shortcut_index = {char: tuple(group) for char, group in shortcut_index.items()}
+
+        self._settings_changed()
+
+    def match_shortcut(self, text: str) -> tuple[str, str] | None:
+        """Find the longest shortcut which text starts with.
 
+        :param text: the text to check, usually the start of a command line
+        :return: a tuple of the shortcut and its expansion or None if no shortcut matches
+        """
+        candidates = self._shortcut_index.get(text[:1])
+        if candidates is not None:
+            for candidate in candidates:
+                if text.startswith(candidate[0]):
+                    return candidate
+        return None
+
+    @property
+    def cache_size(self) -> int:
+        """Maximum number of parsing results kept in the LRU cache. Setting this to 0 disables the cache.
+
+        The cache is shared by [cmd2.parsing.StatementParser.parse][] and
+        [cmd2.parsing.StatementParser.parse_command_only][]. It is most useful when the same lines
+        are parsed repeatedly, like when running scripts or replaying history.
+        """
+        return self._cache_size
+
+    @cache_size.setter
+    def cache_size(self, value: int) -> None:
+        if value < 0:
+            raise ValueError("cache_size cannot be negative")
+        with self._cache_lock:
+            self._cache_size = value
+            while len(self._cache) > value:
+                self._cache.popitem(last=False)
+
+    def cache_info(self) -> ParseCacheInfo:
+        """Report statistics about the parsing cache.
+
+        :return: a [cmd2.parsing.ParseCacheInfo][] object
+        """
+        with self._cache_lock:
+            return ParseCacheInfo(self._cache_hits, self._cache_misses, self._cache_size, len(self._cache))
+
+    def cache_clear(self) -> None:
+        """Clear the parsing cache and its statistics."""
+        with self._cache_lock:
+            self._cache.clear()
+            self._cache_hits = 0
+            self._cache_misses = 0
+
+    def _build_patterns(self) -> None:
+        """Build the regular expressions which depend on the terminators."""
         # commands have to be a word, so make a regular expression
         # that matches the first word in the line. This regex has three
         # parts:
@@ -342,6 +716,39 @@ class StatementParser:
         expr = rf"\A\s*(\S*?)({second_group})"
         self._command_pattern = re.compile(expr)
 
+        # Build the regular expressions used by the single-pass lexer in _lex(). Together they
+        # reproduce what shlex_split() followed by split_on_punctuation() would return.
+        #
+        # split_on_punctuation() examines one character at a time, so only single-character
+        # terminators are treated as punctuation. Whitespace terminators never reach it, since
+        # shlex_split() splits on them.
+        punctuation = "".join(
+            dict.fromkeys(
+                char
+                for char in (*self.terminators, *constants.REDIRECTION_CHARS)
+                if len(char) == 1 and char not in self._SHLEX_WHITESPACE
+            )
+        )
+        punctuation_class = re.escape(punctuation)
+        whitespace_class = re.escape(self._SHLEX_WHITESPACE)
+
+        # Matches the next piece of an unquoted word: either a run of the same punctuation
+        # character or a run of anything else that isn't whitespace or punctuation.
+        word_segment = rf"(?P<punc>[{punctuation_class}])(?P=punc)*|[^{whitespace_class}{punctuation_class}]+"
+        self._word_segment_pattern = re.compile(rf"(?P<token>{word_segment})")
+
+        # Matches the start of a new shlex token after skipping any whitespace. In non-POSIX mode,
+        # shlex only recognizes quotes at the start of a token, and a quoted token ends at its
+        # closing quote. A lone quote character means the quote is never closed.
+        quoted_token = "|".join(f"{quote}[^{quote}]*{quote}" for quote in constants.QUOTES)
+        quote_class = "".join(constants.QUOTES)
+        self._token_start_pattern = re.compile(
+            rf"[{whitespace_class}]*(?:(?P<quoted>{quoted_token})|(?P<unclosed>[{quote_class}])|(?P<token>{word_segment}))"
+        )
+
+        # Matches a line which is entirely a comment
+        self._comment_pattern = re.compile(rf"\s*{re.escape(constants.COMMENT_CHAR)}")
+
     def is_valid_command(self, word: str, *, is_subcommand: bool = False) -> tuple[bool, str]:
         """Determine whether a word is a valid name for a command.
 
@@ -372,13 +779,11 @@ class StatementParser:
         if word.startswith(constants.COMMENT_CHAR):
             return False, "cannot start with the comment character"
 
-        if not is_subcommand:
-            for shortcut, _ in self.shortcuts:
-                if word.startswith(shortcut):
-                    # Build an error string with all shortcuts listed
-                    errmsg = "cannot start with a shortcut: "
-                    errmsg += ", ".join(shortcut for (shortcut, _) in self.shortcuts)
-                    return False, errmsg
+        if not is_subcommand and self.match_shortcut(word) is not None:
+            # Build an error string with all shortcuts listed
+            errmsg = "cannot start with a shortcut: "
+            errmsg += ", ".join(shortcut for (shortcut, _) in self.shortcuts)
+            return False, errmsg
 
         errmsg = "cannot contain: whitespace, quotes, "
 
@@ -400,29 +805,176 @@ class StatementParser:
         """
         # expand shortcuts and aliases
         line = self._expand(line)
+        return self._lex(line)
+
+    def lex(self, line: str) -> tuple[list[str], list[tuple[int, int]]]:
+        """Lex a string into a list of tokens along with the location of each token in the string.
+
+        Unlike [cmd2.parsing.StatementParser.tokenize][], shortcuts and aliases are not expanded.
+        This makes the spans meaningful for the line as it was passed in. Comment lines produce
+        no tokens.
+
+        :param line: the command line being lexed
+        :return: A tuple containing the list of tokens and a list of (start, end) indices
+                 into ``line`` for each token
+        :raises Cmd2ShlexError: if a shlex error occurs (e.g. No closing quotation)
+        """
+        spans: list[tuple[int, int]] = []
+        tokens = self._lex(line, spans)
+        return tokens, spans
+
+    def _lex(self, line: str, spans: list[tuple[int, int]] | None = None) -> list[str]:
+        """Lex a string into a list of tokens in a single pass.
 
+        This produces the same tokens as running shlex_split() followed by split_on_punctuation(),
+        but it handles quoting, comments, terminators, and redirection characters together.
+
+        :param line: the command line being lexed
+        :param spans: optional list which will be filled with the (start, end) indices of each token
+        :return: A list of tokens
+        :raises Cmd2ShlexError: if a shlex error occurs (e.g. No closing quotation)
+        """
         # check if this line is a comment
-        if line.lstrip().startswith(constants.COMMENT_CHAR):
+        if self._comment_pattern.match(line):
             return []
 
-        # split on whitespace
-        try:
-            tokens = shlex_split(line)
-        except ValueError as ex:
-            raise Cmd2ShlexError(ex) from None
+        tokens: list[str] = []
+        if self._lex_into(line, 0, tokens, spans) >= 0:
+            raise Cmd2ShlexError("No closing quotation")
+        return tokens
+
+    def _lex_into(self, line: str, pos: int, tokens: list[str], spans: list[tuple[int, int]] | None) -> int:
+        """Lex a string starting at a given position and append the tokens to a list.
+
+        Lexing stops at a quote which is never closed.
+
+        :param line: the string being lexed
+        :param pos: index in line at which a new token may start
+        :param tokens: list to which the tokens are appended
+        :param spans: optional list to which the (start, end) indices of each token are appended
+        :return: index of the quote which was never closed or -1 if all quotes were closed
+        """
+        token_start_match = self._token_start_pattern.match
+        word_segment_match = self._word_segment_pattern.match
+
+        in_word = False
+        while True:
+            if in_word:
+                # Continue splitting the current unquoted word on punctuation
+                match = word_segment_match(line, pos)
+                if match is None:
+                    # We reached whitespace or the end of the line
+                    in_word = False
+                    continue
+                group = "token"
+            else:
+                match = token_start_match(line, pos)
+                if match is None:
+                    # Only whitespace remained
+                    break
+                if match.lastgroup == "unclosed":
+                    return match.start("unclosed")
+
+                # A quoted token is always complete on its own
+                group = match.lastgroup or "token"
+                in_word = group == "token"
+
+            tokens.append(match.group(group))
+            if spans is not None:
+                spans.append(match.span(group))
+            pos = match.end()
+
+        return -1
 
-        # custom lexing
-        return self.split_on_punctuation(tokens)
+    def multiline_scanner(self, line: str) -> "MultilineScanner":
+        """Create a [cmd2.parsing.MultilineScanner][] to track a multiline statement as lines are added.
+
+        :param line: the first line of the statement
+        :return: a new [cmd2.parsing.MultilineScanner][] object
+        """
+        return MultilineScanner(self, line)
+
+    def _cache_get(self, key: tuple[int, bool, str]) -> Statement | PartialStatement | None:
+        """Look up a parsing result in the cache and mark it as most recently used.
+
+        :param key: cache key
+        :return: the cached result or None if it isn't cached
+        """
+        with self._cache_lock:
+            result = self._cache.get(key)
+            if result is None:
+                self._cache_misses += 1
+            else:
+                self._cache_hits += 1
+                self._cache.move_to_end(key)
+            return result
+
+    def _cache_put(self, key: tuple[int, bool, str], result: Statement | PartialStatement) -> None:
+        """Store a parsing result in the cache, evicting the least recently used result if needed.
+
+        :param key: cache key
+        :param result: the parsing result
+        """
+        with self._cache_lock:
+            self._cache[key] = result
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
 
     def parse(self, line: str) -> Statement:
         """Tokenize the input and parse it into a [cmd2.parsing.Statement][] object.
 
         Stripping comments, expanding aliases and shortcuts, and extracting output redirection directives.
 
+        If [cmd2.parsing.StatementParser.cache_size][] is nonzero, then results are cached.
+        Since [cmd2.parsing.Statement][] objects are immutable, the same object may be returned
+        for repeated lines.
+
         :param line: the command line being parsed
-        :return: a new [cmd2.parsing.Statement][] object
+        :return: a [cmd2.parsing.Statement][] object
         :raises Cmd2ShlexError: if a shlex error occurs (e.g. No closing quotation)
         """
+        if not self._cache_size:
+            return self._parse(line)
+
+        key = (self._generation, False, line)
+        statement = self._cache_get(key)
+        if statement is None:
+            statement = self._parse(line)
+            self._cache_put(key, statement)
+        return cast(Statement, statement)
+
+    def parse_many(self, lines: Iterable[str]) -> Iterator[ParsedLine]:
+        """Parse a sequence of lines, such as a script or a history replay.
+
+        This is a generator, so each line is parsed with the settings in effect when it is
+        requested. Repeated lines are only parsed once as long as the aliases, shortcuts,
+        terminators, and multiline commands don't change. Unlike
+        [cmd2.parsing.StatementParser.parse][], syntax errors are reported in the results
+        instead of being raised.
+
+        :param lines: the lines being parsed
+        :return: a [cmd2.parsing.ParsedLine][] for each line
+        """
+        seen: dict[str, Statement] = {}
+        generation = self._generation
+        for line_number, line in enumerate(lines, start=1):
+            if generation != self._generation:
+                seen.clear()
+                generation = self._generation
+
+            statement = seen.get(line)
+            if statement is None:
+                try:
+                    statement = self.parse(line)
+                except Cmd2ShlexError as ex:
+                    yield ParsedLine(line_number, line, None, str(ex))
+                    continue
+                seen[line] = statement
+
+            yield ParsedLine(line_number, line, statement)
+
+    def _parse(self, line: str) -> Statement:
+        """Parse a line without using the cache. See [cmd2.parsing.StatementParser.parse][]."""
         # handle the special case/hardcoded terminator of a blank line
         # we have to do this before we tokenize because tokenizing
         # destroys all unquoted whitespace in the input
@@ -436,6 +988,13 @@ class StatementParser:
         # lex the input into a list of tokens
         tokens = self.tokenize(line)
 
+        # A standalone & ending the line runs the command as a background job. It's removed before
+        # anything else so it can follow terminators and redirection, like it does in a shell.
+        background = False
+        if self._background_jobs and tokens and tokens[-1] == constants.BACKGROUND_JOB:
+            background = True
+            tokens.pop()
+
         # of the valid terminators, find the first one to occur in the input
         terminator_pos = len(tokens) + 1
         for pos, cur_token in enumerate(tokens):
@@ -467,6 +1026,11 @@ class StatementParser:
         else:
             (testcommand, testargs) = self._command_and_args(tokens)
             if testcommand in self.multiline_commands:
+                if background:
+                    # An unterminated multiline command continues on the next line, so & is just an argument
+                    background = False
+                    (testcommand, testargs) = self._command_and_args([*tokens, constants.BACKGROUND_JOB])
+
                 # no terminator on this line but we have a multiline command
                 # everything else on the line is part of the args
                 # because redirectors can only be after a terminator
@@ -547,6 +1111,7 @@ class StatementParser:
             suffix=suffix,
             redirector=redirector,
             redirect_to=redirect_to,
+            background=background,
         )
 
     def parse_command_only(self, rawinput: str) -> PartialStatement:
@@ -574,6 +1139,18 @@ class StatementParser:
         :return: a [cmd2.PartialStatement][] object representing the split input
 
         """
+        if not self._cache_size:
+            return self._parse_command_only(rawinput)
+
+        key = (self._generation, True, rawinput)
+        partial_statement = self._cache_get(key)
+        if partial_statement is None:
+            partial_statement = self._parse_command_only(rawinput)
+            self._cache_put(key, partial_statement)
+        return cast(PartialStatement, partial_statement)
+
+    def _parse_command_only(self, rawinput: str) -> PartialStatement:
+        """Split a line without using the cache. See [cmd2.parsing.StatementParser.parse_command_only][]."""
         # Expand shortcuts and aliases
         line = self._expand(rawinput)
 
@@ -637,13 +1214,107 @@ class StatementParser:
             to_parse = self.parse(command_name + " " + to_parse)
 
         if preserve_quotes:
-            return to_parse, to_parse.arg_list
-        return to_parse, to_parse.argv[1:]
+            return to_parse, list(to_parse._arg_list)
+        return to_parse, list(to_parse._argv[1:])
+
+    def find_alias_cycle(self, name: str) -> list[str]:
+        """Find a cycle reached while expanding an alias.
+
+        Alias expansion stops at the first alias which was already expanded, so a cycle
+        doesn't cause an infinite loop. However, it usually means the alias won't resolve to
+        the command its author intended.
+
+        :param name: name of the alias
+        :return: the aliases in the cycle with the first one repeated at the end
+                 (e.g. ``['a', 'b', 'a']``) or an empty list if there is no cycle
+        :raises KeyError: if name is not an alias
+        """
+        if name not in self.aliases:
+            raise KeyError(name)
+        return list(self._get_alias_expansion(name).cycle)
+
+    def _get_alias_expansion(self, name: str) -> _AliasExpansion:
+        """Get the precomputed expansion of an alias, computing it if needed.
+
+        :param name: name of the alias
+        :return: the alias's expansion
+        """
+        expansion = self._alias_expansions.get(name)
+        if expansion is None:
+            generation = self._generation
+            expansion = self._build_alias_expansion(name)
+
+            # Don't store a result computed while the aliases were changing
+            if generation == self._generation:
+                self._alias_expansions[name] = expansion
+        return expansion
+
+    def _build_alias_expansion(self, name: str) -> _AliasExpansion:
+        """Follow a chain of aliases to compute the text which replaces an alias.
+
+        Each alias in a chain is expanded once, so the chain ends at a word which is
+        not an alias or at an alias which was already expanded.
+
+        :param name: name of the alias
+        :return: the alias's expansion
+        """
+        chain = [name]
+        prefix = self.aliases[name]
+
+        while True:
+            match = self._command_pattern.search(prefix)
+            if match is None:  # pragma: no cover
+                break
+
+            command = match.group(1)
+
+            # If the prefix is blank, then the next command comes from the rest of the line.
+            # Leave this uncommon case to _expand_aliases().
+            if not command and match.end() == len(prefix):
+                return _AliasExpansion(None, ())
+
+            if command not in self.aliases:
+                break
+
+            if command in chain:
+                return _AliasExpansion(prefix, (*chain[chain.index(command) :], command))
+
+            chain.append(command)
+            prefix = self.aliases[command] + prefix[match.end(1) :]
+
+        return _AliasExpansion(prefix, ())
 
     def _expand(self, line: str) -> str:
         """Expand aliases and shortcuts."""
+        aliases = self.aliases
+        if aliases:
+            match = self._command_pattern.search(line)
+            if match is not None and match.group(1) in aliases:
+                prefix = self._get_alias_expansion(match.group(1)).prefix
+                line = self._expand_aliases(line) if prefix is None else prefix + line[match.end(1) :]
+
+        # expand shortcuts
+        shortcut_match = self.match_shortcut(line)
+        if shortcut_match is not None:
+            shortcut, expansion = shortcut_match
+
+            # If the next character after the shortcut isn't a space, then insert one
+            shortcut_len = len(shortcut)
+            if len(line) == shortcut_len or line[shortcut_len] != " ":
+                expansion += " "
+
+            # Expand the shortcut
+            line = expansion + line[shortcut_len:]
+        return line
+
+    def _expand_aliases(self, line: str) -> str:
+        """Expand aliases one at a time without using precomputed expansions.
+
+        This handles aliases whose values are blank, since the command they expand to
+        depends on the rest of the line.
+        """
         # Make a copy of aliases so we can keep track of what aliases have been resolved to avoid an infinite loop
-        remaining_aliases = list(self.aliases.keys())
+        remaining_aliases = set(self.aliases)
         keep_expanding = bool(remaining_aliases)
 
         while keep_expanding:
@@ -662,18 +1333,6 @@ class StatementParser:
                     remaining_aliases.remove(command)
                     keep_expanding = bool(remaining_aliases)
 
-        # expand shortcuts
-        for shortcut, expansion in self.shortcuts:
-            if line.startswith(shortcut):
-                # If the next character after the shortcut isn't a space, then insert one
-                shortcut_len = len(shortcut)
-                effective_expansion = expansion
-                if len(line) == shortcut_len or line[shortcut_len] != " ":
-                    effective_expansion += " "
-
-                # Expand the shortcut
-                line = line.replace(shortcut, effective_expansion, 1)
-                break
         return line
 
     @staticmethod
@@ -750,3 +1409,85 @@ class StatementParser:
                     break
 
         return punctuated_tokens
+
+
+class MultilineScanner:
+    """Track whether a multiline statement might be complete as lines are added to it.
+
+    Determining whether a multiline statement is complete normally requires parsing the
+    whole statement, which makes assembling a statement from many lines quadratic. This
+    keeps the quote and terminator state between lines, so each added line is only
+    scanned once.
+
+    The scanner is conservative. When [cmd2.parsing.MultilineScanner.maybe_complete][] is
+    ``True``, the statement should be parsed to confirm it's complete. When it is ``False``,
+    the statement is definitely incomplete.
+
+    Instances should be created with [cmd2.parsing.StatementParser.multiline_scanner][].
+    """
+
+    def __init__(self, parser: StatementParser, line: str) -> None:
+        """Initialize a MultilineScanner.
+
+        :param parser: the parser which will parse the finished statement
+        :param line: the first line of the statement
+        """
+        self._parser = parser
+        self._generation = parser._generation
+
+        # The quote character of a quoted token which hasn't been closed yet
+        self._open_quote = ""
+
+        # Whether a token starting with a terminator has been found
+        self._terminated = False
+
+        # Whether the statement ends with a line feed, which also terminates it
+        self._ends_with_line_feed = False
+
+        # Aliases and shortcuts only affect the first word, so only the first line is expanded
+        self._scan(parser._expand(line))
+
+    @property
+    def is_stale(self) -> bool:
+        """Whether the parser's settings changed after this scanner was created."""
+        return self._generation != self._parser._generation
+
+    @property
+    def maybe_complete(self) -> bool:
+        """Whether the statement might be complete, meaning it has a terminator and no open quotes."""
+        return not self._open_quote and (self._terminated or self._ends_with_line_feed)
+
+    def add_line(self, line: str) -> None:
+        """Add a line to the statement. It is separated from the previous text by a line feed.
+
+        :param line: the line being added
+        """
+        self._scan(f"{constants.LINE_FEED}{line}")
+
+    def _scan(self, text: str) -> None:
+        """Scan text appended to the statement.
+
+        :param text: the new text, which must start at a token boundary
+        """
+        if not text:
+            return
+
+        self._ends_with_line_feed = text.endswith(constants.LINE_FEED)
+
+        pos = 0
+        if self._open_quote:
+            # Look for the closing quote. A quoted token ends at its closing quote.
+            close_index = text.find(self._open_quote)
+            if close_index < 0:
+                return
+            self._open_quote = ""
+            pos = close_index + 1
+
+        tokens: list[str] = []
+        unclosed_index = self._parser._lex_into(text, pos, tokens, None)
+        if unclosed_index >= 0:
+            self._open_quote = text[unclosed_index]
+
+        if not self._terminated:
+            terminators = self._parser.terminators
+            self._terminated = any(token.startswith(terminators) for token in tokens)
@@ -0,0 +1,199 @@
+"""Classes for profiling individual commands with cProfile and tracemalloc."""
+
+import io
+import itertools
+import os
+import re
+import threading
+import time
+from typing import (
+    TYPE_CHECKING,
+    ClassVar,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    import cProfile
+    import tracemalloc
+
+# Values of the profile setting
+PROFILE_OFF = "off"
+PROFILE_CPU = "cpu"
+PROFILE_MEMORY = "memory"
+PROFILE_ALL = "all"
+
+PROFILE_MODES: tuple[str, ...] = (PROFILE_OFF, PROFILE_CPU, PROFILE_MEMORY, PROFILE_ALL)
+
+# Makes the names of profiles saved within the same second unique
+_profile_ids = itertools.count(1)
+
+
+class CommandProfile:
+    """Profiles one command with cProfile, tracemalloc, or both.
+
+    cProfile only allows one active profiler at a time. When a command runs another command, like
+    run_script does, the outer command's profile is paused while the inner one runs so each command's
+    functions are only counted in its own profile. tracemalloc has no such limit, so an outer
+    command's memory profile includes the memory allocated by the commands it runs.
+
+    Both profilers are shared by the whole process, so only one thread's commands can be profiled at a
+    time. Starting a profile in another thread, like a background job's, fails until they finish.
+    """
+
+    # The thread whose commands are being profiled and how many of its profiles are running
+    _owner_lock: ClassVar[threading.Lock] = threading.Lock()
+    _owner: ClassVar[int | None] = None
+    _owner_depth: ClassVar[int] = 0
+
+    def __init__(self, line: str, command: str, *, cpu: bool, memory: bool) -> None:
+        """CommandProfile initializer.
+
+        :param line: the command line being profiled
+        :param command: the name of the command being profiled
+        :param cpu: if True, profile function calls with cProfile
+        :param memory: if True, profile memory allocations with tracemalloc
+        """
+        self.line = line
+        self.command = command
+
+        self.profiler: cProfile.Profile | None = None
+        if cpu:
+            from cProfile import Profile
+
+            self.profiler = Profile()
+
+        self.memory = memory
+        self._started_tracemalloc = False
+        self.snapshot_before: tracemalloc.Snapshot | None = None
+        self.snapshot_after: tracemalloc.Snapshot | None = None
+
+    def start(self) -> None:
+        """Start profiling.
+
+        :raises RuntimeError: if another thread's command is being profiled
+        """
+        with CommandProfile._owner_lock:
+            thread_id = threading.get_ident()
+            if CommandProfile._owner not in (None, thread_id):
+                raise RuntimeError("a command in another thread is being profiled")
+            CommandProfile._owner = thread_id
+            CommandProfile._owner_depth += 1
+
+        try:
+            self._start_profilers()
+        except BaseException:
+            self._release_owner()
+            raise
+
+    def _start_profilers(self) -> None:
+        """Start cProfile and tracemalloc as needed."""
+        if self.memory:
+            import tracemalloc
+
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            self.snapshot_before = self._take_snapshot()
+
+        if self.profiler is not None:
+            self.profiler.enable()
+
+    def stop(self) -> None:
+        """Stop profiling."""
+        if self.profiler is not None:
+            self.profiler.disable()
+
+        if self.memory:
+            import tracemalloc
+
+            self.snapshot_after = self._take_snapshot()
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+
+        self._release_owner()
+
+    @staticmethod
+    def _release_owner() -> None:
+        """Let other threads profile once the profiles of this thread's commands have stopped."""
+        with CommandProfile._owner_lock:
+            CommandProfile._owner_depth -= 1
+            if not CommandProfile._owner_depth:
+                CommandProfile._owner = None
+
+    def pause(self) -> None:
+        """Pause cProfile while a nested command is profiled."""
+        if self.profiler is not None:
+            self.profiler.disable()
+
+    def resume(self) -> None:
+        """Resume cProfile after a nested command was profiled."""
+        if self.profiler is not None:
+            self.profiler.enable()
+
+    @staticmethod
+    def _take_snapshot() -> "tracemalloc.Snapshot":
+        """Take a tracemalloc snapshot which excludes tracemalloc's own allocations."""
+        import tracemalloc
+
+        snapshot = tracemalloc.take_snapshot()
+        return snapshot.filter_traces((tracemalloc.Filter(False, tracemalloc.__file__),))
+
+    def cpu_report(self, top: int) -> str:
+        """Return the functions which took the most cumulative time.
+
+        :param top: the number of functions to include
+        :return: the report or an empty string if function calls weren't profiled
+        """
+        if self.profiler is None:
+            return ""
+
+        import pstats
+
+        stream = io.StringIO()
+        stats = pstats.Stats(self.profiler, stream=stream)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+        return stream.getvalue().strip("\n")
+
+    def memory_report(self, top: int) -> str:
+        """Return the source lines whose allocated memory grew the most while the command ran.
+
+        :param top: the number of source lines to include
+        :return: the report or an empty string if memory wasn't profiled
+        """
+        if self.snapshot_before is None or self.snapshot_after is None:
+            return ""
+
+        stats = self.snapshot_after.compare_to(self.snapshot_before, "lineno")[:top]
+        lines = [f"Top {len(stats)} lines by memory allocated"]
+        lines.extend(str(stat) for stat in stats)
+        return "\n".join(lines)
+
+    def save(self, directory: str) -> list[str]:
+        """Save the profile's data to files in a directory.
+
+        cProfile data is saved to a .pstats file which can be loaded with pstats.Stats. tracemalloc
+        data is saved as two snapshots, taken before and after the command ran, which can be loaded
+        with tracemalloc.Snapshot.load().
+
+        :param directory: directory to save the files in. It is created if it doesn't exist.
+        :return: the paths of the files saved
+        """
+        os.makedirs(directory, exist_ok=True)
+
+        # Build a unique name from the time and the command name
+        command = re.sub(r"[^\w.-]", "_", self.command)
+        base = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{next(_profile_ids)}-{command}")
+
+        paths: list[str] = []
+        if self.profiler is not None:
+            path = f"{base}.pstats"
+            self.profiler.dump_stats(path)
+            paths.append(path)
+
+        if self.snapshot_before is not None and self.snapshot_after is not None:
+            for suffix, snapshot in (("before", self.snapshot_before), ("after", self.snapshot_after)):
+                path = f"{base}-{suffix}.snapshot"
+                snapshot.dump(path)
+                paths.append(path)
+
+        return paths
@@ -2,6 +2,7 @@
 
 import os
 import re
+import threading
 from collections.abc import (
     Callable,
     Iterable,
@@ -31,6 +32,7 @@ from . import (
 )
 from . import rich_utils as ru
 from . import string_utils as su
+from .completion import CompletionRequest
 from .styles import Cmd2Style
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -139,6 +141,9 @@ def rich_to_pt_style(rich_style: StyleType) -> str:
 class Cmd2Completer(Completer):
     """Completer that delegates to cmd2's completion logic."""
 
+    # Hint printed while waiting for a slow asynchronous choices provider or completer
+    loading_hint = "Loading…"
+
     def __init__(
         self,
         cmd_app: "Cmd",
@@ -148,6 +153,14 @@ class Cmd2Completer(Completer):
         self._cmd_app = cmd_app
         self.custom_settings = custom_settings
 
+        # The completion still running, which a newer one supersedes
+        self._request: CompletionRequest | None = None
+        self._request_lock = threading.Lock()
+
+    def _show_loading_hint(self) -> None:
+        """Print the loading hint."""
+        print_formatted_text(pt_filter_style(self.loading_hint))
+
     def get_completions(self, document: Document, _complete_event: object) -> Iterable[Completion]:
         """Get completions for the current input."""
         # Find the beginning of the current word based on delimiters
@@ -168,9 +181,30 @@ class Cmd2Completer(Completer):
         endidx = cursor_pos
         text = line[begidx:endidx]
 
-        completions = self._cmd_app.complete(
-            text, line=line, begidx=begidx, endidx=endidx, custom_settings=self.custom_settings
-        )
+        # This supersedes a completion still running for what the user typed before, whose result would be stale
+        request = CompletionRequest(on_loading=self._show_loading_hint)
+        with self._request_lock:
+            previous, self._request = self._request, request
+        if previous is not None:
+            previous.cancel()
+
+        # Let the argparse completer reuse matches while the user keeps typing the same argument
+        thread_state = self._cmd_app._thread_state
+        thread_state.choices_cache = self._cmd_app._choices_cache
+        thread_state.completion_request = request
+        try:
+            completions = self._cmd_app.complete(
+                text, line=line, begidx=begidx, endidx=endidx, custom_settings=self.custom_settings
+            )
+        finally:
+            thread_state.choices_cache = None
+            thread_state.completion_request = None
+            with self._request_lock:
+                if self._request is request:
+                    self._request = None
+
+        if request.cancelled:
+            return
 
         if completions.error:
             print_formatted_text(pt_filter_style(completions.error))
@@ -345,22 +379,19 @@ class Cmd2Lexer(Lexer):
 
                     if command:
                         # Determine the style for the command
-                        shortcut_found = False
-                        for shortcut, _ in self._cmd_app.statement_parser.shortcuts:
-                            if command.startswith(shortcut):
-                                # Add the shortcut with the command style
-                                tokens.append((self.COMMAND_STYLE, shortcut))
-
-                                # If there's more in the command word, it's an argument
-                                if len(command) > len(shortcut):
-                                    tokens.append((self.ARGUMENT_STYLE, command[len(shortcut) :]))
+                        shortcut_match = self._cmd_app.statement_parser.match_shortcut(command)
+                        if shortcut_match is not None:
+                            shortcut = shortcut_match[0]
 
-                                shortcut_found = True
-                                break
+                            # Add the shortcut with the command style
+                            tokens.append((self.COMMAND_STYLE, shortcut))
 
-                        if not shortcut_found:
+                            # If there's more in the command word, it's an argument
+                            if len(command) > len(shortcut):
+                                tokens.append((self.ARGUMENT_STYLE, command[len(shortcut) :]))
+                        else:
                             style = ""
-                            if command in self._cmd_app.get_all_commands():
+                            if self._cmd_app.get_command_func(command) is not None:
                                 style = self.COMMAND_STYLE
                             elif command in self._cmd_app.aliases:
                                 style = self.ALIAS_STYLE
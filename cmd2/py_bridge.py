@@ -14,6 +14,7 @@ from typing import (
     cast,
 )
 
+from .timing import CommandTiming
 from .utils import StdSim  # namedtuple_with_defaults,
 
 if TYPE_CHECKING:  # pragma: no cover
@@ -28,6 +29,8 @@ class CommandResult(NamedTuple):
     :stop: bool - return value of onecmd_plus_hooks after it runs the given
            command line.
     :data: possible data populated by the command.
+    :timing: CommandTiming | None - how long each phase of running the command
+             took, or None if the line didn't run a command.
 
     Any combination of these fields can be used when developing a scripting API
     for a given command. By default stdout, stderr, and stop will be captured
@@ -60,6 +63,7 @@ class CommandResult(NamedTuple):
     stderr: str = ""
     stop: bool = False
     data: Any = None
+    timing: CommandTiming | None = None
 
     def __bool__(self) -> bool:
         """Return True if the command succeeded, otherwise False."""
@@ -116,6 +120,7 @@ class PyBridge:
         copy_stderr = StdSim(sys.stderr, echo=echo)
 
         self._cmd_app.last_result = None
+        self._cmd_app.last_command_timing = None
 
         stop = False
         try:
@@ -138,4 +143,5 @@ class PyBridge:
             stderr=copy_stderr.getvalue(),
             stop=stop,
             data=self._cmd_app.last_result,
+            timing=self._cmd_app.last_command_timing,
         )
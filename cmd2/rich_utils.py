@@ -28,7 +28,6 @@ from rich.console import (
     RenderableType,
 )
 from rich.padding import Padding
-from rich.pretty import is_expandable
 from rich.protocol import rich_cast
 from rich.style import StyleType
 from rich.table import (
@@ -659,6 +658,9 @@ def prepare_objects_for_rendering(*objects: Any) -> tuple[Any, ...]:
     :param objects: objects to prepare
     :return: a tuple containing the processed objects.
     """
+    # Imported here, as Rich's own Console does, since rich.pretty is slow to import
+    from rich.pretty import is_expandable
+
     object_list = list(objects)
 
     for i, obj in enumerate(object_list):
@@ -20,16 +20,17 @@ from collections.abc import (
     Iterable,
     Mapping,
 )
-from typing import cast
+from typing import (
+    TYPE_CHECKING,
+    cast,
+)
 
-from prompt_toolkit.styles import Style as PtStyle
 from rich.style import (
     Style,
     StyleType,
 )
 from rich.theme import Theme
 
-from .pt_utils import rich_to_pt_style
 from .rich_utils import Cmd2HelpFormatter
 from .styles import (
     DEFAULT_ARGPARSE_STYLES,
@@ -37,6 +38,9 @@ from .styles import (
     Cmd2Style,
 )
 
+if TYPE_CHECKING:  # pragma: no cover
+    from prompt_toolkit.styles import Style as PtStyle
+
 # The application-wide theme, defined using Rich's styling system.
 # Use get_theme() to access it.
 # Use reset_theme() and update_theme() to modify it.
@@ -44,7 +48,7 @@ _THEME: Theme | None = None
 
 # The prompt-toolkit version of the theme, synchronized from the Rich theme.
 # Use get_pt_theme() to access it.
-_PT_THEME: PtStyle | None = None
+_PT_THEME: "PtStyle | None" = None
 
 # Maps style names to internal UI component names used by prompt-toolkit.
 # This allows developers to use application-specific style names in update_theme()
@@ -79,11 +83,12 @@ def get_theme() -> Theme:
     return cast(Theme, _THEME)
 
 
-def get_pt_theme() -> PtStyle:
+def get_pt_theme() -> "PtStyle":
     """Get the application-wide prompt-toolkit style. Initializes it on the first call."""
     if _PT_THEME is None:
-        reset_theme()
-    return cast(PtStyle, _PT_THEME)
+        get_theme()
+        _sync_pt_theme()
+    return cast("PtStyle", _PT_THEME)
 
 
 def reset_theme() -> None:
@@ -145,8 +150,11 @@ def _sync_all() -> None:
     for name in Cmd2HelpFormatter.styles.keys() & _THEME.styles.keys():
         Cmd2HelpFormatter.styles[name] = _THEME.styles[name]
 
-    # Synchronize the prompt-toolkit theme
-    _sync_pt_theme()
+    # Synchronize the prompt-toolkit theme if it has been built. Otherwise, get_pt_theme()
+    # builds it the first time it's needed, so applications which never use prompt-toolkit
+    # don't import it.
+    if _PT_THEME is not None:
+        _sync_pt_theme()
 
 
 def _sync_pt_theme() -> None:
@@ -157,6 +165,11 @@ def _sync_pt_theme() -> None:
     if _THEME is None:
         return
 
+    # Imported here since prompt-toolkit is slow to import
+    from prompt_toolkit.styles import Style as PtStyle
+
+    from .pt_utils import rich_to_pt_style
+
     style_rules: list[tuple[str, str]] = []
 
     for name, rich_style in _THEME.styles.items():
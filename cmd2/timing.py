@@ -0,0 +1,180 @@
+"""Classes for recording how long each phase of running a command takes."""
+
+import math
+import time
+from collections import deque
+from collections.abc import (
+    Iterable,
+    Sequence,
+)
+
+# The phases of running a command in onecmd_plus_hooks(), in the order they run. These are plain
+# strings rather than an Enum because looking up Enum members is slow enough to show up in the
+# overhead of running a command.
+
+# Resolving macros into the command line they stand for
+PHASE_EXPANSION = "expansion"
+
+# Parsing the line into a Statement, including alias expansion and reading multiline continuation lines
+PHASE_PARSING = "parsing"
+
+# Running postparsing hooks
+PHASE_POSTPARSING = "postparsing"
+
+# Setting up output redirection and starting a pipe process, then restoring output afterwards
+PHASE_REDIRECTION = "redirection"
+
+# Running precommand hooks and precmd()
+PHASE_PRECMD = "precmd"
+
+# Parsing the command's arguments in @with_argparser or @with_annotated
+PHASE_ARGPARSE = "argparse"
+
+# Running the command function, excluding argparse
+PHASE_COMMAND = "command"
+
+# Running postcommand hooks and postcmd()
+PHASE_POSTCMD = "postcmd"
+
+# Resetting the terminal and running command finalization hooks
+PHASE_FINALIZATION = "finalization"
+
+PHASES: tuple[str, ...] = (
+    PHASE_EXPANSION,
+    PHASE_PARSING,
+    PHASE_POSTPARSING,
+    PHASE_REDIRECTION,
+    PHASE_PRECMD,
+    PHASE_ARGPARSE,
+    PHASE_COMMAND,
+    PHASE_POSTCMD,
+    PHASE_FINALIZATION,
+)
+
+
+class CommandTiming:
+    """How long each phase of running one command took.
+
+    A new instance is created each time [cmd2.Cmd.onecmd_plus_hooks][] runs a command whose timing is
+    recorded. While the command runs, it is available as [cmd2.Cmd.command_timing][] so hooks can
+    inspect the phases recorded so far. Once the command finishes, it is stored in
+    [cmd2.Cmd.last_command_timing][] and in the [cmd2.CommandResult][] returned to pyscripts.
+
+    Time spent waiting for the user to type multiline continuation lines is not counted.
+    """
+
+    __slots__ = ("_mark", "line", "phases")
+
+    def __init__(self, line: str) -> None:
+        """CommandTiming initializer.
+
+        :param line: the command line being run
+        """
+        self.line = line
+
+        # Seconds spent in each phase, in the order the phases ran
+        self.phases: dict[str, float] = {}
+
+        self._mark = time.perf_counter()
+
+    def mark(self, phase: str) -> None:
+        """Attribute the time since the previous mark to a phase.
+
+        A phase can be marked more than once, in which case its times are added together.
+
+        :param phase: the phase which just finished, one of the PHASE_* constants in this module
+        """
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + (now - self._mark)
+        self._mark = now
+
+    def skip(self) -> None:
+        """Exclude the time since the previous mark from all phases."""
+        self._mark = time.perf_counter()
+
+    @property
+    def total(self) -> float:
+        """Total seconds spent in all phases."""
+        return sum(self.phases.values())
+
+    def __repr__(self) -> str:
+        """Return a string representation of this CommandTiming."""
+        phases = ", ".join(f"{phase}={seconds:.6f}" for phase, seconds in self.phases.items())
+        return f"CommandTiming(line={self.line!r}, {phases})"
+
+
+class _NullCommandTiming(CommandTiming):
+    """CommandTiming which records nothing, used for commands whose timing isn't recorded."""
+
+    __slots__ = ()
+
+    def __init__(self) -> None:
+        """_NullCommandTiming initializer."""
+        self.line = ""
+        self.phases = {}
+        self._mark = 0.0
+
+    def mark(self, phase: str) -> None:
+        """Do nothing instead of recording a phase."""
+
+    def skip(self) -> None:
+        """Do nothing instead of resetting the mark."""
+
+    def __repr__(self) -> str:
+        """Return a string representation of this _NullCommandTiming."""
+        return "NULL_COMMAND_TIMING"
+
+
+# Shared by all commands whose timing isn't recorded. Its phases are always empty.
+NULL_COMMAND_TIMING: CommandTiming = _NullCommandTiming()
+
+
+class TimingStats:
+    """The timings of the most recent commands run in a session and percentiles of their phases."""
+
+    def __init__(self, max_records: int = 1000) -> None:
+        """TimingStats initializer.
+
+        :param max_records: how many of the most recent commands to keep
+        """
+        self.records: deque[CommandTiming] = deque(maxlen=max_records)
+
+    def __len__(self) -> int:
+        """Return the number of stored records."""
+        return len(self.records)
+
+    def add(self, timing: CommandTiming) -> None:
+        """Store a command's timing, discarding the oldest one if full."""
+        self.records.append(timing)
+
+    def clear(self) -> None:
+        """Discard all stored records."""
+        self.records.clear()
+
+    @staticmethod
+    def _percentiles(samples: Iterable[float], percents: Sequence[float]) -> list[float]:
+        """Return the nearest-rank percentiles of samples."""
+        ordered = sorted(samples)
+        if not ordered:
+            return [0.0 for _ in percents]
+        count = len(ordered)
+        return [ordered[min(count, max(1, math.ceil(percent / 100 * count))) - 1] for percent in percents]
+
+    def percentiles(self, percents: Sequence[float] = (50, 90, 99)) -> dict[str, list[float]]:
+        """Compute percentiles of each phase and of the total across the stored records.
+
+        A phase which did not run for a command, like argparse for a command without a parser,
+        is not counted for that command.
+
+        :param percents: the percentiles to compute, each between 0 and 100
+        :return: dictionary mapping each phase which ran, in phase order, and then "total"
+                 to its percentiles in seconds, in the order given by percents
+        """
+        results: dict[str, list[float]] = {}
+        for phase in PHASES:
+            samples = [record.phases[phase] for record in self.records if phase in record.phases]
+            if samples:
+                results[phase] = self._percentiles(samples, percents)
+
+        results["total"] = self._percentiles((record.total for record in self.records), percents)
+        return results
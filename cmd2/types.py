@@ -2,6 +2,7 @@
 
 from collections.abc import (
     Callable,
+    Coroutine,
     Mapping,
     Sequence,
 )
@@ -73,6 +74,16 @@ BoundCommandFunc: TypeAlias = Callable[..., bool | None]
 # The 'self' argument can be either a Cmd or CommandSet instance.
 UnboundCommandFunc: TypeAlias = Callable[Concatenate[CmdOrSetT, P], bool | None]
 
+# A bound async cmd2 command function (e.g. async def do_command).
+# It returns a coroutine which cmd2 runs on the application's event loop.
+AsyncBoundCommandFunc: TypeAlias = Callable[..., Coroutine[Any, Any, bool | None]]
+
+# What a command function returns, whether it's async or not
+CommandFuncResult: TypeAlias = bool | Coroutine[Any, Any, bool | None] | None
+
+# A bound cmd2 command function which may be async. This is used where cmd2 accepts either kind.
+AnyBoundCommandFunc: TypeAlias = Callable[..., CommandFuncResult]
+
 
 ##################################################################################################
 # Types used in choices_providers and completers
@@ -85,29 +96,35 @@ ArgTokens: TypeAlias = Mapping[str, Sequence[str]]
 # choices_provider function types
 ##################################################
 
+# What a choices_provider returns. Async choices_providers return a coroutine.
+ChoicesResult: TypeAlias = Union["Choices", Coroutine[Any, Any, "Choices"]]
+
 # Unbound choices_provider function types used by argparse-based completion.
 # These expect a Cmd or CommandSet instance as the first argument.
 UnboundChoicesProvider: TypeAlias = (
     # Basic: (self) -> Choices
-    Callable[[CmdOrSetT], "Choices"]
+    Callable[[CmdOrSetT], ChoicesResult]
     # Context-aware: (self, arg_tokens) -> Choices
-    | Callable[[CmdOrSetT, ArgTokens], "Choices"]
+    | Callable[[CmdOrSetT, ArgTokens], ChoicesResult]
 )
 
 ##################################################
 # completer function types
 ##################################################
 
+# What a completer returns. Async completers return a coroutine.
+CompletionsResult: TypeAlias = Union["Completions", Coroutine[Any, Any, "Completions"]]
+
 # Unbound completer function types used by argparse-based completion.
 # These expect a Cmd or CommandSet instance as the first argument.
 UnboundCompleter: TypeAlias = (
     # Basic: (self, text, line, begidx, endidx) -> Completions
-    Callable[[CmdOrSetT, str, str, int, int], "Completions"]
+    Callable[[CmdOrSetT, str, str, int, int], CompletionsResult]
     # Context-aware: (self, text, line, begidx, endidx, arg_tokens) -> Completions
-    | Callable[[CmdOrSetT, str, str, int, int, ArgTokens], "Completions"]
+    | Callable[[CmdOrSetT, str, str, int, int, ArgTokens], CompletionsResult]
 )
 
 # A bound completer used internally by cmd2 for basic completion logic.
 # The 'self' argument is already tied to an instance and is omitted.
 # Format: (text, line, begidx, endidx) -> Completions
-BoundCompleter: TypeAlias = Callable[[str, str, int, int], "Completions"]
+BoundCompleter: TypeAlias = Callable[[str, str, int, int], CompletionsResult]
@@ -2,32 +2,9 @@
 """A simple example demonstrating calling an async function from a cmd2 app."""
 
 import asyncio
-import concurrent.futures
-import threading
 
 import cmd2
 
-_event_loop = None
-_event_lock = threading.Lock()
-
-
-def run_async(coro) -> concurrent.futures.Future:
-    """Await a coroutine from a synchronous function/method."""
-    global _event_loop  # noqa: PLW0603
-
-    if _event_loop is None:
-        with _event_lock:
-            if _event_loop is None:
-                _event_loop = asyncio.new_event_loop()
-                thread = threading.Thread(
-                    target=_event_loop.run_forever,
-                    name="Async Runner",
-                    daemon=True,
-                )
-                thread.start()
-
-    return asyncio.run_coroutine_threadsafe(coro, _event_loop)
-
 
 async def async_wait(duration: float) -> float:
     """Example async function that is called from a synchronous cmd2 command."""
@@ -46,10 +23,9 @@ class AsyncCallExample(cmd2.Cmd):
 
         Example cmd2 command that calls an async function.
         """
-        waitable = run_async(async_wait(0.1))
         self.poutput("Begin waiting...")
-        # Wait for coroutine to complete and get its return value:
-        res = waitable.result()
+        # Run the coroutine on the app's event loop and wait for its return value
+        res = self.run_coroutine(async_wait(0.1))
         self.poutput(f"Done waiting: {res}")
         return
 
@@ -6,11 +6,8 @@ key-combo press and how to display colored output above the prompt.
 """
 
 import asyncio
-import functools
 import secrets
 import shutil
-import threading
-from collections.abc import Callable
 from typing import (
     Any,
 )
@@ -21,55 +18,6 @@ from rich.text import Text
 
 import cmd2
 
-# Global event loop and lock
-_event_loop: asyncio.AbstractEventLoop | None = None
-_event_lock = threading.Lock()
-
-
-def _get_event_loop() -> asyncio.AbstractEventLoop:
-    """Get or create the background event loop."""
-    global _event_loop  # noqa: PLW0603
-
-    if _event_loop is None:
-        with _event_lock:
-            if _event_loop is None:
-                _event_loop = asyncio.new_event_loop()
-                thread = threading.Thread(
-                    target=_event_loop.run_forever,
-                    name="Async Runner",
-                    daemon=True,
-                )
-                thread.start()
-    return _event_loop
-
-
-def with_async_loop(func: Callable[..., Any], cancel_on_interrupt: bool = True) -> Callable[..., Any]:
-    """Decorate an async ``do_*`` command method to give it access to the event loop.
-
-    This decorator wraps a do_* command method. When the command is executed,
-    it submits the coroutine returned by the method to a background asyncio loop
-    and waits for the result synchronously (blocking the cmd2 loop, as expected
-    for a synchronous command).
-
-    :param func: do_* method to wrap
-    :param cancel_on_interrupt: if True, cancel any running async task on an interrupt;
-                                if False, leave any async task running
-    """
-
-    @functools.wraps(func)
-    def wrapper(self: cmd2.Cmd, *args: Any, **kwargs: Any) -> Any:
-        loop = _get_event_loop()
-        coro = func(self, *args, **kwargs)
-        future = asyncio.run_coroutine_threadsafe(coro, loop)
-        try:
-            return future.result()
-        except KeyboardInterrupt:
-            if cancel_on_interrupt:
-                future.cancel()
-            raise
-
-    return wrapper
-
 
 class AsyncCommandsApp(cmd2.Cmd):
     """Example cmd2 application with async commands."""
@@ -89,15 +37,17 @@ class AsyncCommandsApp(cmd2.Cmd):
         def _(_event: Any) -> None:
             self.handle_control_t(_event)
 
-    @with_async_loop
     async def do_my_async(self, _: cmd2.Statement) -> None:
         """An example async command that simulates work."""
         self.poutput("Starting async work...")
-        # simulate some async I/O
-        await asyncio.sleep(1.0)
+        # simulate some async I/O. Press Ctrl-C to cancel it.
+        try:
+            await asyncio.sleep(1.0)
+        except asyncio.CancelledError:
+            self.poutput("Async work cancelled")
+            raise
         self.poutput("Async work complete!")
 
-    @with_async_loop
     async def do_fetch(self, _: cmd2.Statement) -> None:
         """Simulate fetching data asynchronously."""
         self.poutput("Fetching data...")
@@ -0,0 +1,28 @@
+"""A CommandSet which test_commandset.py registers with a LazyCommandSet, so this module is only imported when it's used."""
+
+import argparse
+
+import cmd2
+
+
+class LazyCommands(cmd2.CommandSet):
+    DEFAULT_CATEGORY = "Lazy"
+
+    def __init__(self, dummy=None) -> None:
+        super().__init__()
+        self._dummy = dummy  # prevents autoload
+
+    def do_lazy_apple(self, _: cmd2.Statement) -> None:
+        """Print apple"""
+        self._cmd.poutput("apple")
+
+    lazy_cut_parser = cmd2.Cmd2ArgumentParser(description="Cut a fruit")
+    lazy_cut_parser.add_argument("fruit", choices=["banana", "cherry"])
+
+    @cmd2.with_argparser(lazy_cut_parser)
+    def do_lazy_cut(self, ns: argparse.Namespace) -> None:
+        self._cmd.poutput(f"cutting {ns.fruit}")
+
+
+class NotACommandSet:
+    pass
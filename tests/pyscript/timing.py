@@ -0,0 +1,2 @@
+result = app("help")
+print(" ".join(result.timing.phases))
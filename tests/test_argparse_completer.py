@@ -1,6 +1,9 @@
 """Unit/functional testing for argparse completer in cmd2"""
 
 import argparse
+import asyncio
+import concurrent.futures
+import threading
 from typing import cast
 
 import pytest
@@ -19,6 +22,7 @@ from cmd2 import (
     with_argparser,
 )
 from cmd2 import rich_utils as ru
+from cmd2.completion import CompletionRequest
 
 from .conftest import (
     run_cmd,
@@ -38,6 +42,16 @@ def standalone_completer(cli: cmd2.Cmd, text: str, line: str, begidx: int, endid
     return cli.basic_complete(text, line, begidx, endidx, standalone_completions)
 
 
+async def async_choice_provider(cli: cmd2.Cmd) -> Choices:
+    await asyncio.sleep(0)
+    return Choices.from_values(standalone_choices)
+
+
+async def async_completer(cli: cmd2.Cmd, text: str, line: str, begidx: int, endidx: int) -> Completions:
+    await asyncio.sleep(0)
+    return cli.basic_complete(text, line, begidx, endidx, standalone_completions)
+
+
 class ArgparseCompleterTester(cmd2.Cmd):
     """Cmd2 app that exercises ArgparseCompleter class"""
 
@@ -371,6 +385,8 @@ class ArgparseCompleterTester(cmd2.Cmd):
     standalone_parser = Cmd2ArgumentParser()
     standalone_parser.add_argument("--provider", help="standalone provider", choices_provider=standalone_choice_provider)
     standalone_parser.add_argument("--completer", help="standalone completer", completer=standalone_completer)
+    standalone_parser.add_argument("--async_provider", help="async provider", choices_provider=async_choice_provider)
+    standalone_parser.add_argument("--async_completer", help="async completer", completer=async_completer)
 
     @with_argparser(standalone_parser)
     def do_standalone(self, args: argparse.Namespace) -> None:
@@ -1139,6 +1155,8 @@ def test_complete_command_help_no_tokens(ac_app) -> None:
     [
         ("--provider", standalone_choices),
         ("--completer", standalone_completions),
+        ("--async_provider", standalone_choices),
+        ("--async_completer", standalone_completions),
     ],
 )
 def test_complete_standalone(ac_app, flag, expected) -> None:
@@ -1433,3 +1451,277 @@ def test_add_parser_custom_completer() -> None:
         name="custom_completer", completer_class=CustomCompleter
     )
     assert custom_completer_parser.completer_class is CustomCompleter
+
+
+class ChoicesCacheApp(cmd2.Cmd):
+    """App whose choices provider counts how many times it's called."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.provider_calls = 0
+
+    def item_provider(self) -> Choices:
+        self.provider_calls += 1
+        return Choices.from_values(["apple", "apricot", "avocado", "banana"])
+
+    cache_parser = Cmd2ArgumentParser()
+    cache_parser.add_argument("first", choices_provider=item_provider)
+    cache_parser.add_argument("second", choices_provider=item_provider)
+
+    @with_argparser(cache_parser)
+    def do_cache(self, args: argparse.Namespace) -> None:
+        pass
+
+
+@pytest.fixture
+def cache_app() -> ChoicesCacheApp:
+    return ChoicesCacheApp()
+
+
+def _prompt_complete(app: cmd2.Cmd, line: str) -> list[str]:
+    """Complete the end of a line the way prompt-toolkit does while the user types it."""
+    from prompt_toolkit.document import Document
+
+    from cmd2.pt_utils import Cmd2Completer
+
+    completer = Cmd2Completer(app)
+    return [completion.text for completion in completer.get_completions(Document(line), None)]
+
+
+def test_choices_cache_narrows_while_typing(cache_app: ChoicesCacheApp) -> None:
+    assert _prompt_complete(cache_app, "cache a") == ["apple", "apricot", "avocado"]
+    assert _prompt_complete(cache_app, "cache ap") == ["apple", "apricot"]
+    assert _prompt_complete(cache_app, "cache apr") == ["apricot "]
+    assert cache_app.provider_calls == 1
+
+    # Deleting characters means the cached matches may be missing some
+    assert _prompt_complete(cache_app, "cache a") == ["apple", "apricot", "avocado"]
+    assert cache_app.provider_calls == 2
+
+    # Moving to the next argument moves the start of the token being completed
+    assert _prompt_complete(cache_app, "cache apple b") == ["banana "]
+    assert _prompt_complete(cache_app, "cache apple ba") == ["banana "]
+    assert cache_app.provider_calls == 3
+
+
+def test_choices_cache_expires(cache_app: ChoicesCacheApp) -> None:
+    cache_app.completion_cache_ttl = 0
+    _prompt_complete(cache_app, "cache a")
+    _prompt_complete(cache_app, "cache ap")
+    assert cache_app.provider_calls == 2
+
+
+def test_choices_cache_only_while_prompting(cache_app: ChoicesCacheApp) -> None:
+    # Calling complete() directly doesn't use the cache
+    for text in ("a", "ap"):
+        line = f"cache {text}"
+        cache_app.complete(text, line, len(line) - len(text), len(line))
+    assert cache_app.provider_calls == 2
+    assert cache_app._thread_state.choices_cache is None
+
+    # A new prompt clears the cache
+    _prompt_complete(cache_app, "cache a")
+    cache_app._choices_cache.clear()
+    _prompt_complete(cache_app, "cache ap")
+    assert cache_app.provider_calls == 4
+
+
+def test_parser_index_shared_and_rebuilt(ac_app) -> None:
+    parser = Cmd2ArgumentParser()
+    parser.add_argument("--first")
+
+    # Completers for the same parser share its index
+    completer = argparse_completer.ArgparseCompleter(parser, ac_app)
+    assert argparse_completer.ArgparseCompleter(parser, ac_app)._index is completer._index
+
+    def complete_flags() -> list[str]:
+        return list(argparse_completer.ArgparseCompleter(parser, ac_app).complete("--", "--", 0, 2, ["--"]).to_strings())
+
+    assert complete_flags() == ["--first", "--help"]
+
+    # Adding arguments, including through a group, rebuilds the index
+    parser.add_argument("--second")
+    parser.add_argument_group().add_argument("--third")
+    assert complete_flags() == ["--first", "--help", "--second", "--third"]
+
+    mutex_group = parser.add_mutually_exclusive_group()
+    mutex_group.add_argument("--fourth")
+    mutex_group.add_argument("--fifth")
+    completer = argparse_completer.ArgparseCompleter(parser, ac_app)
+    assert completer._index.mutex_groups[completer._flag_to_action["--fourth"]] is mutex_group
+    completions = completer.complete("--", "--fourth x --", 10, 12, ["--fourth", "x", "--"])
+    assert "--fifth" not in completions.to_strings()
+
+
+def test_parser_index_with_attached_subcommand(ac_app) -> None:
+    parser = Cmd2ArgumentParser()
+    parser.add_subparsers(dest="subcommand")
+    argparse_completer.ArgparseCompleter(parser, ac_app)
+
+    # Subcommands are looked up in the subcommand action, so the index stays valid
+    index = parser._completer_index
+    record = argparse_utils.SubcommandRecord(name="attached", command="", parser=Cmd2ArgumentParser())
+    parser.attach_subcommand(record)
+    completer = argparse_completer.ArgparseCompleter(parser, ac_app)
+    assert completer._index is index
+    assert completer.complete("at", "at", 0, 2, ["at"]).to_strings() == ("attached",)
+
+
+class SlowProviderApp(cmd2.Cmd):
+    """App whose asynchronous choices providers take as long as the test wants."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.delay = 0.0
+        self.started = threading.Event()
+        self.cancelled = threading.Event()
+
+    async def inventory_provider(self) -> Choices:
+        self.started.set()
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled.set()
+            raise
+        return Choices.from_values(["host1", "host2"])
+
+    async def timeout_provider(self) -> Choices:
+        # Like a lookup whose own timeout expires
+        return await asyncio.wait_for(asyncio.sleep(10), 0.01)
+
+    def future_provider(self) -> "concurrent.futures.Future[Choices]":
+        future: concurrent.futures.Future[Choices] = concurrent.futures.Future()
+        threading.Timer(0.01, future.set_result, [Choices.from_values(["future1", "future2"])]).start()
+        return future
+
+    slow_parser = Cmd2ArgumentParser()
+    slow_parser.add_argument("--host", choices_provider=inventory_provider)
+    slow_parser.add_argument("--timed", choices_provider=inventory_provider, completion_timeout=0.1)
+    slow_parser.add_argument("--future", choices_provider=future_provider)
+    slow_parser.add_argument("--lookup", choices_provider=timeout_provider)
+
+    @with_argparser(slow_parser)
+    def do_slow(self, args: argparse.Namespace) -> None:
+        pass
+
+
+@pytest.fixture
+def slow_app() -> SlowProviderApp:
+    return SlowProviderApp()
+
+
+def test_provider_returns_future(slow_app: SlowProviderApp) -> None:
+    line = "slow --future f"
+    completions = slow_app.complete("f", line, len(line) - 1, len(line))
+    assert completions.to_strings() == ("future1", "future2")
+
+
+def test_completion_timeout(slow_app: SlowProviderApp) -> None:
+    slow_app.delay = 10
+    line = "slow --timed h"
+    completions = slow_app.complete("h", line, len(line) - 1, len(line))
+    assert "Timed out after 0.1 seconds" in completions.error
+    assert slow_app.cancelled.wait(5)
+
+
+def test_superseded_completion_is_cancelled(slow_app: SlowProviderApp) -> None:
+    from prompt_toolkit.document import Document
+
+    from cmd2.pt_utils import Cmd2Completer
+
+    completer = Cmd2Completer(slow_app)
+    results: list[list[str]] = []
+
+    def first_completion() -> None:
+        completions = completer.get_completions(Document("slow --host h"), None)
+        results.append([completion.text for completion in completions])
+
+    slow_app.delay = 10
+    thread = threading.Thread(target=first_completion)
+    thread.start()
+    assert slow_app.started.wait(5)
+
+    # The user typed more, so the first completion is cancelled and its result discarded
+    slow_app.delay = 0
+    second = [completion.text for completion in completer.get_completions(Document("slow --host ho"), None)]
+    thread.join(5)
+    assert not thread.is_alive()
+    assert slow_app.cancelled.is_set()
+    assert results == [[]]
+    assert second == ["host1", "host2"]
+
+
+def test_provider_raises_timeout_error(slow_app: SlowProviderApp) -> None:
+    # The provider's own TimeoutError is reported instead of waiting for it forever
+    line = "slow --lookup "
+    completions = slow_app.complete("", line, len(line), len(line))
+    assert not completions
+    assert "Timed out waiting for results" in completions.error
+
+
+def test_completion_request_loading_hint(monkeypatch) -> None:
+    monkeypatch.setattr(CompletionRequest, "LOADING_HINT_DELAY", 0)
+    calls: list[None] = []
+    request = CompletionRequest(on_loading=lambda: calls.append(None))
+
+    future: concurrent.futures.Future[Choices] = concurrent.futures.Future()
+    with pytest.raises(CompletionError, match="Timed out"):
+        request.wait(future, timeout=0.2)
+    assert calls == [None]
+    assert future.cancelled()
+
+    # A cancelled request doesn't wait
+    request.cancel()
+    with pytest.raises(CompletionError):
+        request.wait(concurrent.futures.Future())
+
+
+class MatcherApp(cmd2.Cmd):
+    """App with arguments which are matched in different ways."""
+
+    hosts = ("web-01", "db-web", "Webster", "mail")
+
+    def host_provider(self) -> Choices:
+        return Choices.from_values(self.hosts)
+
+    matcher_parser = Cmd2ArgumentParser()
+    matcher_parser.add_argument("--default", choices_provider=host_provider)
+    matcher_parser.add_argument("--fuzzy", choices_provider=host_provider, completion_matcher=cmd2.FuzzyMatcher())
+    matcher_parser.add_argument("--anycase", choices=hosts, completion_matcher=cmd2.CaseInsensitiveMatcher())
+
+    @with_argparser(matcher_parser)
+    def do_matcher(self, args: argparse.Namespace) -> None:
+        pass
+
+
+@pytest.fixture
+def matcher_app() -> MatcherApp:
+    return MatcherApp()
+
+
+@pytest.mark.parametrize(
+    ("flag", "text", "expected"),
+    [
+        ("--default", "we", ("web-01",)),
+        # Fuzzy matches are ranked instead of sorted
+        ("--fuzzy", "web", ("web-01", "Webster", "db-web")),
+        ("--fuzzy", "", ("db-web", "mail", "web-01", "Webster")),
+        ("--anycase", "WE", ("web-01", "Webster")),
+    ],
+)
+def test_argument_completion_matcher(matcher_app: MatcherApp, flag: str, text: str, expected: tuple[str, ...]) -> None:
+    line = f"matcher {flag} {text}"
+    completions = matcher_app.complete(text, line, len(line) - len(text), len(line))
+    assert completions.to_strings() == expected
+
+
+def test_app_completion_matcher(matcher_app: MatcherApp) -> None:
+    matcher_app.completion_matcher = cmd2.FuzzyMatcher()
+
+    line = "matcher --default wb"
+    completions = matcher_app.complete("wb", line, len(line) - 2, len(line))
+    assert completions.to_strings() == ("web-01", "Webster", "db-web")
+
+    # Command names are matched the same way
+    completions = matcher_app.complete("mtchr", "mtchr", 0, 5)
+    assert completions.to_strings() == ("matcher",)
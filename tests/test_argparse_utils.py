@@ -89,6 +89,13 @@ def test_apcustom_no_completion_callable_when_nargs_is_0(kwargs) -> None:
         parser.add_argument("--name", action="store_true", **kwargs)
 
 
+@pytest.mark.parametrize("timeout", [0, -1, "5", True])
+def test_apcustom_invalid_completion_timeout(timeout) -> None:
+    parser = Cmd2ArgumentParser()
+    with pytest.raises(ValueError, match="completion_timeout must be a positive number of seconds"):
+        parser.add_argument("name", choices_provider=fake_func, completion_timeout=timeout)
+
+
 def test_apcustom_usage() -> None:
     usage = "A custom usage statement"
     parser = Cmd2ArgumentParser(usage=usage)
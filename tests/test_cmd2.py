@@ -1,10 +1,13 @@
 """Cmd2 unit/functional testing"""
 
+import asyncio
 import io
 import os
 import signal
 import sys
 import tempfile
+import threading
+import time
 from code import InteractiveConsole
 from typing import (
     NoReturn,
@@ -65,6 +68,11 @@ def test_version(base_app) -> None:
     assert cmd2.__version__
 
 
+def test_missing_package_attribute() -> None:
+    with pytest.raises(AttributeError, match="has no attribute 'not_an_attribute'"):
+        _ = cmd2.not_an_attribute
+
+
 def test_complete_in_thread() -> None:
     # Test default
     app_default = cmd2.Cmd()
@@ -547,6 +555,55 @@ def test_run_script_with_utf8_file(base_app, request) -> None:
     assert script_err == manual_err
 
 
+def test_run_script_check(base_app, tmp_path) -> None:
+    script = tmp_path / "check.txt"
+    script.write_text('help\nalias create fake "unclosed\nshortcuts\necho "also unclosed\n', encoding="utf-8")
+
+    base_app.history.clear()
+    out, err = run_cmd(base_app, f"run_script --check {script}")
+    assert not out
+    assert err == [
+        f"{script}:2: No closing quotation",
+        f"{script}:4: No closing quotation",
+        f"Found 2 error(s) in '{script}'",
+    ]
+    assert base_app.last_result is False
+
+    # Nothing in the script was run
+    assert len(base_app.history) == 1
+    assert "fake" not in base_app.aliases
+
+    script.write_text("help\nshortcuts\n", encoding="utf-8")
+    out, err = run_cmd(base_app, f"run_script -c {script}")
+    assert out == [f"No errors found in '{script}'"]
+    assert not err
+    assert base_app.last_result is True
+
+
+def test_run_script_check_multiline_terminator(tmp_path) -> None:
+    app = cmd2.Cmd(multiline_commands=["orate"])
+    script = tmp_path / "check.txt"
+    script.write_text("orate hello;\norate hello\n", encoding="utf-8")
+
+    _out, err = run_cmd(app, f"run_script --check {script}")
+    assert err[0] == f"{script}:2: Multiline command is missing a terminator"
+    assert app.last_result is False
+
+
+def test_run_script_uses_aliases_created_by_script(base_app, tmp_path) -> None:
+    # Lines are parsed as they are run, so aliases created by earlier lines apply to later ones
+    script = tmp_path / "alias.txt"
+    script.write_text("sc\nalias create sc shortcuts\nsc\n", encoding="utf-8")
+
+    base_app.scripts_add_to_history = True
+    base_app.history.clear()
+    _out, err = run_cmd(base_app, f"run_script {script}")
+    assert base_app.last_result is True
+
+    assert "sc is not a recognized command" in err[0]
+    assert base_app.history.get(len(base_app.history)).statement.command == "shortcuts"
+
+
 def test_scripts_add_to_history(base_app, request) -> None:
     test_dir = os.path.dirname(request.module.__file__)
     filename = os.path.join(test_dir, "scripts", "help.txt")
@@ -610,6 +667,21 @@ set allow_style Terminal"""
     assert out == normalize(expected)
 
 
+def test_runcmds_plus_hooks_statements(capsys, mocker) -> None:
+    app = cmd2.Cmd()
+    statement = app.statement_parser.parse("help  -v")
+    parse_mock = mocker.spy(app.statement_parser, "parse")
+
+    app.echo = True
+    app.runcmds_plus_hooks([statement])
+    out, _err = capsys.readouterr()
+
+    # The Statement isn't parsed again and its raw text is echoed
+    parse_mock.assert_not_called()
+    assert out.startswith(f"{app.prompt}help  -v\n")
+    assert app.history.get(1).statement is statement
+
+
 def test_runcmds_plus_hooks_ctrl_c(base_app, capsys) -> None:
     """Test Ctrl-C while in runcmds_plus_hooks"""
     import types
@@ -674,6 +746,14 @@ def test_relative_run_script_with_odd_file_names(base_app, file_name, monkeypatc
     run_script_mock.assert_called_once_with(su.quote(file_name))
 
 
+def test_relative_run_script_check(base_app, monkeypatch) -> None:
+    run_script_mock = mock.MagicMock(name="do_run_script")
+    monkeypatch.setattr("cmd2.Cmd.do_run_script", run_script_mock)
+
+    run_cmd(base_app, "_relative_run_script --check script.txt")
+    run_script_mock.assert_called_once_with(f"--check {su.quote('script.txt')}")
+
+
 def test_relative_run_script_requires_an_argument(base_app) -> None:
     _out, err = run_cmd(base_app, "_relative_run_script")
     assert "Error: the following arguments" in err[1]
@@ -842,6 +922,32 @@ def test_disallow_redirection(redirection_app: RedirectionApp, capsys: pytest.Ca
     assert not os.path.exists(filename)
 
 
+def test_redirection_state_saved_only_when_redirecting(redirection_app: RedirectionApp, mocker) -> None:
+    import types
+
+    redirect_mock = mocker.spy(redirection_app, "_redirect_output")
+    restore_mock = mocker.spy(redirection_app, "_restore_output")
+
+    # A command which doesn't redirect leaves the redirection state alone
+    out, _err = run_cmd(redirection_app, "print_output")
+    assert out == ["poutput"]
+    redirect_mock.assert_not_called()
+    restore_mock.assert_not_called()
+
+    # A command nested in one which redirects has the state to save and restore
+    def do_nested(self, _) -> None:
+        self.onecmd_plus_hooks("print_output")
+        assert self._redirecting
+
+    redirection_app.do_nested = types.MethodType(do_nested, redirection_app)
+    out, _err = run_cmd(redirection_app, "nested | cat")
+    assert out == ["poutput"]
+    assert redirect_mock.call_count == 2
+    assert restore_mock.call_count == 2
+    assert not redirection_app._redirecting
+    assert redirection_app._cur_pipe_proc_reader is None
+
+
 def test_pipe_to_shell(redirection_app: RedirectionApp, capsys: pytest.CaptureFixture[str]) -> None:
     out, err = run_cmd(redirection_app, "print_output | sort")
 
@@ -954,6 +1060,532 @@ def test_base_timing(base_app) -> None:
         assert err[0].startswith("Elapsed: 0:00:00.0")
 
 
+def test_command_timing_phases(base_app) -> None:
+    base_app.record_command_timing = True
+    run_cmd(base_app, "macro create my_macro help {1}")
+    _out, err = run_cmd(base_app, "my_macro alias")
+    assert not err
+
+    timing = base_app.last_command_timing
+    assert timing.line == "my_macro alias"
+    assert list(timing.phases) == [
+        "parsing",
+        "expansion",
+        "redirection",
+        "precmd",
+        "command",
+        "argparse",
+        "postcmd",
+        "finalization",
+    ]
+    assert all(seconds >= 0 for seconds in timing.phases.values())
+    assert timing.total == pytest.approx(sum(timing.phases.values()))
+    assert base_app.command_timing is None
+    assert len(base_app.timing_stats) == 2
+
+
+def test_command_timing_not_stored_without_command(base_app) -> None:
+    base_app.record_command_timing = True
+    run_cmd(base_app, "help")
+    timing = base_app.last_command_timing
+
+    run_cmd(base_app, "")
+    run_cmd(base_app, 'help "unclosed')
+    assert base_app.last_command_timing is timing
+    assert len(base_app.timing_stats) == 1
+
+
+def test_command_timing_nested(base_app, request) -> None:
+    test_dir = os.path.dirname(request.module.__file__)
+    filename = os.path.join(test_dir, "script.txt")
+
+    base_app.record_command_timing = True
+    run_cmd(base_app, f"run_script {filename}")
+    timing = base_app.last_command_timing
+    assert timing.line == f"run_script {filename}"
+
+    # Each command in the script has its own timing
+    assert len(base_app.timing_stats) > 1
+    assert base_app.command_timing is None
+
+
+def test_command_timing_argparse_error(base_app) -> None:
+    base_app.record_command_timing = True
+    run_cmd(base_app, "alias create")
+    assert "argparse" in base_app.last_command_timing.phases
+
+
+def test_command_timing_not_recorded(base_app) -> None:
+    from cmd2.timing import NULL_COMMAND_TIMING
+
+    seen = []
+
+    def postcmd_hook(data: cmd2.plugin.PostcommandData) -> cmd2.plugin.PostcommandData:
+        seen.append(base_app.command_timing)
+        return data
+
+    # Without the timing setting or record_command_timing, commands share a timing which records nothing
+    base_app.register_postcmd_hook(postcmd_hook)
+    run_cmd(base_app, "help")
+    assert seen == [NULL_COMMAND_TIMING]
+    assert not NULL_COMMAND_TIMING.phases
+    assert base_app.last_command_timing is None
+    assert not base_app.timing_stats
+
+
+def test_timing_report_phases(base_app) -> None:
+    run_cmd(base_app, "set timing True")
+    run_cmd(base_app, "set timing_report phases")
+    _out, err = run_cmd(base_app, "help")
+    assert err[0].startswith("Elapsed: 0:00:00")
+    phase_names = [line.split()[0] for line in err[1:]]
+    assert phase_names == ["parsing", "redirection", "precmd", "command", "argparse", "postcmd", "finalization"]
+
+
+def test_timing_report_percentiles(base_app) -> None:
+    run_cmd(base_app, "set timing True")
+    run_cmd(base_app, "set timing_report percentiles")
+    _out, err = run_cmd(base_app, "help")
+    assert err[0].startswith("Elapsed: 0:00:00")
+    assert err[1] == "Percentiles of the last 2 commands"
+    assert "p50 (ms)" in err[2]
+    assert "p99 (ms)" in err[2]
+    assert any(line.split()[0] == "total" for line in err[4:])
+
+
+def test_profile_cpu(base_app) -> None:
+    run_cmd(base_app, "set profile cpu")
+    run_cmd(base_app, "set profile_top 3")
+    out, err = run_cmd(base_app, "help")
+    assert out
+    assert err[0] == "Profile of: help"
+    assert any("function calls" in line for line in err)
+    assert any("due to restriction <3>" in line for line in err)
+    assert not any("by memory allocated" in line for line in err)
+    assert not base_app._thread_state.profile_stack
+
+
+def test_profile_memory(base_app) -> None:
+    import tracemalloc
+
+    run_cmd(base_app, "set profile memory")
+    _out, err = run_cmd(base_app, "help")
+    assert err[0] == "Profile of: help"
+    assert err[1].startswith("Top ")
+    assert err[1].endswith("lines by memory allocated")
+    assert not any("function calls" in line for line in err)
+    assert not tracemalloc.is_tracing()
+
+
+def test_profile_off(base_app) -> None:
+    run_cmd(base_app, "set profile cpu")
+    run_cmd(base_app, "set profile off")
+    _out, err = run_cmd(base_app, "help")
+    assert not err
+
+
+def test_profile_save(base_app, tmp_path) -> None:
+    import pstats
+    import tracemalloc
+
+    profile_dir = tmp_path / "profiles"
+    base_app.profile = "all"
+    base_app.profile_dir = str(profile_dir)
+    _out, err = run_cmd(base_app, "!echo hi")
+    assert err[-1].startswith("Profile saved to: ")
+
+    files = sorted(path.name for path in profile_dir.iterdir())
+    assert len(files) == 3
+    assert files[0].endswith("-shell-after.snapshot")
+    assert files[1].endswith("-shell-before.snapshot")
+    assert files[2].endswith("-shell.pstats")
+
+    pstats.Stats(str(profile_dir / files[2]))
+    tracemalloc.Snapshot.load(str(profile_dir / files[0]))
+
+
+def test_profile_save_error(base_app, tmp_path) -> None:
+    not_a_dir = tmp_path / "file"
+    not_a_dir.write_text("")
+    base_app.profile = "cpu"
+    base_app.profile_dir = str(not_a_dir)
+    _out, err = run_cmd(base_app, "help")
+    assert err[-1].startswith("Unable to save profile: ")
+
+
+def test_profile_nested(base_app, request) -> None:
+    test_dir = os.path.dirname(request.module.__file__)
+    filename = os.path.join(test_dir, "script.txt")
+
+    base_app.profile = "cpu"
+    base_app.profile_top = 100
+    _out, err = run_cmd(base_app, f"run_script {filename}")
+
+    # The command in the script gets its own profile, and the run_script profile is reported last
+    profiled = [line for line in err if line.startswith("Profile of: ")]
+    assert profiled == ["Profile of: help history", f"Profile of: run_script {filename}"]
+
+    # The command run by the script is only counted in its own profile
+    outer_start = err.index(profiled[1])
+    inner_report = err[:outer_start]
+    outer_report = err[outer_start:]
+    assert any("(do_help)" in line for line in inner_report)
+    assert any("(do_run_script)" in line for line in outer_report)
+    assert not any("(do_help)" in line for line in outer_report)
+    assert not base_app._thread_state.profile_stack
+
+    _out, err = run_cmd(base_app, "set timing_report fast")
+    assert "invalid choice" in err[0]
+    assert base_app.timing_report == "total"
+
+
+class JobsApp(cmd2.Cmd):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, allow_background_jobs=True, **kwargs)
+        self.release = threading.Event()
+        self.sleeping = threading.Event()
+        self.sleep_cancelled = threading.Event()
+
+    def do_block(self, _) -> None:
+        """Print to stdout and stderr and block until released or cancelled."""
+        self.poutput("started")
+        # Wait in short steps so the kill command can cancel this
+        while not self.release.wait(0.01):
+            if self.job_cancelled():
+                return
+        self.perror("finished", style=None)
+
+    async def do_sleep(self, _) -> None:
+        """Sleep until cancelled and record the cancellation."""
+        self.sleeping.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            self.sleep_cancelled.set()
+            raise
+
+    def do_result(self, _) -> None:
+        """Set last_result to the command being run."""
+        self.last_result = self.current_command
+
+
+@pytest.fixture
+def jobs_app() -> JobsApp:
+    return JobsApp()
+
+
+def test_jobs_disabled(base_app) -> None:
+    assert not base_app.statement_parser.background_jobs
+    for command in ("jobs", "fg", "wait", "kill"):
+        assert command not in base_app.get_all_commands()
+
+
+def test_job_wait(jobs_app) -> None:
+    out, err = run_cmd(jobs_app, "block &")
+    assert out == ["[1] block"]
+    assert not err
+    job = jobs_app.last_result
+    assert jobs_app.history.get(1).raw == "block &"
+
+    out, _err = run_cmd(jobs_app, "jobs")
+    assert "Running" in out[2]
+    assert out[2].split()[-1] == "block"
+    assert jobs_app.last_result == [job]
+
+    # wait shows the job's stdout and stderr, which weren't written to the application's streams
+    jobs_app.release.set()
+    out, err = run_cmd(jobs_app, "wait")
+    assert out == ["started", "finished", "[1] Done  block"]
+    assert not err
+    assert jobs_app.last_result == [job]
+    assert not jobs_app._alert_queue
+
+    # Finished jobs are removed once they are reported
+    out, _err = run_cmd(jobs_app, "jobs")
+    assert not out
+    assert jobs_app.last_result == []
+
+
+def test_job_alert(jobs_app) -> None:
+    jobs_app.release.set()
+    run_cmd(jobs_app, "block &")
+    job = jobs_app.last_result
+    job.thread.join()
+
+    assert job.status == "Done"
+    assert [alert.msg for alert in jobs_app._alert_queue] == ["started\nfinished\n[1] Done  block"]
+    assert not jobs_app._jobs
+
+
+def test_job_fg(jobs_app) -> None:
+    run_cmd(jobs_app, "block &")
+    job = jobs_app.last_result
+
+    jobs_app.release.set()
+    out, _err = run_cmd(jobs_app, "fg")
+    assert out == ["block", "started", "finished"]
+    assert jobs_app.last_result is job
+    assert job.done
+    assert not jobs_app._jobs
+    assert not jobs_app._alert_queue
+
+
+def test_job_redirect(jobs_app) -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filename = os.path.join(temp_dir, "out.txt")
+        run_cmd(jobs_app, f"block > {filename} &")
+
+        jobs_app.release.set()
+        out, _err = run_cmd(jobs_app, "wait 1")
+        assert out == ["finished", f"[1] Done  block > {filename}"]
+        with open(filename) as f:
+            assert f.read() == "started\n"
+
+
+def test_job_kill(jobs_app) -> None:
+    run_cmd(jobs_app, "block &")
+    job = jobs_app.last_result
+
+    # Keep the job from being reported in an alert so it stays in the jobs table after it finishes
+    job.watched = True
+
+    out, err = run_cmd(jobs_app, "kill 1")
+    assert out == ["[1] Cancellation requested  block"]
+    assert not err
+    assert jobs_app.last_result is True
+    job.thread.join()
+    assert job.status == "Cancelled"
+
+    _out, err = run_cmd(jobs_app, "kill 1")
+    assert err == ["Job 1 is not running"]
+    assert jobs_app.last_result is False
+
+    # The command returned early instead of finishing
+    out, _err = run_cmd(jobs_app, "wait 1")
+    assert out == ["started", "[1] Cancelled  block"]
+    assert not job.cancel()
+
+
+def test_job_kill_async(jobs_app) -> None:
+    run_cmd(jobs_app, "sleep &")
+    job = jobs_app.last_result
+    job.watched = True
+    assert jobs_app.sleeping.wait(5)
+
+    run_cmd(jobs_app, "kill 1")
+    job.thread.join()
+
+    # The coroutine was cancelled, which isn't reported as an error
+    assert jobs_app.sleep_cancelled.is_set()
+    assert job.status == "Cancelled"
+    out, err = run_cmd(jobs_app, "wait 1")
+    assert out == ["[1] Cancelled  sleep"]
+    assert not err
+
+
+def test_worker_thread_shares_state(jobs_app) -> None:
+    # A thread the application starts itself, rather than a background job, shares the application's
+    # state, so the main thread's SIGINT handler can see its redirection
+    stdout = jobs_app.stdout
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filename = os.path.join(temp_dir, "out.txt")
+        worker = threading.Thread(target=jobs_app.onecmd_plus_hooks, args=(f"block > {filename}",))
+        worker.start()
+        try:
+            for _ in range(500):
+                if jobs_app._redirecting:
+                    break
+                time.sleep(0.01)
+            assert jobs_app._redirecting
+            assert jobs_app.stdout is not stdout
+        finally:
+            jobs_app.release.set()
+            worker.join()
+
+    assert not jobs_app._redirecting
+    assert jobs_app.stdout is stdout
+
+    # A background job's redirection is its own
+    jobs_app.release.clear()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filename = os.path.join(temp_dir, "out.txt")
+        run_cmd(jobs_app, f"block > {filename} &")
+        job = jobs_app.last_result
+        assert not jobs_app._redirecting
+        jobs_app.release.set()
+        job.wait()
+
+
+@pytest.mark.parametrize("mode", ["cpu", "memory"])
+def test_job_profile_concurrent(jobs_app, mode) -> None:
+    import tracemalloc
+
+    run_cmd(jobs_app, f"set profile {mode}")
+    run_cmd(jobs_app, "block &")
+    first = jobs_app.last_result
+    for _ in range(500):
+        if "started" in first.output.getvalue():
+            break
+        time.sleep(0.01)
+
+    # cProfile and tracemalloc are shared by all threads, so the second job isn't profiled while the first one is
+    run_cmd(jobs_app, "block &")
+    second = jobs_app.last_result
+    jobs_app.release.set()
+    out, _err = run_cmd(jobs_app, "wait 1 2")
+
+    first_out = out[: out.index("[1] Done  block") + 1]
+    second_out = out[len(first_out) :]
+    assert "Profile of: block &" in first_out
+    assert "Profile of: block &" not in second_out
+    assert "Not profiling block: a command in another thread is being profiled" in second_out
+    assert first.status == second.status == "Done"
+
+    # Profiling works again once the first job finished
+    _out, err = run_cmd(jobs_app, "help")
+    assert err[0] == "Profile of: help"
+    assert not tracemalloc.is_tracing()
+
+
+def test_job_cancelled_outside_job(jobs_app) -> None:
+    assert not jobs_app.job_cancelled()
+
+
+def test_job_state(jobs_app) -> None:
+    run_cmd(jobs_app, "result &")
+    job = jobs_app.last_result
+    job.thread.join()
+
+    # The job's command set its own thread's values, not those of the commands run at the prompt
+    assert jobs_app.last_result is job
+    assert jobs_app.current_command is None
+    assert jobs_app.last_command_timing is None
+
+    run_cmd(jobs_app, "result")
+    assert jobs_app.last_result.command == "result"
+    assert not jobs_app.last_result.background
+
+
+@pytest.mark.parametrize(
+    ("command", "error"),
+    [
+        ("fg", "No background jobs"),
+        ("fg 3", "No such job: 3"),
+        ("wait 1 3", "No such job: 1"),
+        ("kill 3", "No such job: 3"),
+    ],
+)
+def test_job_not_found(jobs_app, command, error) -> None:
+    _out, err = run_cmd(jobs_app, command)
+    assert err == [error]
+    assert not jobs_app.last_result
+
+
+class AsyncApp(cmd2.Cmd):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.cancelled = False
+
+    async def do_greet(self, statement: cmd2.Statement) -> None:
+        await asyncio.sleep(0)
+        self.poutput(f"hello {statement.args}")
+
+    @cmd2.with_argument_list
+    async def do_stop(self, _: list[str]) -> bool:
+        await asyncio.sleep(0)
+        return True
+
+    async def do_interrupt(self, _) -> None:
+        """Press Ctrl-C while waiting and record whether the wait was cancelled."""
+        loop = asyncio.get_running_loop()
+        loop.call_soon(signal.raise_signal, signal.SIGINT)
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+    async def do_nested(self, _) -> None:
+        self.onecmd_plus_hooks("greet nested")
+
+    async def complete_greet(self, text, line, begidx, endidx) -> cmd2.Completions:
+        await asyncio.sleep(0)
+        return self.basic_complete(text, line, begidx, endidx, ["world", "there"])
+
+
+@pytest.fixture
+def async_app() -> AsyncApp:
+    return AsyncApp()
+
+
+def test_async_command(async_app) -> None:
+    assert not async_app._event_loop_thread.running
+    out, err = run_cmd(async_app, "greet world")
+    assert out == ["hello world"]
+    assert not err
+    assert async_app._event_loop_thread.running
+
+    # The value the coroutine returns tells the application whether to stop
+    assert async_app.onecmd_plus_hooks("stop")
+
+
+def test_async_completer(async_app) -> None:
+    completions = async_app.complete("th", "greet th", 6, 8)
+    assert completions.to_strings() == ("there",)
+
+
+def test_async_command_nested(async_app) -> None:
+    _out, err = run_cmd(async_app, "nested")
+    assert "RuntimeError" in err[0]
+
+
+def test_run_coroutine(async_app) -> None:
+    async def add(a: int, b: int) -> int:
+        await asyncio.sleep(0)
+        return a + b
+
+    assert async_app.run_coroutine(add(1, 2)) == 3
+    assert async_app.get_event_loop() is async_app._event_loop_thread.get_loop()
+
+
+def test_run_coroutine_raises_timeout_error(async_app) -> None:
+    async def time_out() -> None:
+        await asyncio.wait_for(asyncio.sleep(10), 0.01)
+
+    # The coroutine's own TimeoutError reaches the caller instead of being mistaken for waiting longer
+    with pytest.raises(TimeoutError):
+        async_app.run_coroutine(time_out())
+
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="SIGINT can't be raised this way on Windows")
+def test_async_command_sigint(async_app) -> None:
+    original_handler = signal.signal(signal.SIGINT, async_app.sigint_handler)
+    try:
+        async_app.onecmd_plus_hooks("interrupt")
+    finally:
+        signal.signal(signal.SIGINT, original_handler)
+    assert async_app.cancelled
+
+
+def test_cmdloop_closes_event_loop(async_app, monkeypatch) -> None:
+    loop = async_app.get_event_loop()
+
+    # A coroutine left running is cancelled when the loop closes
+    task = asyncio.run_coroutine_threadsafe(asyncio.sleep(10), loop)
+
+    read_command_mock = mock.MagicMock(name="_read_command_line", return_value="quit")
+    monkeypatch.setattr("cmd2.Cmd._read_command_line", read_command_mock)
+    async_app.cmdloop()
+
+    assert task.cancelled()
+    assert loop.is_closed()
+    assert not async_app._event_loop_thread.running
+
+    # The loop starts again when it's needed
+    out, _err = run_cmd(async_app, "greet again")
+    assert out == ["hello again"]
+
+
 def test_base_debug(base_app) -> None:
     # Purposely set the editor to None
     base_app.editor = None
@@ -1174,6 +1806,43 @@ def test_restore_termios_settings(base_app, monkeypatch, is_tty, settings_set, r
         termios_mock.tcsetattr.assert_not_called()
 
 
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="termios is not available on Windows")
+def test_restore_termios_settings_unchanged(base_app, monkeypatch) -> None:
+    """Test that terminal settings aren't written when they haven't changed."""
+    import termios
+
+    termios_settings = ["dummy settings"]
+    termios_mock = mock.MagicMock()
+    termios_mock.error = termios.error
+    termios_mock.tcgetattr.return_value = list(termios_settings)
+    monkeypatch.setitem(sys.modules, "termios", termios_mock)
+
+    base_app._initial_termios_settings = termios_settings
+    monkeypatch.setattr(base_app.stdin, "isatty", lambda: True)
+    monkeypatch.setattr(base_app.stdin, "fileno", lambda: 0)
+
+    base_app.onecmd_plus_hooks("help")
+    termios_mock.tcgetattr.assert_called_once_with(0)
+    termios_mock.tcsetattr.assert_not_called()
+
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="termios is not available on Windows")
+def test_restore_termios_settings_background_thread(base_app, monkeypatch) -> None:
+    """Test that terminal settings aren't touched by commands run outside of the main thread, like background jobs."""
+    termios_mock = mock.MagicMock()
+    monkeypatch.setitem(sys.modules, "termios", termios_mock)
+
+    base_app._initial_termios_settings = ["dummy settings"]
+    monkeypatch.setattr(base_app.stdin, "isatty", lambda: True)
+    monkeypatch.setattr(base_app.stdin, "fileno", lambda: 0)
+
+    thread = threading.Thread(target=base_app.onecmd_plus_hooks, args=("help",))
+    thread.start()
+    thread.join()
+    termios_mock.tcgetattr.assert_not_called()
+    termios_mock.tcsetattr.assert_not_called()
+
+
 def test_sigint_handler(base_app) -> None:
     # No KeyboardInterrupt should be raised when using sigint_protection
     with base_app.sigint_protection:
@@ -1288,8 +1957,8 @@ def test_async_alert(base_app: cmd2.Cmd, msg: str, prompt: str, is_stale: bool)
     import time
 
     with (
-        mock.patch("cmd2.cmd2.print_formatted_text") as mock_print,
-        mock.patch("cmd2.cmd2.get_app") as mock_get_app,
+        mock.patch("prompt_toolkit.print_formatted_text") as mock_print,
+        mock.patch("prompt_toolkit.application.get_app") as mock_get_app,
     ):
         # Set up the chained mock: get_app() returns mock_app, which has invalidate()
         mock_app = mock.MagicMock()
@@ -1349,8 +2018,8 @@ def test_async_alert_rich(base_app: cmd2.Cmd) -> None:
     table.add_row("Value")
 
     with (
-        mock.patch("cmd2.cmd2.print_formatted_text") as mock_print,
-        mock.patch("cmd2.cmd2.get_app") as mock_get_app,
+        mock.patch("prompt_toolkit.print_formatted_text") as mock_print,
+        mock.patch("prompt_toolkit.application.get_app") as mock_get_app,
     ):
         mock_app = mock.MagicMock()
         mock_get_app.return_value = mock_app
@@ -1873,7 +2542,7 @@ def test_select_ctrl_c(outsim_app, monkeypatch) -> None:
 def test_select_choice_tty(outsim_app, monkeypatch) -> None:
     # Mock choice to return the first option
     choice_mock = mock.MagicMock(name="choice", return_value="sweet")
-    monkeypatch.setattr("cmd2.cmd2.choice", choice_mock)
+    monkeypatch.setattr("prompt_toolkit.shortcuts.choice", choice_mock)
 
     prompt = "Sauce? "
     options = ["sweet", "salty"]
@@ -1893,7 +2562,7 @@ def test_select_choice_tty(outsim_app, monkeypatch) -> None:
 def test_select_choice_tty_ctrl_c(outsim_app, monkeypatch) -> None:
     # Mock choice to raise KeyboardInterrupt
     choice_mock = mock.MagicMock(name="choice", side_effect=KeyboardInterrupt)
-    monkeypatch.setattr("cmd2.cmd2.choice", choice_mock)
+    monkeypatch.setattr("prompt_toolkit.shortcuts.choice", choice_mock)
 
     prompt = "Sauce? "
     options = ["sweet", "salty"]
@@ -2417,8 +3086,8 @@ def test_read_input_passes_all_arguments_to_resolver(base_app):
 
 
 def test_read_input_history_is_passed_to_session(base_app, monkeypatch, mocker):
-    mock_session_cls = mocker.patch("cmd2.cmd2.PromptSession")
-    mock_history_cls = mocker.patch("cmd2.cmd2.InMemoryHistory")
+    mock_session_cls = mocker.patch("prompt_toolkit.shortcuts.PromptSession")
+    mock_history_cls = mocker.patch("prompt_toolkit.history.InMemoryHistory")
     read_raw_mock = mocker.MagicMock(name="_read_raw_input", return_value="command")
     monkeypatch.setattr("cmd2.Cmd._read_raw_input", read_raw_mock)
 
@@ -2459,7 +3128,7 @@ def test_read_raw_input_session_usage_and_restore(base_app, mocker):
 
     # Mock patch_stdout to prevent it from attempting to access the Windows
     # console buffer in a Windows test environment.
-    with mock.patch("cmd2.cmd2.patch_stdout"):
+    with mock.patch("prompt_toolkit.patch_stdout.patch_stdout"):
         result = base_app._read_raw_input("prompt> ", mock_session)
 
     assert result == command_text
@@ -2487,7 +3156,7 @@ def test_read_raw_input_restores_on_error(base_app, mocker):
 
     # Mock patch_stdout to prevent it from attempting to access the Windows
     # console buffer in a Windows test environment.
-    with mock.patch("cmd2.cmd2.patch_stdout"), pytest.raises(KeyboardInterrupt):
+    with mock.patch("prompt_toolkit.patch_stdout.patch_stdout"), pytest.raises(KeyboardInterrupt):
         base_app._read_raw_input("prompt> ", mock_session)
 
     # Even though an error occurred, the finally block restored active session
@@ -2867,6 +3536,48 @@ def test_get_commands_aliases_and_macros_choices(base_app: cmd2.Cmd) -> None:
     assert no_doc_item.display_meta == ""
 
 
+def _complete_command_name(app: cmd2.Cmd, text: str) -> list[str]:
+    return list(app.complete(text, text, 0, len(text)).to_strings())
+
+
+def test_command_name_index(base_app: cmd2.Cmd) -> None:
+    # The index is reused until something it depends on changes
+    index = base_app._get_command_name_index()
+    assert base_app._get_command_name_index() is index
+    assert _complete_command_name(base_app, "he") == ["help"]
+
+    # Matches are in display order, which ignores case, rather than the order of the index
+    base_app.aliases["Hx"] = "help"
+    base_app.aliases["ha"] = "help"
+    assert _complete_command_name(base_app, "") == list(base_app._get_commands_aliases_and_macros_choices().to_strings())
+    assert _complete_command_name(base_app, "h") == ["ha", "help", "history"]
+    assert _complete_command_name(base_app, "H") == ["Hx"]
+
+    run_cmd(base_app, "macro create hm help")
+    assert "hm" in _complete_command_name(base_app, "h")
+    del base_app.macros["hm"]
+    assert "hm" not in _complete_command_name(base_app, "h")
+
+    base_app.hidden_commands.append("history")
+    assert "history" not in _complete_command_name(base_app, "h")
+
+    base_app.disable_command("help", "disabled")
+    assert "help" not in _complete_command_name(base_app, "h")
+    base_app.enable_command("help")
+    assert "help" in _complete_command_name(base_app, "h")
+
+
+def test_command_name_index_falls_back(base_app: cmd2.Cmd) -> None:
+    # Text without matches still shows the hint from the argparse completer
+    completions = base_app.complete("zzz", "zzz", 0, 3)
+    assert not completions
+    assert "command, alias, or macro name" in completions.error
+
+    # So does text which can't be a command name
+    completions = base_app.complete("he|", "he|", 0, 3)
+    assert not completions
+
+
 def test_get_settable_choices(base_app: cmd2.Cmd) -> None:
     choices = base_app._get_settable_choices()
     assert len(choices) == len(base_app.settables)
@@ -2979,6 +3690,14 @@ def test_alias_create_with_macro_name(base_app) -> None:
     assert base_app.last_result is False
 
 
+def test_alias_create_warns_about_cycle(base_app) -> None:
+    run_cmd(base_app, "alias create first second")
+    out, err = run_cmd(base_app, "alias create second first arg")
+    assert out == normalize("Alias 'second' created")
+    assert err == normalize("Alias 'second' expands into a cycle: second -> first -> second")
+    assert base_app.last_result is True
+
+
 def test_alias_that_resolves_into_comment(base_app) -> None:
     # Create the alias
     out, err = run_cmd(base_app, "alias create fake " + constants.COMMENT_CHAR + " blah blah")
@@ -3135,6 +3854,20 @@ def test_macro_create_with_escaped_args(base_app) -> None:
     assert err[0].startswith("No help on {1}")
 
 
+def test_macro_escaped_arg_matches_normal_arg(base_app) -> None:
+    # An unescaped {{1}} must not be mistaken for the {1} placeholder
+    run_cmd(base_app, "macro create fake help {1} {{1}}")
+    statement = base_app.statement_parser.parse("fake alias")
+    assert base_app._resolve_macro(statement) == "help alias {1}"
+
+
+def test_macro_arg_value_contains_placeholder(base_app) -> None:
+    # An argument value which looks like a placeholder must not be replaced
+    run_cmd(base_app, "macro create fake help {1} {2}")
+    statement = base_app.statement_parser.parse("fake {2} alias > out.txt")
+    assert base_app._resolve_macro(statement) == "help {2} alias> out.txt"
+
+
 def test_macro_usage_with_missing_args(base_app) -> None:
     # Create the macro
     out, err = run_cmd(base_app, "macro create fake help {1} {2}")
@@ -3318,10 +4051,51 @@ def test_should_continue_multiline(multiline_app: MultilineApp, line: str, shoul
     run_cmd(multiline_app, "macro create multi_mac orate {1}")
     run_cmd(multiline_app, "macro create wrapper_mac multi_mac {1} {2}")
 
-    with mock.patch("cmd2.cmd2.get_app", return_value=mock_app):
+    with mock.patch("prompt_toolkit.application.get_app", return_value=mock_app):
         assert multiline_app._should_continue_multiline() is should_continue
 
 
+def test_should_continue_multiline_scans_only_new_lines(multiline_app: MultilineApp) -> None:
+    mock_buffer = mock.MagicMock()
+    mock_app = mock.MagicMock()
+    mock_app.current_buffer = mock_buffer
+
+    lines = ["orate 'quoted", "text;", "more'", "args", "done;"]
+    expected = [True, True, True, True, False]
+
+    with (
+        mock.patch("prompt_toolkit.application.get_app", return_value=mock_app),
+        mock.patch.object(multiline_app.statement_parser, "parse", wraps=multiline_app.statement_parser.parse) as parse_mock,
+    ):
+        for index, should_continue in enumerate(expected):
+            mock_buffer.text = "\n".join(lines[: index + 1])
+            assert multiline_app._should_continue_multiline() is should_continue
+
+        # Only the first and last lines required a full parse
+        assert parse_mock.call_count == 2
+
+        # Editing an earlier line requires a full parse again
+        mock_buffer.text = "orate edited\nline"
+        assert multiline_app._should_continue_multiline() is True
+        assert parse_mock.call_count == 3
+
+
+def test_multiline_complete_statement_parses_once_per_check(multiline_app, monkeypatch) -> None:
+    num_lines = 50
+    read_command_mock = mock.MagicMock(name="_read_command_line", side_effect=[f"line {i}" for i in range(num_lines)] + [";"])
+    monkeypatch.setattr("cmd2.Cmd._read_command_line", read_command_mock)
+    parse_mock = mock.MagicMock(wraps=multiline_app.statement_parser.parse)
+    monkeypatch.setattr(multiline_app.statement_parser, "parse", parse_mock)
+
+    statement = multiline_app._complete_statement("orate first")
+    assert statement.command == "orate"
+    assert statement.terminator == ";"
+    assert statement.arg_list[-1] == f"{num_lines - 1}"
+
+    # One parse for the first line and one after the terminator arrived
+    assert parse_mock.call_count == 2
+
+
 @with_ansi_style(ru.AllowStyle.ALWAYS)
 def test_perror_style(base_app, capsys) -> None:
     msg = "testing..."
@@ -3595,7 +4369,7 @@ def test_ppaged_terminal_restoration_oserror(outsim_app, monkeypatch) -> None:
 
 def test_ppretty(base_app: cmd2.Cmd) -> None:
     # Mock the Pretty class and the print_to() method
-    with mock.patch("cmd2.cmd2.Pretty") as mock_pretty, mock.patch.object(cmd2.Cmd, "print_to") as mock_print_to:
+    with mock.patch("rich.pretty.Pretty") as mock_pretty, mock.patch.object(cmd2.Cmd, "print_to") as mock_print_to:
         # Set up the mock return value for Pretty
         mock_pretty_obj = mock.Mock()
         mock_pretty.return_value = mock_pretty_obj
@@ -3689,6 +4463,107 @@ def test_get_all_commands(base_app) -> None:
     assert commands == expected_commands
 
 
+def test_command_registry_refresh(base_app, mocker) -> None:
+    import types
+
+    get_names_spy = mocker.spy(base_app, "get_names")
+
+    # The registry is only built once while commands don't change
+    base_app.get_all_commands()
+    base_app.get_visible_commands()
+    base_app.get_help_topics()
+    assert get_names_spy.call_count <= 1
+    get_names_spy.reset_mock()
+
+    def do_new_cmd(self, _) -> None:
+        pass
+
+    def help_new_cmd(self) -> None:
+        pass
+
+    # Setting and deleting instance attributes updates the registry without finding the names again
+    base_app.do_new_cmd = types.MethodType(do_new_cmd, base_app)
+    base_app.help_new_cmd = types.MethodType(help_new_cmd, base_app)
+    assert "new_cmd" in base_app.get_all_commands()
+    assert "new_cmd" in base_app.get_visible_commands()
+    assert "new_cmd" in base_app.get_help_topics()
+    assert base_app.get_command_info("new_cmd").func == base_app.do_new_cmd
+
+    # So does replacing one with a value which isn't callable
+    base_app.do_new_cmd = None
+    assert "new_cmd" not in base_app.get_all_commands()
+
+    del base_app.do_new_cmd
+    del base_app.help_new_cmd
+    assert "new_cmd" not in base_app.get_all_commands()
+    assert "new_cmd" not in base_app.get_help_topics()
+    assert not get_names_spy.call_count
+
+    # Disabling and enabling a command updates it too
+    base_app.disable_command("history", "disabled")
+    assert "history" not in base_app.get_visible_commands()
+    assert base_app.get_command_info("history").category == base_app.DEFAULT_CATEGORY
+    base_app.enable_command("history")
+    assert "history" in base_app.get_visible_commands()
+    assert not get_names_spy.call_count
+
+    # Changing the instance's class finds the names again
+    class SubApp(cmd2.Cmd):
+        pass
+
+    SubApp.do_new_cmd = do_new_cmd
+    base_app.__class__ = SubApp
+    assert "new_cmd" in base_app.get_all_commands()
+    assert get_names_spy.call_count == 1
+
+    # Changes to a class need a refresh
+    SubApp.do_new_cmd = None
+    assert "new_cmd" in base_app.get_all_commands()
+    base_app.refresh_commands()
+    assert "new_cmd" not in base_app.get_all_commands()
+
+
+def test_command_registry_get_names_override() -> None:
+    class DynamicApp(cmd2.Cmd):
+        def __init__(self) -> None:
+            self.extra_names: list[str] = []
+            super().__init__()
+
+        def get_names(self) -> list[str]:
+            return super().get_names() + self.extra_names
+
+        def __getattr__(self, name: str):
+            if name in self.__dict__.get("extra_names", []):
+                return lambda _statement: None
+            raise AttributeError(name)
+
+    app = DynamicApp()
+    assert "dynamic" not in app.get_all_commands()
+
+    # Commands provided by an overridden get_names() are found without refreshing the registry
+    app.extra_names.append("do_dynamic")
+    assert "dynamic" in app.get_all_commands()
+
+
+def test_get_command_info(base_app) -> None:
+    info = base_app.get_command_info("help")
+    assert info.name == "help"
+    assert info.func == base_app.do_help
+    assert info.category == base_app.DEFAULT_CATEGORY
+    assert info.command_set is None
+    assert not info.hidden
+    assert not info.disabled
+
+    assert base_app.get_command_info("_relative_run_script").hidden
+    assert base_app.get_command_info("fake") is None
+
+    base_app.disable_command("help", "disabled")
+    info = base_app.get_command_info("help")
+    assert info.disabled
+    assert info.func != base_app.disabled_commands["help"].command_func
+    assert info.category == base_app.DEFAULT_CATEGORY
+
+
 def test_get_help_topics(base_app) -> None:
     # Verify that the base app has no additional help_foo methods
     custom_help = base_app.get_help_topics()
@@ -4324,6 +5199,10 @@ def test_completekey_empty_string() -> None:
         create_session_mock.return_value = mock.MagicMock(spec=PromptSession)
 
         app = cmd2.Cmd(completekey="")
+        create_session_mock.assert_not_called()
+
+        # The session is created when it's first accessed
+        _ = app.main_session
         create_session_mock.assert_called_once()
         _, kwargs = create_session_mock.call_args
         assert kwargs["completekey"] == app.DEFAULT_COMPLETEKEY
@@ -4333,14 +5212,14 @@ def test_create_main_session_exception(monkeypatch):
     # Mock PromptSession to raise ValueError on first call, then succeed
     valid_session_mock = mock.MagicMock(spec=PromptSession)
     mock_session = mock.MagicMock(side_effect=[ValueError, valid_session_mock])
-    monkeypatch.setattr("cmd2.cmd2.PromptSession", mock_session)
+    monkeypatch.setattr("prompt_toolkit.shortcuts.PromptSession", mock_session)
 
     # Mock isatty to ensure we enter the try block
     with (
         mock.patch("sys.stdin.isatty", return_value=True),
         mock.patch("sys.stdout.isatty", return_value=True),
     ):
-        cmd2.Cmd()
+        _ = cmd2.Cmd().main_session
 
     # Check that fallback to DummyInput/Output happened
     assert mock_session.call_count == 2
@@ -4445,14 +5324,14 @@ def test_create_main_session_no_console_error(monkeypatch):
     # Mock PromptSession to raise NoConsoleScreenBufferError on first call, then succeed
     valid_session_mock = mock.MagicMock(spec=PromptSession)
     mock_session = mock.MagicMock(side_effect=[NoConsoleScreenBufferError, valid_session_mock])
-    monkeypatch.setattr("cmd2.cmd2.PromptSession", mock_session)
+    monkeypatch.setattr("prompt_toolkit.shortcuts.PromptSession", mock_session)
 
     # Mock isatty to ensure we enter the try block
     with (
         mock.patch("sys.stdin.isatty", return_value=True),
         mock.patch("sys.stdout.isatty", return_value=True),
     ):
-        cmd2.Cmd()
+        _ = cmd2.Cmd().main_session
 
     # Check that fallback to DummyInput/Output happened
     assert mock_session.call_count == 2
@@ -4477,8 +5356,8 @@ def test_create_main_session_with_custom_tty() -> None:
 
     # Check if the streams were wrapped
     with (
-        mock.patch("cmd2.cmd2.create_input") as mock_create_input,
-        mock.patch("cmd2.cmd2.create_output") as mock_create_output,
+        mock.patch("prompt_toolkit.input.create_input") as mock_create_input,
+        mock.patch("prompt_toolkit.output.create_output") as mock_create_output,
     ):
         app = cmd2.Cmd()
         app.stdin = custom_stdin
@@ -4516,6 +5395,59 @@ def test_create_main_session_stdout_non_tty() -> None:
     assert isinstance(app.main_session.output, DummyOutput)
 
 
+def test_main_session_created_on_first_use(monkeypatch) -> None:
+    # Restore allow_style when the test ends
+    monkeypatch.setattr(ru, "ALLOW_STYLE", ru.ALLOW_STYLE)
+
+    app = cmd2.Cmd()
+    run_cmd(app, "help")
+    run_cmd(app, "set allow_style Never")
+    run_cmd(app, "history --clear")
+    assert app._main_session is None
+
+    session = app.main_session
+    assert isinstance(session, PromptSession)
+    assert app.main_session is session
+    assert app.active_session is session
+
+
+def test_headless_session_uses_dummy_drivers() -> None:
+    with (
+        mock.patch("sys.stdin.isatty", return_value=True),
+        mock.patch("sys.stdout.isatty", return_value=True),
+    ):
+        app = cmd2.Cmd(headless=True)
+        assert isinstance(app.main_session.input, DummyInput)
+        assert isinstance(app.main_session.output, DummyOutput)
+
+
+def test_headless_cmdloop() -> None:
+    stdin = io.StringIO("echo_line\nquit\n")
+    stdin.isatty = mock.MagicMock(return_value=True)  # type: ignore[method-assign]
+    app = cmd2.Cmd(headless=True, stdin=stdin, stdout=io.StringIO(), allow_cli_args=False)
+
+    commands = []
+    app.default = lambda statement: commands.append(statement.command)  # type: ignore[method-assign]
+    app.cmdloop()
+
+    assert commands == ["echo_line"]
+    assert app._main_session is None
+
+
+def test_headless_read_input() -> None:
+    app = cmd2.Cmd(headless=True, stdin=io.StringIO("first\nsecond\n"))
+    assert app.read_input("> ", choices=["first"]) == "first"
+    assert app.read_secret("> ") == "second"
+    assert app._main_session is None
+
+
+def test_headless_complete() -> None:
+    app = cmd2.Cmd(headless=True)
+    completions = app.complete("he", "he", 0, 2)
+    assert "help" in completions.to_strings()
+    assert app._main_session is None
+
+
 def test_no_console_screen_buffer_error_dummy():
     from cmd2.cmd2 import NoConsoleScreenBufferError
 
@@ -4529,7 +5461,7 @@ def test_read_command_line_dynamic_prompt(base_app: cmd2.Cmd) -> None:
 
     # Mock patch_stdout to prevent it from attempting to access the Windows
     # console buffer in a Windows test environment.
-    with mock.patch("cmd2.cmd2.patch_stdout"):
+    with mock.patch("prompt_toolkit.patch_stdout.patch_stdout"):
         # Set input to something other than DummyInput so _read_raw_input()
         # will go down the TTY route.
         mock_session = mock.MagicMock()
@@ -4631,6 +5563,26 @@ def test_auto_suggest_default():
     assert isinstance(app.main_session.auto_suggest, AutoSuggestFromHistory)
 
 
+def test_command_parsers_shared() -> None:
+    app = cmd2.Cmd()
+    other_app = cmd2.Cmd()
+    assert app.command_parsers.get(app.do_help) is other_app.command_parsers.get(other_app.do_help)
+
+    # Subcommands are attached to each app's own copy of the alias parser
+    assert app.command_parsers.get(app.do_alias) is not other_app.command_parsers.get(other_app.do_alias)
+
+    # An app's own copy replaces the shared parser until it's removed
+    help_parser = app.command_parsers.get(app.do_help)
+    own_help_parser = app.command_parsers.get_for_update(app.do_help)
+    assert own_help_parser is not help_parser
+    assert app.command_parsers.get(app.do_help) is own_help_parser
+    assert app.command_parsers.get_for_update(app.do_help) is own_help_parser
+
+    app.command_parsers.remove(app.do_help)
+    assert app.command_parsers.get(app.do_help) is help_parser
+    assert app.command_parsers.get_for_update(app.onecmd) is None
+
+
 def test_subcommand_attachment() -> None:
     import argparse
 
@@ -4646,10 +5598,12 @@ def test_subcommand_attachment() -> None:
             pass
 
     app = SubcmdApp()
+    other_app = SubcmdApp()
 
-    # Verify root exists and uses argparse
-    root_parser = app.command_parsers.get(app.do_root)
-    assert root_parser is not None
+    # Verify root exists and uses argparse. Its parser is shared until one app modifies it.
+    shared_root_parser = app.command_parsers.get(app.do_root)
+    assert shared_root_parser is not None
+    assert shared_root_parser is other_app.command_parsers.get(other_app.do_root)
 
     # Attach child to root
     child_parser = cmd2.Cmd2ArgumentParser(prog="child")
@@ -4657,6 +5611,12 @@ def test_subcommand_attachment() -> None:
     child_record = SubcommandRecord(name="child", command="root", parser=child_parser, help="child help")
     app.attach_subcommand(child_record)
 
+    # Verify the app got its own copy of the root parser and the shared one is unchanged
+    root_parser = app.command_parsers.get(app.do_root)
+    assert root_parser is not shared_root_parser
+    assert other_app.command_parsers.get(other_app.do_root) is shared_root_parser
+    assert not shared_root_parser.get_subparsers_action()._name_parser_map
+
     # Verify child was attached
     root_subparsers_action = root_parser.get_subparsers_action()
     assert "child" in root_subparsers_action._name_parser_map
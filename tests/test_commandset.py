@@ -2,12 +2,14 @@
 
 import argparse
 import signal
+import sys
 
 import pytest
 
 import cmd2
 from cmd2 import (
     Completions,
+    LazyCommandSet,
     Settable,
 )
 from cmd2.exceptions import (
@@ -242,12 +244,14 @@ def test_load_commands(manual_command_sets_app, capsys) -> None:
     cmd_set = CommandSetA()
 
     assert manual_command_sets_app.find_commandset_for_command("elderberry") is None
+    assert manual_command_sets_app.get_command_info("elderberry") is None
     assert not manual_command_sets_app.find_commandsets(CommandSetA)
 
     manual_command_sets_app.register_command_set(cmd_set)
 
     assert manual_command_sets_app.find_commandsets(CommandSetA)[0] is cmd_set
     assert manual_command_sets_app.find_commandset_for_command("elderberry") is cmd_set
+    assert manual_command_sets_app.get_command_info("elderberry").command_set is cmd_set
 
     out = manual_command_sets_app.app_cmd("apple")
     assert "Apple!" in out.stdout
@@ -272,6 +276,7 @@ def test_load_commands(manual_command_sets_app, capsys) -> None:
 
     # uninstall the command set and verify it is now also no longer accessible
     manual_command_sets_app.unregister_command_set(cmd_set)
+    assert manual_command_sets_app.get_command_info("elderberry") is None
 
     cmds_cats, _help_topics = manual_command_sets_app._build_command_info()
 
@@ -1206,3 +1211,114 @@ def test_ns_provider() -> None:
     app.unregister_command_set(ns_provider_set)
     run_cmd(app, "test_ns")
     assert app.last_result == app
+
+
+LAZY_MODULE = "tests.lazy_command_set"
+
+
+@pytest.fixture
+def lazy_cmdset() -> LazyCommandSet:
+    # Make sure each test starts with the CommandSet's module not imported
+    sys.modules.pop(LAZY_MODULE, None)
+    return LazyCommandSet(
+        f"{LAZY_MODULE}:LazyCommands",
+        commands={"lazy_apple": "Print apple", "lazy_cut": "Cut a fruit"},
+        category="Lazy",
+    )
+
+
+def test_lazy_command_set(lazy_cmdset) -> None:
+    app = WithCommandSets(command_sets=[lazy_cmdset])
+    assert LAZY_MODULE not in sys.modules
+
+    # Help and command name completion only need the declared commands
+    cmds_cats, _help_topics = app._build_command_info()
+    assert cmds_cats["Lazy"] == ["lazy_apple", "lazy_cut"]
+    out, _err = run_cmd(app, "help -v")
+    assert any("lazy_cut" in line and "Cut a fruit" in line for line in out)
+    completions = app.complete("lazy_", "lazy_", 0, 5)
+    assert completions.to_strings() == ("lazy_apple", "lazy_cut")
+    assert LAZY_MODULE not in sys.modules
+
+    # Running a command loads the CommandSet
+    out, _err = run_cmd(app, "lazy_apple")
+    assert out == ["apple"]
+    assert LAZY_MODULE in sys.modules
+    cmdset = app.find_commandset_for_command("lazy_cut")
+    assert type(cmdset).__name__ == "LazyCommands"
+    assert not app._lazy_command_sets
+
+    out, _err = run_cmd(app, "lazy_cut banana")
+    assert out == ["cutting banana"]
+
+
+def test_lazy_command_set_completion(lazy_cmdset) -> None:
+    app = WithCommandSets()
+    app.register_lazy_command_set(lazy_cmdset)
+
+    # Completing a command's arguments loads the CommandSet
+    completions = app.complete("b", "lazy_cut b", 9, 10)
+    assert completions.to_strings() == ("banana",)
+    assert LAZY_MODULE in sys.modules
+
+
+def test_lazy_command_set_help(lazy_cmdset) -> None:
+    app = WithCommandSets(command_sets=[lazy_cmdset])
+
+    # Help for a command loads the CommandSet to use its parser
+    out, _err = run_cmd(app, "help lazy_cut")
+    assert LAZY_MODULE in sys.modules
+    assert "Usage: lazy_cut [-h] {banana,cherry}" in out[0]
+
+
+def test_lazy_command_set_disabled(lazy_cmdset) -> None:
+    app = WithCommandSets()
+    app.disable_category("Lazy", "Lazy is disabled")
+    app.register_lazy_command_set(lazy_cmdset)
+    app.disable_command("lazy_cut", "Cutting is disabled")
+    app.enable_category("Lazy")
+    app.disable_command("lazy_cut", "Cutting is disabled")
+
+    # Disabled commands aren't loaded
+    _out, err = run_cmd(app, "lazy_cut banana")
+    assert err == ["Cutting is disabled"]
+    assert LAZY_MODULE not in sys.modules
+
+    # They stay disabled when another command loads the CommandSet
+    out, _err = run_cmd(app, "lazy_apple")
+    assert out == ["apple"]
+    _out, err = run_cmd(app, "lazy_cut banana")
+    assert err == ["Cutting is disabled"]
+
+    app.enable_command("lazy_cut")
+    out, _err = run_cmd(app, "lazy_cut banana")
+    assert out == ["cutting banana"]
+
+
+def test_lazy_command_set_errors(lazy_cmdset) -> None:
+    app = WithCommandSets()
+
+    # A declared command can't conflict with an existing one
+    with pytest.raises(CommandSetRegistrationError):
+        app.register_lazy_command_set(LazyCommandSet(f"{LAZY_MODULE}:LazyCommands", commands={"lazy_apple": "", "help": ""}))
+    assert "lazy_apple" not in app.get_all_commands()
+
+    # The placeholders remain when the CommandSet can't be loaded so loading can be tried again
+    for path, error in (
+        ("tests.no_such_module:LazyCommands", "No module named"),
+        (f"{LAZY_MODULE}.LazyCommands", "is not in the form"),
+        (f"{LAZY_MODULE}:NotACommandSet", "is not a CommandSet class"),
+    ):
+        app.register_lazy_command_set(LazyCommandSet(path, commands={"lazy_apple": "Print apple"}))
+        _out, err = run_cmd(app, "lazy_apple")
+        assert error in " ".join(err)
+        assert "lazy_apple" in app._lazy_command_sets
+        app._uninstall_lazy_command("lazy_apple")
+
+    # A declared command which the CommandSet doesn't define isn't found once it loads
+    app.register_lazy_command_set(
+        LazyCommandSet(f"{LAZY_MODULE}:LazyCommands", commands={"lazy_apple": "", "lazy_pear": "Print pear"})
+    )
+    _out, err = run_cmd(app, "lazy_pear")
+    assert "lazy_pear is not a recognized command" in err[0]
+    assert "lazy_pear" not in app.get_all_commands()
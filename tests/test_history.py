@@ -76,6 +76,16 @@ def hist():
 
 # Represents the hist fixture's JSON
 hist_json = (
+    '{"history_version":"4.2.0","history_items":['
+    '["","first","",false,"","","","",false],'
+    '["","second","",false,"","","","",false],'
+    '["","third","",false,"","","","",false],'
+    '["","fourth","",false,"","","","",false]'
+    "]}"
+)
+
+# Represents the hist fixture's JSON in the legacy format which stored each item as a dictionary
+legacy_hist_json = (
     "{\n"
     '  "history_version": "4.0.0",\n'
     '  "history_items": [\n'
@@ -342,6 +352,14 @@ def test_history_from_json(hist) -> None:
     )
 
     assert hist.from_json(hist_json) == hist
+    assert hist.from_json(legacy_hist_json) == hist
+
+    # Items saved before Statement had a background field are still accepted
+    assert hist.from_json(hist_json.replace(",false]", "]")) == hist
+
+    # Send JSON with a malformed history item
+    with pytest.raises(ValueError, match="Statement requires 8 to 9 field values but 2 were given"):
+        hist.from_json('{"history_version":"4.2.0","history_items":[["", "first"]]}')
 
     # Test invalid JSON
     with pytest.raises(json.JSONDecodeError):
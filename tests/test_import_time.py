@@ -0,0 +1,93 @@
+"""Regression tests for what cmd2 imports and how long importing it takes.
+
+Each test imports cmd2 in a fresh interpreter, since this one has already imported everything.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import cmd2
+
+# Most of what cmd2 used to import when it was imported is now deferred. So importing cmd2 must take
+# less than this fraction of the time it takes to import cmd2 along with the deferred modules. It's
+# about 0.6 and was 1.0 before they were deferred.
+IMPORT_TIME_RATIO_BUDGET = 0.8
+
+# How many times each import is timed. The fastest time is used, since the others are slowed by noise.
+IMPORT_TIME_RUNS = 3
+
+# Modules which cmd2 only imports when they're first used
+DEFERRED_MODULES = (
+    "asyncio",
+    "code",
+    "importlib.metadata",
+    "prompt_toolkit",
+    "pydoc",
+    "rich.pretty",
+    "rich.traceback",
+    "tempfile",
+)
+
+
+def _run_python(*args: str) -> subprocess.CompletedProcess[str]:
+    """Run a fresh interpreter which can import this copy of cmd2."""
+    package_dir = os.path.dirname(os.path.dirname(os.path.abspath(cmd2.__file__)))
+    env = os.environ.copy()
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_dir, env.get("PYTHONPATH")]))
+
+    # Disable coverage in the child so its tracing doesn't count against the budget
+    env.pop("COV_CORE_SOURCE", None)
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, env=env, check=True)
+
+
+def test_import_defers_heavy_modules() -> None:
+    code = f"import sys, cmd2; print(' '.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+    result = _run_python("-c", code)
+    assert result.stdout.split() == []
+
+
+def _import_time(modules: tuple[str, ...]) -> int:
+    """Find the fastest cumulative time `python -X importtime` reports for importing modules.
+
+    :param modules: the modules to import, in order
+    :return: the sum of their cumulative times in microseconds
+    """
+    times = []
+    for _ in range(IMPORT_TIME_RUNS):
+        result = _run_python("-X", "importtime", "-c", f"import {', '.join(modules)}")
+
+        # Each line looks like "import time: self [us] | cumulative | imported package". Packages
+        # imported by another package are indented, so they aren't counted twice. A module which an
+        # earlier one already imported has no line of its own.
+        total = 0
+        found = False
+        for line in result.stderr.splitlines():
+            fields = line.removeprefix("import time:").split("|")
+            if len(fields) == 3 and fields[2].removeprefix(" ") in modules:
+                total += int(fields[1])
+                found = found or fields[2].strip() == modules[-1]
+
+        if not found:
+            pytest.fail(f"{modules[-1]} not found in importtime output:\n{result.stderr}")
+        times.append(total)
+    return min(times)
+
+
+def test_import_time_budget() -> None:
+    cmd2_time = _import_time(("cmd2",))
+    undeferred_time = _import_time((*DEFERRED_MODULES, "cmd2"))
+    assert cmd2_time < undeferred_time * IMPORT_TIME_RATIO_BUDGET
+
+
+def test_headless_app_does_not_import_prompt_toolkit() -> None:
+    code = (
+        "import io, sys, cmd2; "
+        "app = cmd2.Cmd(headless=True, stdin=io.StringIO('help\\n'), allow_cli_args=False); "
+        "app.onecmd_plus_hooks('help'); app.cmdloop(); "
+        "print('prompt_toolkit' in sys.modules)"
+    )
+    result = _run_python("-c", code)
+    assert result.stdout.splitlines()[-1] == "False"
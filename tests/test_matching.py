@@ -0,0 +1,103 @@
+"""Unit testing for the matchers in cmd2/matching.py"""
+
+import pytest
+
+from cmd2 import (
+    CaseInsensitiveMatcher,
+    CompletionItem,
+    FuzzyMatcher,
+    Matcher,
+    PrefixMatcher,
+)
+
+hosts = ("web-01.example.com", "dbweb", "w-e-b", "Webster", "alpha", "xweb", "WEB")
+
+
+def test_matcher_is_abstract() -> None:
+    with pytest.raises(TypeError):
+        Matcher()  # type: ignore[abstract]
+
+    class SuffixMatcher(Matcher):
+        def match(self, text, candidates):
+            return [candidate for candidate in candidates if candidate.endswith(text)]
+
+    assert SuffixMatcher().match("web", hosts) == ["dbweb", "xweb"]
+
+
+def test_prefix_matcher() -> None:
+    matcher = PrefixMatcher()
+    assert matcher.match("we", hosts) == ["web-01.example.com"]
+    assert matcher.match("", hosts) == list(hosts)
+    assert not matcher.ranks("we")
+    assert matcher.narrowable
+
+
+def test_case_insensitive_matcher() -> None:
+    matcher = CaseInsensitiveMatcher()
+    assert matcher.match("WE", hosts) == ["web-01.example.com", "Webster", "WEB"]
+    assert matcher.match("", hosts) == list(hosts)
+    assert not matcher.ranks("we")
+
+    # CompletionItems match by their text and are returned as they were given
+    items = [CompletionItem(1, text="Straße"), CompletionItem(2, text="other")]
+    assert matcher.match("STRASS", items) == [items[0]]
+
+
+def test_fuzzy_matcher_ranks_matches() -> None:
+    matcher = FuzzyMatcher()
+    assert matcher.ranks("web")
+    assert not matcher.ranks("")
+    assert matcher.narrowable
+
+    # Prefix matches come first, shortest first. Then matches at word starts beat matches within words.
+    assert matcher.match("web", hosts) == ["WEB", "Webster", "web-01.example.com", "w-e-b", "xweb", "dbweb"]
+    assert matcher.match("", hosts) == list(hosts)
+    assert matcher.match("zz", hosts) == []
+
+
+def test_fuzzy_matcher_score() -> None:
+    matcher = FuzzyMatcher()
+    assert matcher.score("", "anything") == 0
+    assert matcher.score("wb", "web") is not None
+    assert matcher.score("bw", "web") is None
+
+    # Consecutive characters score higher than scattered ones
+    scores = [matcher.score("ab", candidate) for candidate in ("ab", "a-b", "axb", "axxxb")]
+    assert scores == sorted(scores, reverse=True)
+    assert len(set(scores)) == len(scores)
+
+    # The tightest match is scored, not the first one found
+    assert matcher.score("ab", "a-xab") == matcher.score("ab", "x-xab") == matcher.score("ab", "ab") - FuzzyMatcher.BONUS_START
+
+
+def test_fuzzy_matcher_limit() -> None:
+    matcher = FuzzyMatcher(limit=2)
+    assert not matcher.narrowable
+    assert matcher.match("web", hosts) == ["WEB", "Webster"]
+    assert matcher.match("wb", hosts) == ["w-e-b", "WEB"]
+    assert matcher.match("", hosts) == list(hosts[:2])
+
+    with pytest.raises(ValueError, match="limit must be at least 1"):
+        FuzzyMatcher(limit=0)
+
+
+def test_fuzzy_matcher_special_characters() -> None:
+    matcher = FuzzyMatcher()
+    candidates = ["a.b", "a]b^c", "line\nbreak", "axb"]
+    assert matcher.match("a.", candidates) == ["a.b"]
+    assert matcher.match("]^", candidates) == ["a]b^c"]
+    assert matcher.match("eb", candidates) == ["line\nbreak"]
+
+
+def test_fuzzy_matcher_caches_folded_tuple() -> None:
+    matcher = FuzzyMatcher()
+    items = tuple(CompletionItem(name) for name in ("Alpha", "Beta"))
+    assert matcher.match("al", items) == [items[0]]
+    folded = matcher._folded_texts.get(items)
+    assert matcher._folded_texts.get(items) is folded
+
+    # Lists could change, so they aren't cached
+    names = ["Alpha", "Beta"]
+    assert matcher.match("al", names) == ["Alpha"]
+    names[0] = "Gamma"
+    assert matcher.match("al", names) == []
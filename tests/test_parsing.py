@@ -1,6 +1,8 @@
 """Test the parsing logic in parsing.py"""
 
 import dataclasses
+import random
+import sys
 
 import pytest
 
@@ -11,6 +13,7 @@ from cmd2 import (
 )
 from cmd2 import string_utils as su
 from cmd2.parsing import (
+    ParsedLine,
     Statement,
     StatementParser,
     shlex_split,
@@ -116,6 +119,86 @@ def test_tokenize_unclosed_quotes(parser) -> None:
         _ = parser.tokenize('command with "unclosed quotes')
 
 
+def _reference_tokenize(parser: StatementParser, line: str) -> list[str]:
+    """Tokenize a line the way StatementParser did before it had a single-pass lexer."""
+    line = parser._expand(line)
+    if line.lstrip().startswith(constants.COMMENT_CHAR):
+        return []
+    try:
+        tokens = shlex_split(line)
+    except ValueError as ex:
+        raise exceptions.Cmd2ShlexError(ex) from None
+    return parser.split_on_punctuation(tokens)
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "",
+        "   ",
+        "command",
+        "  # comment",
+        "\f# comment",
+        '"abc"def',
+        '"abc""def"',
+        'a"b c"',
+        'a;"b c"',
+        ';"abc"',
+        "help|less;;&",
+        "cmd >>file",
+        "cmd >>>file",
+        "cmd arg;&|>",
+        "multiline 'quoted; not a terminator' ;",
+        "l|less",
+        "42 arg1 'arg 2'",
+        "command\twith\rodd\nwhitespace",
+        "commande naïve > fichier_été.txt",
+    ],
+)
+def test_lexer_matches_shlex(parser, line) -> None:
+    assert parser.tokenize(line) == _reference_tokenize(parser, line)
+
+
+@pytest.mark.parametrize("terminators", [None, [";", "&"], [";", "&&", "\\"], [";", "\n"], ["\t", " "]])
+def test_lexer_matches_shlex_random(terminators) -> None:
+    parser = StatementParser(terminators=terminators)
+    rng = random.Random(1234)
+    alphabet = "ab ;&|>\"'#\t\n\r\f\\é"
+
+    for _ in range(5000):
+        line = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 15)))
+        try:
+            expected = _reference_tokenize(parser, line)
+        except exceptions.Cmd2ShlexError as ex:
+            with pytest.raises(exceptions.Cmd2ShlexError, match=str(ex)):
+                parser.tokenize(line)
+        else:
+            assert parser.tokenize(line) == expected
+
+
+def test_lex_spans(parser) -> None:
+    line = 'help "quoted arg">>out.txt|less'
+    tokens, spans = parser.lex(line)
+    assert tokens == ["help", '"quoted arg"', ">>", "out.txt", "|", "less"]
+    assert spans == [(0, 4), (5, 17), (17, 19), (19, 26), (26, 27), (27, 31)]
+    assert [line[start:end] for start, end in spans] == tokens
+
+
+def test_lex_does_not_expand(parser) -> None:
+    tokens, spans = parser.lex("l|less")
+    assert tokens == ["l", "|", "less"]
+    assert spans == [(0, 1), (1, 2), (2, 6)]
+
+
+def test_lex_comment(parser) -> None:
+    assert parser.lex("  # comment") == ([], [])
+
+
+def test_lex_unclosed_quotes(parser) -> None:
+    with pytest.raises(exceptions.Cmd2ShlexError, match="No closing quotation"):
+        parser.lex('command with "unclosed quotes')
+
+
 @pytest.mark.parametrize(
     ("tokens", "command", "args"),
     [([], "", ""), (["command"], "command", ""), (["command", "arg1", "arg2"], "command", "arg1 arg2")],
@@ -525,6 +608,64 @@ def test_parse_multiple_terminators(parser, line, terminator) -> None:
     assert statement.terminator == terminator
 
 
+@pytest.fixture
+def background_parser():
+    return StatementParser(multiline_commands=["multiline"], background_jobs=True)
+
+
+@pytest.mark.parametrize(
+    ("line", "args", "redirector", "redirect_to"),
+    [
+        ("command arg &", "arg", "", ""),
+        ("command arg   &  ", "arg", "", ""),
+        ("command arg > out.txt &", "arg", ">", "out.txt"),
+        ("command arg | less &", "arg", "|", "less"),
+        ("multiline arg; &", "arg", "", ""),
+    ],
+)
+def test_parse_background(background_parser, line, args, redirector, redirect_to) -> None:
+    statement = background_parser.parse(line)
+    assert statement.background
+    assert statement.args == args
+    assert statement.redirector == redirector
+    assert statement.redirect_to == redirect_to
+    assert statement.expanded_command_line.endswith(" &")
+
+    # The expanded command line runs in the background too
+    expanded = background_parser.parse(statement.expanded_command_line)
+    assert expanded.background
+    assert expanded.args == args
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "command arg&",
+        "command '&'",
+        "command & arg",
+        # An unterminated multiline command continues on the next line
+        "multiline arg &",
+    ],
+)
+def test_parse_background_literal(background_parser, line) -> None:
+    statement = background_parser.parse(line)
+    assert not statement.background
+    assert "&" in statement.args
+
+
+def test_parse_background_disabled() -> None:
+    parser = StatementParser(cache_size=10)
+    statement = parser.parse("command arg &")
+    assert not statement.background
+    assert statement.args == "arg &"
+
+    # Enabling background jobs invalidates the cached result
+    parser.background_jobs = True
+    statement = parser.parse("command arg &")
+    assert statement.background
+    assert statement.args == "arg"
+
+
 def test_parse_unfinished_multiliine_command(parser) -> None:
     line = "multiline has > inside an unfinished command"
     statement = parser.parse(line)
@@ -744,6 +885,124 @@ def test_parse_alias_terminator_no_whitespace(parser, line) -> None:
     assert statement.terminator == ";"
 
 
+@pytest.mark.parametrize(
+    ("aliases", "line", "expanded"),
+    [
+        ({"a": "b"}, "a x", "b x"),
+        ({"a": "b", "b": "c d"}, "a x", "c d x"),
+        ({"a": "b;", "b": "c"}, "a x", "c; x"),
+        ({"a": "b", "b": "a"}, "a x", "a x"),
+        ({"a": "b arg", "b": "a"}, "b", "b arg"),
+        ({"a": "b", "b": "c"}, "  a|less", "c|less"),
+        ({"a": "b", "b": "c"}, "ab", "ab"),
+        ({"a": '"b"', "b": "c"}, "a", '"b"'),
+        ({"a": "", "b": "c"}, "a b x", "c x"),
+        ({"a": "  ", "b": "a"}, "b b", "   b"),
+    ],
+)
+def test_alias_expansion(aliases, line, expanded) -> None:
+    parser = StatementParser(aliases=aliases, shortcuts={})
+    assert parser._expand(line) == expanded
+
+
+def test_alias_expansion_tracks_changes() -> None:
+    parser = StatementParser(aliases={"a": "b", "b": "c"}, shortcuts={})
+    assert parser._expand("a") == "c"
+    parser.aliases["b"] = "d"
+    assert parser._expand("a") == "d"
+    del parser.aliases["b"]
+    assert parser._expand("a") == "b"
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("@@file", ("@@", "_relative_run_script")),
+        ("@file", ("@", "run_script")),
+        ("@", ("@", "run_script")),
+        ("!ls", ("!", "shell")),
+        ("?", ("?", "help")),
+        ("help", None),
+        ("", None),
+    ],
+)
+def test_match_shortcut(default_parser, text, expected) -> None:
+    assert default_parser.match_shortcut(text) == expected
+
+
+def test_match_shortcut_tracks_changes(default_parser) -> None:
+    default_parser.shortcuts = [("!", "shell"), ("!!", "repeat"), ("%", "percent")]
+    assert default_parser.shortcuts == (("!!", "repeat"), ("!", "shell"), ("%", "percent"))
+    assert default_parser.match_shortcut("!!x") == ("!!", "repeat")
+    assert default_parser.match_shortcut("!x") == ("!", "shell")
+    assert default_parser.match_shortcut("%x") == ("%", "percent")
+    assert default_parser.match_shortcut("@x") is None
+
+
+def test_find_alias_cycle() -> None:
+    parser = StatementParser(aliases={"a": "b", "b": "c arg", "c": "b", "d": "help"})
+    assert parser.find_alias_cycle("a") == ["b", "c", "b"]
+    assert parser.find_alias_cycle("b") == ["b", "c", "b"]
+    assert parser.find_alias_cycle("d") == []
+
+    with pytest.raises(KeyError):
+        parser.find_alias_cycle("help")
+
+
+def _is_complete_multiline(parser: StatementParser, line: str) -> bool:
+    try:
+        return bool(parser.parse(line).terminator)
+    except exceptions.Cmd2ShlexError:
+        return False
+
+
+@pytest.mark.parametrize(
+    ("first_line", "lines", "complete"),
+    [
+        ("multiline", ["arg"], [False]),
+        ("multiline", ["arg;"], [True]),
+        ("multiline", ["arg", ""], [False, True]),
+        ("multiline", ["arg &"], [True]),
+        ("multiline", ["'quoted;", "still quoted", "closed' x", "done;"], [False, False, False, True]),
+        ("multiline 'open", ["", "';"], [False, True]),
+        ('multiline "open', ['close"', "more&"], [False, True]),
+        ("multiline", ['";"', "';'", "x;y"], [False, False, True]),
+        ("anothermultiline", ["arg;"], [True]),
+    ],
+)
+def test_multiline_scanner(parser, first_line, lines, complete) -> None:
+    scanner = parser.multiline_scanner(first_line)
+    assert not scanner.maybe_complete
+
+    full_line = first_line
+    for line, expected in zip(lines, complete, strict=True):
+        full_line += f"\n{line}"
+        scanner.add_line(line)
+        assert scanner.maybe_complete is expected
+        assert _is_complete_multiline(parser, full_line) is expected
+
+
+def test_multiline_scanner_matches_parse_random(parser) -> None:
+    rng = random.Random(1234)
+    fragments = ["x", '"', "'", ";", "&", " ", '"a;b"', ">", "|", "#", "'q'"]
+
+    for _ in range(1000):
+        full_line = rng.choice(["multiline", 'multiline "open', "anothermultiline x"])
+        scanner = parser.multiline_scanner(full_line)
+        for _ in range(5):
+            line = "".join(rng.choice(fragments) for _ in range(rng.randint(0, 4)))
+            full_line += f"\n{line}"
+            scanner.add_line(line)
+            assert scanner.maybe_complete is _is_complete_multiline(parser, full_line), full_line
+
+
+def test_multiline_scanner_is_stale(parser) -> None:
+    scanner = parser.multiline_scanner("multiline")
+    assert not scanner.is_stale
+    parser.multiline_commands = []
+    assert scanner.is_stale
+
+
 def test_parse_command_only_command_and_args(parser) -> None:
     line = "help history"
     partial_statement = parser.parse_command_only(line)
@@ -862,6 +1121,142 @@ def test_parse_command_only_multiline(parser) -> None:
     assert partial_statement.command_and_args == line
 
 
+def test_parse_cache_disabled_by_default(parser) -> None:
+    parser.parse("help")
+    parser.parse("help")
+    assert parser.cache_info() == (0, 0, 0, 0)
+
+
+def test_parse_cache_hits_and_misses() -> None:
+    parser = StatementParser(cache_size=10)
+    first = parser.parse("command arg > out.txt")
+    second = parser.parse("command arg > out.txt")
+    assert first is second
+    partial = parser.parse_command_only("command arg > out.txt")
+    assert parser.parse_command_only("command arg > out.txt") is partial
+    assert parser.cache_info() == (2, 2, 10, 2)
+
+    parser.cache_clear()
+    assert parser.cache_info() == (0, 0, 10, 0)
+
+
+def test_parse_cache_evicts_least_recently_used() -> None:
+    parser = StatementParser(cache_size=2)
+    first = parser.parse("one")
+    parser.parse("two")
+    assert parser.parse("one") is first
+    parser.parse("three")
+    assert parser.cache_info().currsize == 2
+
+    # "two" was evicted, but "one" was not
+    assert parser.parse("one") is first
+    hits = parser.cache_info().hits
+    parser.parse("two")
+    assert parser.cache_info().hits == hits
+
+
+def test_parse_cache_does_not_cache_errors() -> None:
+    parser = StatementParser(cache_size=10)
+    for _ in range(2):
+        with pytest.raises(exceptions.Cmd2ShlexError):
+            parser.parse('command "unclosed')
+    assert parser.cache_info().currsize == 0
+
+
+def test_parse_cache_resize() -> None:
+    parser = StatementParser(cache_size=3)
+    for line in ("one", "two", "three"):
+        parser.parse(line)
+    parser.cache_size = 1
+    assert parser.cache_info() == (0, 3, 1, 1)
+
+    with pytest.raises(ValueError, match="cannot be negative"):
+        parser.cache_size = -1
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda p: p.aliases.__setitem__("fake", "alias"),
+        lambda p: p.aliases.update(fake="alias"),
+        lambda p: p.aliases.setdefault("fake", "alias"),
+        lambda p: p.aliases.__ior__({"fake": "alias"}),
+        lambda p: p.aliases.pop("helpalias"),
+        lambda p: p.aliases.popitem(),
+        lambda p: p.aliases.__delitem__("helpalias"),
+        lambda p: p.aliases.clear(),
+        lambda p: setattr(p, "aliases", {}),
+        lambda p: setattr(p, "shortcuts", [("?", "help")]),
+        lambda p: setattr(p, "terminators", [";"]),
+        lambda p: setattr(p, "multiline_commands", []),
+    ],
+)
+def test_parse_cache_invalidated_by_settings(mutate) -> None:
+    parser = StatementParser(
+        terminators=[";", "&"],
+        multiline_commands=["multiline"],
+        aliases={"helpalias": "help"},
+        cache_size=10,
+    )
+    statement = parser.parse("helpalias")
+    partial_statement = parser.parse_command_only("helpalias")
+    mutate(parser)
+    assert parser.parse("helpalias") is not statement
+    assert parser.parse_command_only("helpalias") is not partial_statement
+
+
+def test_parse_cache_sees_alias_changes() -> None:
+    parser = StatementParser(cache_size=10)
+    assert parser.parse("ls").command == "ls"
+    parser.aliases["ls"] = "shell ls"
+    assert parser.parse("ls").command == "shell"
+    del parser.aliases["ls"]
+    assert parser.parse("ls").command == "ls"
+
+
+def test_parse_many(parser) -> None:
+    lines = ["help", 'command with "unclosed', "", "helpalias arg"]
+    results = list(parser.parse_many(lines))
+
+    assert [result.line_number for result in results] == [1, 2, 3, 4]
+    assert [result.line for result in results] == lines
+    assert results[0] == ParsedLine(1, "help", parser.parse("help"))
+    assert results[1].statement is None
+    assert results[1].error == "No closing quotation"
+    assert results[2].statement.command == ""
+    assert results[3].statement.command == "help"
+    assert results[3].statement.args == "arg"
+    assert all(not result.error for result in results if result.statement is not None)
+
+
+def test_parse_many_reuses_repeated_lines(parser, mocker) -> None:
+    parse_mock = mocker.spy(parser, "_parse")
+    results = list(parser.parse_many(["help", "help", "history", "help"]))
+
+    assert parse_mock.call_count == 2
+    assert results[0].statement is results[1].statement is results[3].statement
+
+
+def test_parse_many_sees_setting_changes(parser) -> None:
+    # Lines are parsed as they are requested, so settings changed between lines apply to later lines
+    results = parser.parse_many(["ls", "ls"])
+    assert next(results).statement.command == "ls"
+    parser.aliases["ls"] = "shell ls"
+    assert next(results).statement.command == "shell"
+
+
+def test_parse_interns_command_names(parser) -> None:
+    # Command names are sliced out of each line, so they are only the same object if interned
+    assert parser.parse("history -a").command is parser.parse("history").command
+
+
+def test_terminators_change_updates_lexer() -> None:
+    parser = StatementParser(terminators=[";"])
+    assert parser.tokenize("cmd&") == ["cmd&"]
+    parser.terminators = [";", "&"]
+    assert parser.tokenize("cmd&") == ["cmd", "&"]
+
+
 def test_statement_initialization() -> None:
     string = "alias"
     statement = cmd2.Statement(string)
@@ -892,6 +1287,31 @@ def test_statement_is_immutable() -> None:
         statement.raw = "baz"
 
 
+def test_statement_argv_and_arg_list_are_copies(parser) -> None:
+    statement = parser.parse("command 'quoted arg' plain")
+    arg_list = statement.arg_list
+    argv = statement.argv
+    assert arg_list == ["'quoted arg'", "plain"]
+    assert argv == ["command", "quoted arg", "plain"]
+
+    # Changing a returned list does not change the Statement
+    arg_list.append("extra")
+    argv.clear()
+    assert statement.arg_list == ["'quoted arg'", "plain"]
+    assert statement.argv == ["command", "quoted arg", "plain"]
+    assert statement.arg_list is not statement.arg_list
+    assert statement.argv is not statement.argv
+
+
+def test_statement_arg_list_computed_once(mocker, parser) -> None:
+    statement = parser.parse("command arg1 arg2")
+    split_mock = mocker.patch("cmd2.parsing.shlex_split", wraps=shlex_split)
+    for _ in range(3):
+        assert statement.argv == ["command", "arg1", "arg2"]
+        assert statement.arg_list == ["arg1", "arg2"]
+    split_mock.assert_called_once_with("arg1 arg2")
+
+
 def test_statement_as_dict(parser) -> None:
     # Make sure to_dict() results can be restored to identical Statement
     statement = parser.parse("!ls > out.txt")
@@ -912,6 +1332,54 @@ def test_statement_as_dict(parser) -> None:
         Statement.from_dict(statement_dict)
 
 
+def test_statement_as_tuple(parser) -> None:
+    statement = parser.parse("multiline arg; suffix > out.txt")
+    values = statement.to_tuple()
+    assert values == ("arg", "multiline arg; suffix > out.txt", "multiline", True, ";", "suffix", ">", "out.txt", False)
+    assert dict(zip(Statement.FIELD_NAMES, values, strict=True)) == statement.to_dict()
+
+    # from_tuple() accepts any sequence, such as a list loaded from JSON
+    restored = Statement.from_tuple(list(values))
+    assert restored == statement
+    assert restored.raw == statement.raw
+
+    # Tuples saved before the background field was added are still accepted
+    assert Statement.from_tuple(values[:-1]) == statement
+
+    with pytest.raises(ValueError, match="Statement requires 8 to 9 field values but 7 were given"):
+        Statement.from_tuple(values[:-2])
+    with pytest.raises(ValueError, match="Statement requires 8 to 9 field values but 10 were given"):
+        Statement.from_tuple((*values, False))
+
+
+def test_statement_field_names() -> None:
+    field_names = tuple(f.name for f in dataclasses.fields(Statement) if f.init)
+    assert field_names == Statement.FIELD_NAMES
+
+
+def test_statement_is_compact(parser) -> None:
+    statement = parser.parse("!ls -al > out.txt")
+    assert not hasattr(statement, "__dict__")
+
+    # Strings shared by many Statements are interned
+    other = Statement("", command=b"shell".decode(), redirector=b">>".decode())
+    assert other.command is statement.command
+    assert other.redirector is sys.intern(">>")
+
+
+def test_statement_replace(parser) -> None:
+    statement = parser.parse("help -v > out.txt")
+    replaced = dataclasses.replace(statement, raw="orig")
+    assert replaced.raw == "orig"
+    assert replaced.args == replaced == "-v"
+    assert replaced.argv == statement.argv
+    assert replaced.redirect_to == "out.txt"
+
+    replaced = dataclasses.replace(statement, args="history")
+    assert replaced == "history"
+    assert replaced.argv == ["help", "history"]
+
+
 def test_is_valid_command_invalid(mocker, parser) -> None:
     # Non-string command
     valid, errmsg = parser.is_valid_command(5)
@@ -971,6 +1439,36 @@ def test_is_valid_command_valid(parser) -> None:
     assert not errmsg
 
 
+@pytest.mark.parametrize(
+    ("value", "args", "segments", "resolved"),
+    [
+        ("help", [], ("help",), "help"),
+        ("help {1}", [cmd2.parsing.MacroArg(5, "1", False)], ("help ", 1, ""), "help one"),
+        (
+            "{2} {1}x{2}",
+            [
+                cmd2.parsing.MacroArg(8, "2", False),
+                cmd2.parsing.MacroArg(0, "2", False),
+                cmd2.parsing.MacroArg(4, "1", False),
+            ],
+            ("", 2, " ", 1, "x", 2, ""),
+            "two onextwo",
+        ),
+        (
+            "say {{1}} {1}",
+            [cmd2.parsing.MacroArg(4, "1", True), cmd2.parsing.MacroArg(10, "1", False)],
+            ("say {1} ", 1, ""),
+            "say {1} one",
+        ),
+        ("{{1}}{{2}}", [cmd2.parsing.MacroArg(0, "1", True), cmd2.parsing.MacroArg(5, "2", True)], ("{1}{2}",), "{1}{2}"),
+    ],
+)
+def test_macro_segments(value, args, segments, resolved) -> None:
+    macro = cmd2.parsing.Macro(name="fake", value=value, minimum_arg_count=2, args=args)
+    assert macro.segments == segments
+    assert macro.resolve(["fake", "one", "two"]) == resolved
+
+
 def test_macro_normal_arg_pattern() -> None:
     # This pattern matches digits surrounded by exactly 1 brace on a side and 1 or more braces on the opposite side
     from cmd2.parsing import (
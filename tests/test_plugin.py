@@ -954,6 +954,32 @@ def test_cmdfinalization_hook_passthrough_exception() -> None:
     assert app.called_cmdfinalization == 1
 
 
+def test_hook_data_not_created_without_hooks(capsys, monkeypatch) -> None:
+    app = PluggedApp()
+    hooked_app = PluggedApp()
+    hooked_app.register_precmd_hook(hooked_app.precmd_hook)
+
+    data_types = ("PostparsingData", "PrecommandData", "PostcommandData", "CommandFinalizationData")
+    mocks = {name: mock.MagicMock(wraps=getattr(plugin, name)) for name in data_types}
+    for name, data_mock in mocks.items():
+        monkeypatch.setattr(plugin, name, data_mock)
+
+    stop = app.onecmd_plus_hooks("say hello")
+    out, err = capsys.readouterr()
+    assert not stop
+    assert out == "hello\n"
+    assert not err
+    for data_mock in mocks.values():
+        data_mock.assert_not_called()
+
+    # Registering a hook only affects its own stage
+    hooked_app.onecmd_plus_hooks("say hello")
+    mocks["PrecommandData"].assert_called_once()
+    mocks["PostparsingData"].assert_not_called()
+    mocks["PostcommandData"].assert_not_called()
+    mocks["CommandFinalizationData"].assert_not_called()
+
+
 def test_skip_postcmd_hooks(capsys) -> None:
     app = PluggedApp()
     app.register_postcmd_hook(app.postcmd_hook)
@@ -992,3 +1018,26 @@ def test_cmd2_argparse_exception(capsys) -> None:
     assert "Error: the following arguments are required: my_arg" in err
     assert app.called_postcmd == 0
     assert app.called_cmdfinalization == 1
+
+
+def test_command_timing_in_hooks() -> None:
+    app = PluggedApp()
+    app.record_command_timing = True
+    seen: dict[str, list[str]] = {}
+
+    def postcmd_hook(data: plugin.PostcommandData) -> plugin.PostcommandData:
+        seen["postcmd"] = list(app.command_timing.phases)
+        return data
+
+    def cmdfinalization_hook(data: plugin.CommandFinalizationData) -> plugin.CommandFinalizationData:
+        seen["cmdfinalization"] = list(app.command_timing.phases)
+        return data
+
+    app.register_postcmd_hook(postcmd_hook)
+    app.register_cmdfinalization_hook(cmdfinalization_hook)
+    app.onecmd_plus_hooks("say hello")
+
+    assert seen["postcmd"][-1] == "command"
+    assert seen["cmdfinalization"][-1] == "postcmd"
+    assert app.command_timing is None
+    assert list(app.last_command_timing.phases)[-1] == "finalization"
@@ -2,6 +2,7 @@
 
 import io
 import re
+from collections.abc import Callable
 from typing import Any, cast
 from unittest.mock import Mock
 
@@ -23,6 +24,8 @@ from cmd2 import (
 )
 from cmd2 import rich_utils as ru
 from cmd2 import string_utils as su
+from cmd2.completion import ChoicesCache
+from cmd2.parsing import StatementParser
 from cmd2.pt_utils import (
     Cmd2Lexer,
     pt_filter_style,
@@ -39,17 +42,20 @@ class MockCmd:
         self.complete = Mock(return_value=cmd2.Completions())
 
         self.stdout = io.StringIO()
-        self.statement_parser = Mock()
-        self.statement_parser.terminators = [";"]
-        self.statement_parser.shortcuts = []
+        self.statement_parser = StatementParser(terminators=[";"], shortcuts={})
         self.statement_parser._command_pattern = re.compile(r"\A\s*(\S*?)(\s|\Z)")
         self.aliases = {}
         self.macros = {}
         self.all_commands = []
+        self._thread_state = Mock(choices_cache=None)
+        self._choices_cache = ChoicesCache()
 
     def get_all_commands(self) -> list[str]:
         return self.all_commands
 
+    def get_command_func(self, command: str) -> Callable[..., Any] | None:
+        return Mock() if command in self.all_commands else None
+
 
 @pytest.fixture
 def mock_cmd_app() -> MockCmd:
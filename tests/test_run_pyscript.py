@@ -262,3 +262,21 @@ def test_run_pyscript_print_redirection(base_app, request, tmp_path, capsys) ->
     # Verify the remaining output when to the correct stream
     assert "this goes to sys.stdout" in out
     assert "this goes to sys.stderr" in err
+
+
+def test_run_pyscript_command_timing(base_app, request) -> None:
+    test_dir = os.path.dirname(request.module.__file__)
+    python_script = os.path.join(test_dir, "pyscript", "timing.py")
+
+    out, err = run_cmd(base_app, f"run_pyscript {python_script}")
+    assert not err
+    assert out[-1].split() == ["parsing", "redirection", "precmd", "command", "argparse", "postcmd", "finalization"]
+
+    # Commands run by the pyscript are timed even though the timing setting is disabled, but the
+    # run_pyscript command itself isn't
+    assert base_app.last_command_timing.line == "help"
+
+    # With the timing setting enabled, the run_pyscript command has its own timing
+    base_app.timing = True
+    run_cmd(base_app, f"run_pyscript {python_script}")
+    assert base_app.last_command_timing.line == f"run_pyscript {python_script}"
@@ -342,3 +342,15 @@ def test_unregister_synchronized_prefix() -> None:
 def test_unregister_synchronized_prefix_nonexistent() -> None:
     """Test unregistering a prefix that doesn't exist."""
     unregister_synchronized_prefix("nonexistent_prefix.")
+
+
+def test_pt_theme_built_on_first_use(monkeypatch) -> None:
+    from cmd2 import theme
+
+    monkeypatch.setattr(theme, "_PT_THEME", None)
+    update_theme({Cmd2Style.COMPLETION_MENU: Style(color=Color.BLUE)})
+    assert theme._PT_THEME is None
+
+    assert ("completion-menu", "fg:ansiblue bg:default") in get_pt_theme().style_rules
+    assert theme._PT_THEME is not None
+    reset_theme()
@@ -0,0 +1,77 @@
+"""Unit testing for cmd2/timing.py module"""
+
+import pytest
+
+from cmd2.timing import (
+    CommandTiming,
+    TimingStats,
+)
+
+
+def make_timing(**phases: float) -> CommandTiming:
+    timing = CommandTiming("cmd")
+    timing.phases = dict(phases)
+    return timing
+
+
+def test_mark_accumulates() -> None:
+    timing = CommandTiming("cmd")
+    timing.mark("parsing")
+    timing.mark("command")
+    first = timing.phases["parsing"]
+    timing.mark("parsing")
+
+    assert list(timing.phases) == ["parsing", "command"]
+    assert timing.phases["parsing"] >= first
+    assert timing.total == pytest.approx(sum(timing.phases.values()))
+
+
+def test_skip() -> None:
+    timing = CommandTiming("cmd")
+    timing.skip()
+    timing.mark("parsing")
+    assert timing.phases["parsing"] >= 0
+
+
+def test_repr() -> None:
+    timing = make_timing(parsing=0.5)
+    assert repr(timing) == "CommandTiming(line='cmd', parsing=0.500000)"
+
+
+def test_percentiles() -> None:
+    stats = TimingStats()
+    for i in range(1, 101):
+        stats.add(make_timing(parsing=i / 1000, command=i))
+
+    # argparse never ran, so it isn't reported
+    results = stats.percentiles((50, 90, 100))
+    assert list(results) == ["parsing", "command", "total"]
+    assert results["parsing"] == [0.05, 0.09, 0.1]
+    assert results["command"] == [50, 90, 100]
+    assert results["total"] == pytest.approx([50.05, 90.09, 100.1])
+
+
+def test_percentiles_partial_phase() -> None:
+    stats = TimingStats()
+    stats.add(make_timing(command=1.0))
+    stats.add(make_timing(command=3.0, argparse=2.0))
+
+    results = stats.percentiles((0, 100))
+    assert results["argparse"] == [2.0, 2.0]
+    assert results["command"] == [1.0, 3.0]
+
+
+def test_percentiles_empty() -> None:
+    assert TimingStats().percentiles((50,)) == {"total": [0.0]}
+
+
+def test_max_records() -> None:
+    stats = TimingStats(max_records=2)
+    for i in range(3):
+        stats.add(make_timing(command=i))
+
+    assert len(stats) == 2
+    assert stats.percentiles((0,))["command"] == [1]
+
+    stats.clear()
+    assert len(stats) == 0